@@ -0,0 +1,109 @@
+"""Compare json.loads against the streaming parser on a pool list payload
+
+Uses benchmarks/fixtures/ammPools.json when a recorded payload is present,
+otherwise a synthetic payload of --pools entries.
+
+    python benchmarks/bench_json_stream.py --pools 50000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jsonstream import iter_json_items
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'ammPools.json')
+SOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+CHUNK_SIZE = 64 * 1024
+
+
+def synthetic_payload(count):
+    """Build an ammPools-shaped payload with the SOL/USDC pool in the middle"""
+    pools = []
+    for i in range(count):
+        pools.append({
+            'id': f"Pool{i:040d}",
+            'mintA': f"MintA{i:039d}",
+            'mintB': USDC,
+            'tvl': 1000 + i,
+            'price': 0.5,
+            'openTime': 1700000000 + i,
+            'ammConfig': {'tradeFeeRate': 2500},
+            'day': {'volume': i * 1.5, 'volumeFee': 0.1, 'apr': 12.5},
+            'week': {'volume': i * 7.5, 'volumeFee': 0.7, 'apr': 11.0},
+            'month': {'volume': i * 30.5, 'volumeFee': 3.1, 'apr': 10.0},
+        })
+    pools[count // 2].update({'mintA': SOL, 'price': 150.0})
+    return json.dumps({'id': 'bench', 'success': True, 'data': pools}).encode()
+
+
+def chunked(raw):
+    for i in range(0, len(raw), CHUNK_SIZE):
+        yield raw[i:i + CHUNK_SIZE]
+
+
+def measure(label, fn):
+    """Run fn under tracemalloc and report wall time and peak allocation"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(started)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  peak {peak / 1e6:8.1f} MB  {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming JSON parsing of pool lists')
+    parser.add_argument('--pools', type=int, default=50000, help='Synthetic pool count')
+    args = parser.parse_args()
+
+    if os.path.exists(FIXTURE):
+        with open(FIXTURE, 'rb') as f:
+            raw = f.read()
+        print(f"Using recorded fixture {FIXTURE} ({len(raw) / 1e6:.1f} MB)\n")
+    else:
+        raw = synthetic_payload(args.pools)
+        print(f"Using synthetic payload, {args.pools} pools ({len(raw) / 1e6:.1f} MB)\n")
+
+    def loads_filter(started):
+        # Same shape as the old code path: whole body, then the full object graph
+        body = b''.join(chunked(raw))
+        pools = json.loads(body).get('data', [])
+        first = time.perf_counter() - started
+        kept = sum(1 for pool in pools if float(pool.get('tvl', 0)) >= 10000)
+        return f"first pool {first * 1000:.1f} ms, kept {kept}"
+
+    def stream_filter(started):
+        first = None
+        kept = 0
+        for pool in iter_json_items(chunked(raw), ('data',)):
+            if first is None:
+                first = time.perf_counter() - started
+            if float(pool.get('tvl', 0)) >= 10000:
+                kept += 1
+        return f"first pool {first * 1000:.1f} ms, kept {kept}"
+
+    def loads_sol_lookup(started):
+        for pool in json.loads(b''.join(chunked(raw))).get('data', []):
+            if {pool.get('mintA'), pool.get('mintB')} == {SOL, USDC}:
+                return f"price {pool['price']}"
+
+    def stream_sol_lookup(started):
+        for pool in iter_json_items(chunked(raw), ('data',)):
+            if {pool.get('mintA'), pool.get('mintB')} == {SOL, USDC}:
+                return f"price {pool['price']}"
+
+    measure('json.loads + filter', loads_filter)
+    measure('stream + filter', stream_filter)
+    measure('json.loads SOL lookup', loads_sol_lookup)
+    measure('stream SOL lookup', stream_sol_lookup)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""Offline list and monitor benchmarks against the local stand-in server
+
+Each scale runs in its own subprocess so peak RSS is measured per run:
+
+    python benchmarks/run_benchmarks.py --scales 10000,100000 --runs 5
+
+Results are written to benchmarks/results/<timestamp>.json and compared
+with the previous results file; a phase whose p50 or whose peak RSS grew
+by more than --threshold is reported as a regression.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+
+def percentiles(samples):
+    """p50/p95/p99 in milliseconds, nearest-rank"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+    return {'p50_ms': rank(50), 'p95_ms': rank(95), 'p99_ms': rank(99), 'runs': len(ordered)}
+
+
+def bench_config(base_url, cache_dir):
+    from memesniper import DEFAULT_POOL_CONFIG
+
+    return {
+        **DEFAULT_POOL_CONFIG,
+        'raydium_api_url': base_url,
+        'jupiter_api_url': base_url,
+        'solscan_api_url': base_url,
+        'telegram_api_url': base_url,
+        'orca_api_url': base_url,
+        'bsc_node_url': f"{base_url}/bsc",
+        'token_cache_path': os.path.join(cache_dir, 'token_cache.db'),
+        'creation_index_path': os.path.join(cache_dir, 'pool_created.db'),
+        'snapshot_ttl': 0,          # Every cycle revalidates the snapshot
+        'quote_rate_limit': 1000,   # The stand-in has no rate limit
+        'quote_cache_ttl': 0,
+    }
+
+
+def run_list(base_url, runs, hours):
+    """Cold list runs: a fresh RaydiumAPI per run, as the --mode list CLI does"""
+    from memesniper import RaydiumAPI
+    from enrichment import PoolEnricher
+
+    samples = []
+    scanned = passed = 0
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = bench_config(base_url, cache_dir)
+        for _ in range(runs):
+            started = time.perf_counter()
+            dex = RaydiumAPI(config)
+            dex.update_sol_price()
+            dex.cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+            pools = dex.get_pools(config)
+            enricher = PoolEnricher(dex, config)
+            for _ in enricher.iter_enriched(pools):
+                pass
+            enricher.shutdown()
+            samples.append(time.perf_counter() - started)
+            scanned, passed = sum(len(table) for _, table in dex._tables.values()), len(pools)
+    return samples, scanned, passed
+
+
+def run_monitor(base_url, runs, hours):
+    """Monitor cycles on one RaydiumAPI; the stand-in adds pools between cycles"""
+    from memesniper import RaydiumAPI
+    from enrichment import PoolEnricher
+
+    samples = []
+    scanned = passed = 0
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = bench_config(base_url, cache_dir)
+        dex = RaydiumAPI(config)
+        dex.update_sol_price()
+        enricher = PoolEnricher(dex, config)
+        for _ in range(runs + 1):
+            dex.cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+            started = time.perf_counter()
+            events = dex.get_pool_changes(config)
+            added = [pool for event, pool in events if event == 'added']
+            for _ in enricher.iter_enriched(added):
+                pass
+            samples.append(time.perf_counter() - started)
+            passed += len(added)
+            time.sleep(0.2)
+        enricher.shutdown()
+        scanned = sum(len(table) for _, table in dex._tables.values())
+    # The first cycle is the cold start; the rest are steady state
+    return samples[1:], scanned, passed
+
+
+def worker(args):
+    """Run one mode at one scale and print a JSON result line"""
+    runner = run_list if args.mode == 'list' else run_monitor
+    with contextlib.redirect_stdout(io.StringIO()):
+        samples, scanned, passed = runner(args.url, args.runs, args.hours)
+    total = sum(samples)
+    result = {
+        'mode': args.mode,
+        'pools': args.pools,
+        'scanned': scanned,
+        'passed': passed,
+        'throughput_pools_per_s': scanned * len(samples) / total if total else 0,
+        'latency': percentiles(samples),
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    print(json.dumps(result))
+
+
+def run_scale(pools, modes, runs, hours, latency):
+    """Serve one scale from this process and benchmark it from a child"""
+    import standin_server
+
+    server, _ = standin_server.start(pools, churn=max(pools // 10000, 1), churn_interval=0.1, latency=latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    results = []
+    try:
+        for mode in modes:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker', '--mode', mode, '--url', url,
+                 '--pools', str(pools), '--runs', str(runs), '--hours', str(hours)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+    finally:
+        server.shutdown()
+    return results
+
+
+def previous_results():
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, '*.json')))
+    if not paths:
+        return None, None
+    with open(paths[-1]) as f:
+        return paths[-1], json.load(f)
+
+
+def compare(current, previous, threshold):
+    """Regressions of p50 latency or peak RSS beyond threshold, as messages"""
+    before = {(r['mode'], r['pools']): r for r in previous['results']}
+    regressions = []
+    for result in current:
+        old = before.get((result['mode'], result['pools']))
+        if old is None:
+            continue
+        checks = (
+            ('p50 latency', old['latency'].get('p50_ms'), result['latency'].get('p50_ms'), 'ms'),
+            ('peak RSS', old['peak_rss_mb'], result['peak_rss_mb'], 'MB'),
+        )
+        for label, was, now, unit in checks:
+            if was and now > was * (1 + threshold):
+                regressions.append(f"{result['mode']} @ {result['pools']}: {label} "
+                                   f"{was:.1f} -> {now:.1f} {unit} (+{(now / was - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list and monitor runs against a local stand-in')
+    parser.add_argument('--scales', default='10000,100000', help='Comma-separated CL pool counts')
+    parser.add_argument('--modes', default='list,monitor')
+    parser.add_argument('--runs', type=int, default=5, help='Runs or cycles per mode')
+    parser.add_argument('--hours', type=float, default=6, help='Listing window')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds the stand-in adds per GET')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed growth before flagging')
+    parser.add_argument('--no-save', action='store_true', help='Do not write a results file')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--pools', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    modes = args.modes.split(',')
+    results = []
+    for pools in (int(scale) for scale in args.scales.split(',')):
+        for result in run_scale(pools, modes, args.runs, args.hours, args.latency):
+            latency = result['latency']
+            print(f"{result['mode']:<8} {pools:>9} pools  "
+                  f"p50 {latency['p50_ms']:8.1f} ms  p95 {latency['p95_ms']:8.1f} ms  "
+                  f"p99 {latency['p99_ms']:8.1f} ms  {result['throughput_pools_per_s']:10.0f} pools/s  "
+                  f"peak {result['peak_rss_mb']:7.1f} MB")
+            results.append(result)
+
+    previous_path, previous = previous_results()
+    if previous:
+        regressions = compare(results, previous, args.threshold)
+        print(f"\nCompared with {os.path.basename(previous_path)}:")
+        for message in regressions or ['no regressions']:
+            print(f"  {message}")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+        with open(path, 'w') as f:
+            json.dump({'time': time.time(), 'results': results}, f, indent=2)
+        print(f"\nSaved {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Resident memory of a monitor over thousands of back-to-back cycles
+
+The stand-in adds new pools (with fresh mints) and drops as many old ones
+between cycles, so the upstream list stays the same size while the
+monitor keeps seeing launches, probing them and alerting on them:
+
+    python benchmarks/soak_benchmark.py --pools 2000 --cycles 3000
+
+RSS is sampled every --sample-every cycles in a child process. The first
+--warmup fraction of the run is excluded, since caches and the allocator
+fill up then. Exits non-zero when RSS after warm-up grows by more than
+--budget-mb. TokenMonitor reads its defaults from config.py, so one must
+be importable.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from run_benchmarks import bench_config
+
+
+def rss_mb():
+    """Current resident set size; peak RSS where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(args):
+    """Run monitor cycles and print one JSON line of RSS samples"""
+    import contextlib
+    import io
+    from monitor_solana import TokenMonitor
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = dict(
+            bench_config(args.url, cache_dir),
+            seen_db_path=os.path.join(cache_dir, 'seen_pools.db'),
+            outbox_path=os.path.join(cache_dir, 'telegram_outbox.db'),
+            metrics_path=os.path.join(cache_dir, 'metrics.prom'),
+            snapshot_cache_dir=None,
+            token_memo_size=args.token_memo_size,
+            creation_trim_interval=args.trim_interval,
+        )
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            monitor = TokenMonitor(config)
+
+            def consume():
+                for _ in monitor.iter_new_pools(args.hours, 'hours', interval=0):
+                    output.seek(0)
+                    output.truncate()
+
+            threading.Thread(target=consume, daemon=True).start()
+            samples = []
+            next_sample = 0
+            while next_sample <= args.cycles:
+                histogram = monitor.metrics.histograms.get('cycle')
+                cycles = histogram.count if histogram else 0
+                if cycles >= next_sample:
+                    samples.append((cycles, rss_mb()))
+                    next_sample += args.sample_every
+                time.sleep(0.01)
+            memo = monitor.dex.token_metadata.cache_stats()
+            pools_new = monitor.metrics.counters.get('pools_new', 0)
+    print(json.dumps({'samples': samples, 'token_memo': memo, 'pools_new': pools_new,
+                      'creation_index': len(monitor.dex.creation_index)}))
+    # The monitor loop never returns, so skip waiting for its threads
+    os._exit(0)
+
+
+def growth(samples, warmup):
+    """RSS change in MB from the end of warm-up to the last sample, and the slope per 1000 cycles"""
+    steady = samples[int(len(samples) * warmup):]
+    if len(steady) < 2:
+        return 0.0, 0.0
+    xs = [cycles for cycles, _ in steady]
+    ys = [rss for _, rss in steady]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+    return ys[-1] - ys[0], slope * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that a long-running monitor stays at a steady RSS')
+    parser.add_argument('--pools', type=int, default=2000, help='CL pools served by the stand-in')
+    parser.add_argument('--churn', type=int, default=5, help='Pools replaced per churn interval')
+    parser.add_argument('--churn-interval', type=float, default=0.05, help='Seconds between replacements')
+    parser.add_argument('--cycles', type=int, default=3000)
+    parser.add_argument('--sample-every', type=int, default=100, help='Cycles between RSS samples')
+    parser.add_argument('--hours', type=float, default=2, help='Monitoring window')
+    parser.add_argument('--token-memo-size', type=int, default=1000, help='Token metadata LRU size')
+    parser.add_argument('--trim-interval', type=float, default=5, help='Seconds between creation index trims')
+    parser.add_argument('--warmup', type=float, default=0.2, help='Fraction of samples ignored')
+    parser.add_argument('--budget-mb', type=float, default=10, help='Allowed RSS growth after warm-up')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    import standin_server
+
+    server, state = standin_server.start(args.pools, churn=args.churn, churn_interval=args.churn_interval,
+                                         rotate=True)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    started = time.perf_counter()
+    try:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', '--url', url] + sys.argv[1:],
+            check=True, capture_output=True, text=True,
+        ).stdout
+    finally:
+        server.shutdown()
+    result = json.loads(output.strip().splitlines()[-1])
+    elapsed = time.perf_counter() - started
+
+    samples = result['samples']
+    for cycles, rss in samples:
+        print(f"cycle {cycles:>6}  rss {rss:8.1f} MB")
+    change, slope = growth(samples, args.warmup)
+    memo = result['token_memo']
+    print(f"\n{samples[-1][0]} cycles in {elapsed:.0f}s, {result['pools_new']} new pools, "
+          f"{len(state.messages)} alerts delivered")
+    print(f"token memo: {memo['size']} mints, {memo['hits']} hits, {memo['misses']} misses, "
+          f"{memo['evictions']} evictions")
+    print(f"creation index: {result['creation_index']} pools in memory")
+    print(f"RSS after warm-up: {change:+.1f} MB ({slope:+.2f} MB per 1000 cycles)")
+    if change > args.budget_mb:
+        print(f"over budget: {change:.1f} MB > {args.budget_mb:.0f} MB")
+        sys.exit(1)
+    print("within budget")
+
+
+if __name__ == '__main__':
+    main()
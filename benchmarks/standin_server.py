@@ -0,0 +1,265 @@
+"""Local stand-in for the Raydium, Orca, Jupiter, Solscan and Telegram APIs and a BSC node
+
+Serves recorded or synthetic payloads so list and monitor runs can be
+benchmarked without touching the real services. Point RaydiumAPI and
+OrcaSource, or a TokenMonitor that builds them, at it with
+
+    python benchmarks/standin_server.py --pools 100000 --port 8899
+
+    config = {'raydium_api_url': 'http://127.0.0.1:8899',
+              'jupiter_api_url': 'http://127.0.0.1:8899',
+              'solscan_api_url': 'http://127.0.0.1:8899',
+              'telegram_api_url': 'http://127.0.0.1:8899',
+              'orca_api_url': 'http://127.0.0.1:8899'}
+
+and TokenMonitor's bsc_node_url at http://127.0.0.1:8899/bsc, which answers
+the JSON-RPC calls PancakeSwapSource makes for a synthetic chain of pairs.
+
+Snapshots carry an ETag so unchanged polls get 304. Every --churn-interval
+seconds a few pools are added, so monitor cycles see new launches.
+sendMessage enforces --telegram-rate messages per second like the Bot API
+does, answering 429 with parameters.retry_after when it is exceeded.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures
+import pancakeswap
+from ratelimit import TokenBucket
+
+BSC_ROUTER = "0x10ed43c718714eb63d5aa57b78b54704e256024e"
+BSC_FACTORY = fixtures.bsc_address(0xfac)
+
+
+def _word(value):
+    return f"{value:064x}"
+
+
+class StandinState:
+    """Serialized payloads plus the churn that keeps the pool list moving"""
+
+    def __init__(self, pools, pairs, tokens, churn=0, latency=0.0, telegram_rate=None, rotate=False):
+        self.latency = latency
+        self.rotate = rotate
+        self.telegram_bucket = TokenBucket(telegram_rate) if telegram_rate else None
+        self.messages = []
+        self.churn = churn
+        self.cl_pools = fixtures.synthetic_cl_pools(pools)
+        self.whirlpools = fixtures.synthetic_whirlpools(pools // 10)
+        self._next_pool = pools
+        self._next_whirlpool = len(self.whirlpools)
+        self._bsc_started = time.time()
+        self._bsc_base = 40000000  # Block number at _bsc_started
+        self.bsc_pairs = fixtures.synthetic_bsc_pairs(pools // 100, self._bsc_base)
+        self.bodies = {}
+        self.etags = {}
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._set('/v2/ammV3/ammPools', {'id': 'standin', 'success': True, 'data': self.cl_pools})
+        self._set('/v2/main/pairs', fixtures.synthetic_cp_pairs(pairs))
+        self._set('/v2/sdk/token/list', fixtures.synthetic_token_list(tokens))
+        self._set('/v1/whirlpool/list', {'whirlpools': self.whirlpools})
+        self.quote = fixtures.synthetic_quote()
+        self.quote_depth = 50 * 10 ** 9  # Lamports of SOL-side liquidity behind every quote
+
+    def _set(self, path, payload):
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        self.bodies[path] = body
+        self.etags[path] = '"' + hashlib.md5(body).hexdigest() + '"'
+
+    def add_pools(self):
+        """Append churn new pools that opened just now, dropping as many of the oldest if rotating"""
+        now = time.time()
+        for pool in fixtures.synthetic_cl_pools(self.churn, new_fraction=1.0, seed=self._next_pool, now=now):
+            pool['id'] = f"Pool{self._next_pool:040d}"
+            pool['mintA'] = fixtures.mint_for(self._next_pool)
+            self.cl_pools.append(pool)
+            self._next_pool += 1
+        self.whirlpools.extend(fixtures.synthetic_whirlpools(self.churn, start=self._next_whirlpool))
+        self._next_whirlpool += self.churn
+        if self.rotate:
+            del self.cl_pools[:self.churn]
+            del self.whirlpools[:self.churn]
+        with self._lock:
+            self._set('/v2/ammV3/ammPools', {'id': 'standin', 'success': True, 'data': self.cl_pools})
+            self._set('/v1/whirlpool/list', {'whirlpools': self.whirlpools})
+
+    def bsc_head(self):
+        """Current block of the synthetic chain, one every 3 seconds"""
+        return self._bsc_base + int((time.time() - self._bsc_started) / 3)
+
+    def bsc_timestamp(self, block):
+        return int(self._bsc_started + (block - self._bsc_base) * 3)
+
+    def bsc_call(self, method, params):
+        """Result of one JSON-RPC call against the synthetic chain"""
+        if method == 'eth_blockNumber':
+            return hex(self.bsc_head())
+        if method == 'eth_getBlockByNumber':
+            return {'timestamp': hex(self.bsc_timestamp(int(params[0], 16)))}
+        if method == 'eth_getLogs':
+            start, end = int(params[0]['fromBlock'], 16), int(params[0]['toBlock'], 16)
+            return [{
+                'blockNumber': hex(block),
+                'topics': [pancakeswap.PAIR_CREATED, '0x' + _word(int(token0, 16)), '0x' + _word(int(token1, 16))],
+                'data': '0x' + _word(int(pair, 16)) + _word(i + 1),
+            } for i, (block, token0, token1, pair, _, _) in enumerate(self.bsc_pairs) if start <= block <= end]
+        if method == 'eth_call':
+            to, data = params[0]['to'].lower(), params[0]['data']
+            selector = data[:10]
+            if to == BSC_ROUTER and selector == pancakeswap.FACTORY:
+                return '0x' + _word(int(BSC_FACTORY, 16))
+            if to == BSC_FACTORY and selector == pancakeswap.GET_PAIR:
+                return '0x' + _word(int(self.bsc_pairs[0][3], 16))
+            for block, _, _, pair, reserve0, reserve1 in self.bsc_pairs:
+                if to == pair and selector == pancakeswap.GET_RESERVES:
+                    return '0x' + _word(reserve0) + _word(reserve1) + _word(self.bsc_timestamp(block))
+            if selector == pancakeswap.DECIMALS:
+                return '0x' + _word(18)
+            if selector == pancakeswap.SYMBOL:
+                symbol = f"B{int(to, 16)}".encode()
+                return '0x' + _word(32) + _word(len(symbol)) + symbol.ljust(32, b'\0').hex()
+        return None
+
+    def count(self, path):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping kept-alive connections is normal here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+        # Headers and body go out in separate writes; without this each
+        # kept-alive response stalls on the client's delayed ACK
+        disable_nagle_algorithm = True
+
+        def _send(self, status, body=b'', headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            state.count(path)
+            if state.latency:
+                time.sleep(state.latency)
+            if path in state.bodies:
+                with state._lock:
+                    body, etag = state.bodies[path], state.etags[path]
+                if self.headers.get('If-None-Match') == etag:
+                    self._send(304, headers={'ETag': etag})
+                else:
+                    self._send(200, body, {'ETag': etag})
+            elif path == '/v6/quote':
+                # Constant-product impact, so depth sampling has a curve to fit
+                amount = int(parse_qs(urlparse(self.path).query).get('amount', ['1000000'])[0])
+                impact = amount / (amount + state.quote_depth)
+                out_amount = int(amount * 150 * (1 - impact))  # 150 tokens per lamport
+                quote = dict(state.quote, inAmount=str(amount), outAmount=str(out_amount),
+                             priceImpactPct=str(impact))
+                self._send(200, json.dumps(quote).encode())
+            elif path == '/token/meta':
+                body = json.dumps({'success': True, 'data': {'holder': 100, 'supply': '1000000000'}}).encode()
+                self._send(200, body)
+            else:
+                self._send(404, b'{}')
+
+        def do_POST(self):
+            path = urlparse(self.path).path
+            state.count(path)
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if path.endswith('/sendMessage'):
+                wait = state.telegram_bucket.try_acquire() if state.telegram_bucket else 0
+                if wait > 0:
+                    retry_after = max(int(wait + 0.999), 1)
+                    self._send(429, json.dumps({
+                        'ok': False, 'error_code': 429,
+                        'description': f"Too Many Requests: retry after {retry_after}",
+                        'parameters': {'retry_after': retry_after},
+                    }).encode())
+                    return
+                with state._lock:
+                    state.messages.append(json.loads(body))
+                self._send(200, b'{"ok":true}')
+            elif path == '/bsc':
+                calls = json.loads(body)
+                replies = [{'jsonrpc': '2.0', 'id': call['id'], 'result': state.bsc_call(call['method'], call['params'])}
+                           for call in (calls if isinstance(calls, list) else [calls])]
+                self._send(200, json.dumps(replies if isinstance(calls, list) else replies[0]).encode())
+            else:
+                self._send(404, b'{}')
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start(pools=10000, pairs=None, tokens=None, port=0, churn=0, churn_interval=10.0, latency=0.0,
+          telegram_rate=None, rotate=False):
+    """Start the stand-in on a background thread; returns (server, state)
+
+    port=0 picks a free port, available as server.server_address[1].
+    rotate keeps the pool list at a constant size as churn adds pools.
+    """
+    state = StandinState(pools, pairs if pairs is not None else pools // 10,
+                         tokens if tokens is not None else pools // 3, churn, latency, telegram_rate, rotate)
+    server = StandinServer(('127.0.0.1', port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    if churn:
+        def churn_loop():
+            while True:
+                time.sleep(churn_interval)
+                state.add_pools()
+
+        threading.Thread(target=churn_loop, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stand-in Raydium/Jupiter/Solscan/Telegram APIs')
+    parser.add_argument('--pools', type=int, default=10000, help='CL pools in the snapshot')
+    parser.add_argument('--port', type=int, default=8899)
+    parser.add_argument('--churn', type=int, default=5, help='New pools per churn interval')
+    parser.add_argument('--churn-interval', type=float, default=10.0, help='Seconds between pool additions')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every GET')
+    parser.add_argument('--telegram-rate', type=float, help='sendMessage calls per second before 429s')
+    args = parser.parse_args()
+
+    server, _ = start(args.pools, port=args.port, churn=args.churn, churn_interval=args.churn_interval,
+                      latency=args.latency, telegram_rate=args.telegram_rate)
+    print(f"Serving {args.pools} pools on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
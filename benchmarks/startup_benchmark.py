@@ -0,0 +1,124 @@
+"""CLI startup time, and cold versus warm time to the first listed pool
+
+Every sample is a fresh interpreter, as with a cron-style invocation:
+
+    python benchmarks/startup_benchmark.py --pools 100000 --runs 5
+
+"--help" measures imports and argument handling alone. The list samples
+run TokenMonitor.iter_recent_pools against the local stand-in until the
+first pool comes out, first with an empty snapshot cache and then with
+the cache a previous run left behind. TokenMonitor reads its defaults
+from config.py, so one must be importable. Exits non-zero when --help or
+the warm first pool exceed their budgets.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from run_benchmarks import bench_config, percentiles
+
+
+def time_help(runs):
+    """Wall time of monitor_solana.py --help, including interpreter startup"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(REPO_DIR, 'monitor_solana.py'), '--help'],
+                       check=True, capture_output=True)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def time_first_pool(url, cache_dir, hours):
+    """Wall time from interpreter start to the first pool of a list run, in a child process"""
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', '--url', url,
+         '--cache-dir', cache_dir, '--hours', str(hours)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    found = json.loads(output.strip().splitlines()[-1])['found']
+    return time.perf_counter() - started, found
+
+
+def worker(args):
+    """List until the first pool comes out and print whether one did"""
+    import contextlib
+    import io
+    from monitor_solana import TokenMonitor
+
+    config = dict(
+        bench_config(args.url, args.cache_dir),
+        snapshot_cache_dir=os.path.join(args.cache_dir, 'snapshots'),
+        seen_db_path=os.path.join(args.cache_dir, 'seen_pools.db'),
+        outbox_path=os.path.join(args.cache_dir, 'telegram_outbox.db'),
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        monitor = TokenMonitor(config)
+        found = next(monitor.iter_recent_pools(args.hours), None) is not None
+    print(json.dumps({'found': found}))
+    # Skip waiting for the rest of the enrichment batch
+    os._exit(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup and warm-start list runs')
+    parser.add_argument('--pools', type=int, default=100000, help='CL pools served by the stand-in')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--hours', type=float, default=6, help='Listing window')
+    parser.add_argument('--help-budget-ms', type=float, default=150, help='Allowed p50 for --help')
+    parser.add_argument('--warm-budget-ms', type=float, default=1500, help='Allowed p50 for a warm first pool')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    import standin_server
+
+    results = {'help': percentiles(time_help(args.runs))}
+    server, _ = standin_server.start(args.pools)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    cold, warm = [], []
+    try:
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                # The first run fills the cache, the second starts from it
+                elapsed, _ = time_first_pool(url, cache_dir, args.hours)
+                cold.append(elapsed)
+                elapsed, _ = time_first_pool(url, cache_dir, args.hours)
+                warm.append(elapsed)
+    finally:
+        server.shutdown()
+    results['cold_first_pool'] = percentiles(cold)
+    results['warm_first_pool'] = percentiles(warm)
+
+    for name, latency in results.items():
+        print(f"{name:<16} p50 {latency['p50_ms']:8.1f} ms  p95 {latency['p95_ms']:8.1f} ms")
+
+    over = []
+    if results['help']['p50_ms'] > args.help_budget_ms:
+        over.append(f"--help p50 {results['help']['p50_ms']:.1f} ms > {args.help_budget_ms:.0f} ms")
+    if results['warm_first_pool']['p50_ms'] > args.warm_budget_ms:
+        over.append(f"warm first pool p50 {results['warm_first_pool']['p50_ms']:.1f} ms "
+                    f"> {args.warm_budget_ms:.0f} ms")
+    for message in over or ['within budget']:
+        print(message)
+    sys.exit(1 if over else 0)
+
+
+if __name__ == '__main__':
+    main()
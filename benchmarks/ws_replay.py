@@ -0,0 +1,93 @@
+"""Local stand-in for a Solana RPC node that replays a recorded log subscription
+
+Serves the websocket messages and getTransaction results captured by
+RaydiumLogSource(record_path=...). Point the source at it with
+
+    python benchmarks/ws_replay.py recording.jsonl --port 8900
+
+    RaydiumLogSource(dex, 'http://127.0.0.1:8901', RAYDIUM_SWAP_PROGRAM,
+                     ws_url='ws://127.0.0.1:8900')
+
+The websocket listens on --port and the HTTP RPC on --port + 1.
+ws_recording.jsonl next to this script holds a small recording, with a
+direct initialize2, one made through a CPI, a swap and a failed transaction;
+test_solana_logs.py replays it.
+"""
+import argparse
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import websockets
+
+
+def load_recording(path):
+    """Split a recording into websocket messages and transactions by signature"""
+    messages = []
+    transactions = {}
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry['type'] == 'ws':
+                messages.append(entry['message'])
+            elif entry['type'] == 'tx':
+                transactions[entry['signature']] = entry['result']
+    return messages, transactions
+
+
+def rpc_handler(transactions):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            result = None
+            if request.get('method') == 'getTransaction':
+                result = transactions.get(request['params'][0])
+            body = json.dumps({'jsonrpc': '2.0', 'id': request.get('id'), 'result': result}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+async def serve(messages, transactions, host, port, delay):
+    rpc = ThreadingHTTPServer((host, port + 1), rpc_handler(transactions))
+    threading.Thread(target=rpc.serve_forever, daemon=True).start()
+
+    async def replay(ws, path=None):
+        # Wait for logsSubscribe, confirm it, then replay in recorded order
+        request = json.loads(await ws.recv())
+        await ws.send(json.dumps({'jsonrpc': '2.0', 'id': request.get('id'), 'result': 1}))
+        for message in messages:
+            if json.loads(message).get('method') == 'logsNotification':
+                await ws.send(message)
+                await asyncio.sleep(delay)
+        await ws.wait_closed()
+
+    async with websockets.serve(replay, host, port):
+        print(f"Replaying {len(messages)} messages on ws://{host}:{port}, RPC on http://{host}:{port + 1}")
+        await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded Raydium log subscription')
+    parser.add_argument('recording', help='JSON lines written by RaydiumLogSource(record_path=...)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds between replayed messages')
+    args = parser.parse_args()
+
+    messages, transactions = load_recording(args.recording)
+    asyncio.run(serve(messages, transactions, args.host, args.port, args.delay))
+
+
+if __name__ == '__main__':
+    main()
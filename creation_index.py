@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+
+_MISSING = object()
+
+
+class CreationIndex:
+    """Creation time of every pool ever seen, recorded once and persisted in SQLite
+
+    A pool's creation time is either its own timestamp or the moment it
+    first appeared in a snapshot. Once recorded it never changes, so a pool
+    ages normally instead of being re-estimated every cycle. The whole index
+    is held in memory after the first lookup, making get() a dict lookup.
+    Pools whose creation time could not be determined are stored as None.
+    retain() drops pools no longer listed anywhere from memory only; they
+    stay on disk and are read back should one ever reappear.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._created = None
+        self._pending = []
+        self._bootstrapped = set()
+        self._trimmed = False
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open the database and create the schema on first use"""
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS created (
+                pool_id TEXT PRIMARY KEY,
+                created_at REAL
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS sources (source TEXT PRIMARY KEY, bootstrapped_at REAL)")
+        conn.commit()
+        return conn
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._created is not None:
+                return
+            self._conn = self._connect()
+            self._created = dict(self._conn.execute("SELECT pool_id, created_at FROM created"))
+            self._bootstrapped = {row[0] for row in self._conn.execute("SELECT source FROM sources")}
+
+    def get(self, pool_id, default=None):
+        """Recorded creation time for a pool id, or default if it was never seen"""
+        if self._created is None:
+            self._ensure_loaded()
+        created = self._created.get(pool_id, _MISSING)
+        if created is _MISSING and self._trimmed:
+            with self._lock:
+                created = self._read_back(pool_id)
+        return default if created is _MISSING else created
+
+    def _read_back(self, pool_id):
+        """Load a pool retain() dropped from memory back from disk; call with the lock held"""
+        row = self._conn.execute("SELECT created_at FROM created WHERE pool_id = ?", (pool_id,)).fetchone()
+        if not row:
+            return _MISSING
+        created = self._created[pool_id] = row[0]
+        return created
+
+    def record(self, pool_id, created_ts):
+        """Record a pool's creation time unless one is already recorded"""
+        self._ensure_loaded()
+        with self._lock:
+            created = self._created.get(pool_id, _MISSING)
+            if created is _MISSING and self._trimmed:
+                created = self._read_back(pool_id)
+            if created is not _MISSING:
+                return created
+            self._created[pool_id] = created_ts
+            self._pending.append((pool_id, created_ts))
+            return created_ts
+
+    def flush(self):
+        """Write newly recorded pools in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            self._conn.executemany("INSERT OR IGNORE INTO created (pool_id, created_at) VALUES (?, ?)", pending)
+            self._conn.commit()
+
+    def retain(self, pool_ids):
+        """Keep only these pools in memory; returns how many were dropped"""
+        self._ensure_loaded()
+        with self._lock:
+            before = len(self._created)
+            self._created = {pool_id: created for pool_id, created in self._created.items() if pool_id in pool_ids}
+            dropped = before - len(self._created)
+            self._trimmed = self._trimmed or dropped > 0
+            return dropped
+
+    def bootstrapped(self, source):
+        """Whether a full snapshot of this source has been recorded before"""
+        self._ensure_loaded()
+        return source in self._bootstrapped
+
+    def mark_bootstrapped(self, source):
+        with self._lock:
+            self._bootstrapped.add(source)
+            self._conn.execute("INSERT OR REPLACE INTO sources (source, bootstrapped_at) VALUES (?, ?)",
+                               (source, time.time()))
+            self._conn.commit()
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._created)
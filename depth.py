@@ -0,0 +1,130 @@
+import statistics
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+SOL = "So11111111111111111111111111111111111111112"
+
+
+class ImpactCurve:
+    """Price impact as a function of buy size, fitted from a few Jupiter quotes
+
+    Uses the constant-product shape impact(a) = a / (a + depth), where depth
+    is the SOL-side liquidity in lamports, taken as the median of the values
+    each sample implies. Amounts are in lamports of SOL.
+    """
+
+    def __init__(self, mint, samples, fitted_at=None):
+        self.mint = mint
+        self.samples = samples  # (amount, out_amount, price_impact_pct), ascending amount
+        self.fitted_at = time.time() if fitted_at is None else fitted_at
+        implied = [amount * (1 - impact) / impact for amount, _, impact in samples if 0 < impact < 1]
+        self.depth = statistics.median(implied) if implied else None
+        # Tokens per lamport before impact, from the smallest quote
+        self.spot_rate = None
+        if samples:
+            amount, out_amount, impact = samples[0]
+            self.spot_rate = out_amount / amount / (1 - min(impact, 0.99))
+
+    def impact(self, amount):
+        """Expected price impact for a buy of amount lamports"""
+        if self.depth is None:
+            return 0.0
+        return amount / (amount + self.depth)
+
+    def out_amount(self, amount):
+        """Expected tokens out, in the token's smallest unit, for a buy of amount lamports"""
+        if self.spot_rate is None:
+            return 0
+        return int(amount * self.spot_rate * (1 - self.impact(amount)))
+
+    def max_amount(self, max_impact):
+        """Largest buy in lamports that stays within max_impact"""
+        if self.depth is None:
+            return self.samples[-1][0] if self.samples else 0
+        return int(max_impact * self.depth / (1 - max_impact))
+
+
+class DepthSampler:
+    """Concurrent Jupiter quotes at several sizes per mint, fitted into an ImpactCurve
+
+    Curves are cached per mint for depth_cache_ttl seconds, and callers
+    asking for a mint whose curve is being sampled wait for that sampling
+    instead of starting another, so pools sharing a token share its quotes.
+    Requests use the liquidity probe's token bucket so the two never exceed
+    Jupiter's rate limit together.
+    """
+
+    def __init__(self, dex, config=None):
+        self.config = {
+            'depth_sizes': (10000000, 100000000, 500000000, 1000000000, 5000000000),  # Lamports
+            'depth_cache_ttl': 30,
+            'depth_workers': 8,
+            'slippage_bps': 50,
+        }
+        if config:
+            self.config.update(config)
+
+        self.dex = dex
+        self._cache = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.config['depth_workers'])
+
+    def _quote(self, mint, amount):
+        self.dex.liquidity.bucket.acquire()
+        return self.dex.get_quote(SOL, mint, amount, self.config['slippage_bps'])
+
+    def _sample(self, mint):
+        """Quote every size concurrently and fit the results"""
+        sizes = self.config['depth_sizes']
+        futures = [self._executor.submit(self._quote, mint, amount) for amount in sizes]
+        samples = []
+        for amount, future in zip(sizes, futures):
+            try:
+                quote = future.result()
+            except Exception:
+                continue
+            if quote:
+                samples.append((amount, int(quote['outAmount']), float(quote.get('priceImpactPct') or 0)))
+        return ImpactCurve(mint, samples)
+
+    def curve(self, mint):
+        """Fitted ImpactCurve for a mint, sampled at most once per TTL"""
+        with self._lock:
+            cached = self._cache.get(mint)
+            if cached and cached.fitted_at + self.config['depth_cache_ttl'] > time.time():
+                return cached
+            future = self._inflight.get(mint)
+            owner = future is None
+            if owner:
+                future = self._inflight[mint] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            curve = self._sample(mint)
+        except Exception:
+            curve = ImpactCurve(mint, [])
+        with self._lock:
+            # An empty curve is not cached so the next caller samples again
+            if curve.samples:
+                self._cache[mint] = curve
+            del self._inflight[mint]
+        future.set_result(curve)
+        return curve
+
+    def purge(self):
+        """Drop curves past their TTL"""
+        now = time.time()
+        with self._lock:
+            for mint in [mint for mint, curve in self._cache.items()
+                         if curve.fitted_at + self.config['depth_cache_ttl'] <= now]:
+                del self._cache[mint]
+
+    def peek(self, mint):
+        """Cached curve for a mint if it is still fresh, without sampling"""
+        cached = self._cache.get(mint)
+        if cached and cached.fitted_at + self.config['depth_cache_ttl'] > time.time():
+            return cached
+        return None
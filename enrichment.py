@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class PoolEnricher:
+    """Run liquidity checks and metadata fetches for many pools at once
+
+    Lookups for a batch of pools run on a bounded worker pool. Jupiter
+    quotes go through the dex's LiquidityProbe, and a semaphore per host
+    caps concurrent Solscan requests. Pools whose risk score is over
+    max_risk_score are not probed at all. Results are handed back
+    in the order pools were detected, each one as soon as it and every pool
+    before it are done.
+    """
+
+    def __init__(self, dex, config=None):
+        self.config = {
+            'enrich_workers': 16,       # Threads shared by all lookups
+            'solscan_concurrency': 2,   # Parallel requests per host
+            'sample_depth': False,      # Fit a price impact curve for pools with liquidity
+        }
+        if config:
+            self.config.update(config)
+
+        self.dex = dex
+        self._executor = ThreadPoolExecutor(max_workers=self.config['enrich_workers'])
+        self._host_limits = {
+            urlparse(dex.solscan_meta_url).hostname:
+                threading.BoundedSemaphore(self.config['solscan_concurrency']),
+        }
+
+    def _limited(self, url, fn, *args):
+        """Call fn while holding the concurrency slot for url's host"""
+        limit = self._host_limits.get(urlparse(url).hostname)
+        if limit is None:
+            return fn(*args)
+        with limit:
+            return fn(*args)
+
+    def enrich(self, pool, config=None):
+        """Check liquidity for the pool's first token and fetch its metadata if it has any
+
+        config overrides this enricher's settings for the call. A pool over
+        max_risk_score comes back with probed False and no lookups made.
+        """
+        config = self.config if config is None else dict(self.config, **config)
+        result = {'liquidity': None, 'has_liquidity': False, 'metadata': None, 'depth': None, 'error': None,
+                  'probed': True}
+        token = pool['tokenA']
+        if pool.get('risk_score', 0.0) > config.get('max_risk_score', self.dex.risk.config['max_risk_score']):
+            result['probed'] = False
+            self.dex.metrics.inc('pools_risk_skipped')
+            return result
+        if pool.get('chain', 'solana') != 'solana':
+            # Jupiter only quotes Solana tokens; the pool's own reserves are the liquidity
+            result['has_liquidity'] = pool['liquidity'] > 0
+            return result
+        try:
+            # The probe dedupes mints shared by several pools and rate limits Jupiter
+            result['liquidity'] = self.dex.check_liquidity(token, config)
+            result['has_liquidity'] = result['liquidity']['has_liquidity']
+            result['error'] = result['liquidity']['error']
+            if result['has_liquidity']:
+                result['metadata'] = self._limited(self.dex.solscan_meta_url,
+                                                   self.dex.get_token_metadata, token)
+                if config['sample_depth']:
+                    result['depth'] = self.dex.get_impact_curve(token)
+        except Exception as e:
+            result['error'] = str(e)
+        return result
+
+    def iter_enriched(self, pools, config=None):
+        """Yield (pool, result) in input order while all pools are enriched in parallel"""
+        futures = [(pool, self._executor.submit(self.enrich, pool, config)) for pool in pools]
+        for pool, future in futures:
+            yield pool, future.result()
+
+    def shutdown(self):
+        """Wait for queued work to finish and stop the worker threads"""
+        self._executor.shutdown(wait=True)
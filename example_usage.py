@@ -1,10 +1,10 @@
-from memesniper import MemeSniper
+from memesniper import SolanaSniper
 
 def main():
-    sniper = MemeSniper()
+    sniper = SolanaSniper()
     
     # Token address you want to snipe
-    token_address = "0xYOUR_TOKEN_ADDRESS"
+    token_address = "YOUR_TOKEN_MINT_ADDRESS"
     
     # Check for rugpull risks first
     risks = sniper.check_for_rugpull_risks(token_address)
@@ -18,7 +18,7 @@ def main():
     
     # Check if token has liquidity
     if sniper.check_liquidity(token_address):
-        # Buy 0.1 BNB worth of tokens
+        # Buy 0.1 SOL worth of tokens
         tx_hash = sniper.buy_token(token_address, 0.1)
         if tx_hash:
             print(f"Successfully sniped token! Transaction: {tx_hash}")
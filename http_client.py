@@ -0,0 +1,156 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from metrics import NullMetrics
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report each new connection they open"""
+
+    def __init__(self, on_new_connection, **kwargs):
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_new_connection = self._on_new_connection
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """Shared HTTP client for every outbound call: pooled keep-alive connections,
+    connect/read timeouts, and jittered exponential backoff that honours Retry-After"""
+
+    def __init__(self, config=None, metrics=None):
+        self.config = {
+            'pool_connections': 16,   # Hosts kept in the pool manager
+            'pool_maxsize': 32,       # Keep-alive connections per host
+            'connect_timeout': 5,
+            'read_timeout': 30,
+            'max_retries': 3,
+            'backoff_base': 0.5,      # Seconds, doubled per attempt
+            'backoff_max': 30,
+        }
+        if config:
+            self.config.update(config)
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0',
+            'Accept': 'application/json'
+        })
+        adapter = _CountingAdapter(
+            self._count_connection,
+            pool_connections=self.config['pool_connections'],
+            pool_maxsize=self.config['pool_maxsize'],
+            max_retries=0,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.metrics = metrics or NullMetrics()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'errors': 0, 'connections_opened': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _count_connection(self):
+        self._count('connections_opened')
+
+    def connection_stats(self):
+        """Counters, including how many requests reused a kept-alive connection"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['connections_reused'] = max(stats['requests'] - stats['connections_opened'], 0)
+        return stats
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff"""
+        cap = min(self.config['backoff_max'], self.config['backoff_base'] * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def _retry_after(self, response):
+        """Seconds requested by a Retry-After header, if any"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
+
+    def request(self, method, url, idempotent=None, retries=None, **kwargs):
+        """Send a request, retrying transient failures
+
+        Non-idempotent requests (POST by default) are only retried when the
+        server rejected them with 429 or the connection was never made, so a
+        retry can never deliver them twice. retries overrides max_retries,
+        e.g. 0 for callers that run their own retry loop.
+        """
+        max_retries = self.config['max_retries'] if retries is None else retries
+        if idempotent is None:
+            idempotent = method.upper() in ('GET', 'HEAD', 'OPTIONS')
+        kwargs.setdefault('timeout', (self.config['connect_timeout'], self.config['read_timeout']))
+
+        attempt = 0
+        while True:
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                retryable = idempotent or isinstance(e, requests.ConnectTimeout)
+                if not retryable or attempt >= max_retries:
+                    self._count('errors')
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or attempt >= max_retries:
+                    if self.metrics.enabled and not kwargs.get('stream'):
+                        self.metrics.inc('bytes_downloaded', len(response.content))
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                delay = min(delay, self.config['backoff_max'])
+                response.close()
+
+            self._count('retries')
+            self.metrics.inc('http_retries')
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
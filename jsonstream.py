@@ -0,0 +1,142 @@
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+# Characters that can follow a complete value; anything else means it may still be growing
+_DELIMITERS = _WHITESPACE + ',]}:'
+
+
+class JSONStreamReader:
+    """Walk a JSON document that arrives in chunks without holding all of it in memory"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Append the next chunk to the buffer, dropping what was already consumed"""
+        if self._eof:
+            return False
+        text = ''
+        while not text:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                text = self._utf8.decode(b'', final=True)
+                break
+            if isinstance(chunk, str):
+                text = chunk
+            else:
+                text = self._utf8.decode(chunk)
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return bool(text) or not self._eof
+
+    def _peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self._pos}, got '{self._buf[self._pos]}'")
+        self._pos += 1
+
+    def read_value(self):
+        """Decode the next complete JSON value"""
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+                # A number or literal cut off by the chunk boundary decodes
+                # as a shorter value ("1." as 1), so only trust one that is
+                # followed by a delimiter or ends the stream
+                if self._eof or (end < len(self._buf) and self._buf[end] in _DELIMITERS):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def skip_value(self):
+        """Skip the next JSON value, scanning containers instead of decoding them"""
+        if self._peek() not in '{[':
+            self.read_value()
+            return
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            buf = self._buf
+            for i in range(self._pos, len(buf)):
+                char = buf[i]
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char in '{[':
+                    depth += 1
+                elif char in '}]':
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = i + 1
+                        return
+            self._pos = len(buf)
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def enter(self, path):
+        """Advance to the value reached by following the object keys in path"""
+        for key in path:
+            self._expect('{')
+            while True:
+                if self._peek() == '}':
+                    raise KeyError(key)
+                name = self.read_value()
+                self._expect(':')
+                if name == key:
+                    break
+                self.skip_value()
+                if self._peek() == ',':
+                    self._pos += 1
+
+    def iter_array(self):
+        """Yield the items of the array at the current position one at a time"""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' in array, got '{char}'")
+
+
+def iter_json_items(chunks, path=()):
+    """Yield items of the JSON array at path (a tuple of object keys) from a chunk iterator"""
+    reader = JSONStreamReader(chunks)
+    try:
+        reader.enter(path)
+    except KeyError:
+        return
+    yield from reader.iter_array()
@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import Future
+
+from ratelimit import TokenBucket
+
+
+class LiquidityResult(dict):
+    """A probe result, true only when the token has liquidity"""
+
+    def __bool__(self):
+        return bool(self['has_liquidity'])
+
+
+class LiquidityProbe:
+    """Jupiter liquidity probes, deduplicated by mint and cached for a short TTL
+
+    Concurrent probes for the same mint share one request, results are
+    reused for quote_cache_ttl seconds across cycles and list runs, and all
+    requests go through a token bucket so bursts stay under Jupiter's rate
+    limit. Results are LiquidityResult dicts with has_liquidity,
+    out_amount, quote (in tokens), price_impact_pct, route_count and error.
+    """
+
+    def __init__(self, dex, config=None):
+        self.config = {
+            'quote_cache_ttl': 20,      # Seconds a probe result is reused
+            'quote_rate_limit': 10,     # Jupiter requests per second
+        }
+        if config:
+            self.config.update(config)
+
+        self.dex = dex
+        self.bucket = TokenBucket(self.config['quote_rate_limit'])
+        self._cache = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'shared': 0}
+
+    def probe(self, mint, amount, slippage_bps):
+        """Probe one mint, reusing a cached or in-flight result for the same key"""
+        key = (mint, amount, slippage_bps)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                self.stats['cache_hits'] += 1
+                return cached[1]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['shared'] += 1
+                owner = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                owner = True
+        if not owner:
+            return future.result()
+
+        try:
+            self.bucket.acquire()
+            self.stats['requests'] += 1
+            result = self.dex.request_liquidity_quote(mint, amount, slippage_bps)
+            if result.get('retry_after'):
+                self.bucket.pause(result['retry_after'])
+        except Exception as e:
+            result = self._empty_result(mint)
+            result['error'] = str(e)
+
+        with self._lock:
+            # Errors are not cached so the next cycle tries again
+            if not result['error']:
+                self._cache[key] = (time.monotonic() + self.config['quote_cache_ttl'], result)
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def peek(self, mint, amount, slippage_bps):
+        """Cached result for a key if it is still fresh, without making a request"""
+        cached = self._cache.get((mint, amount, slippage_bps))
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+
+    def purge(self):
+        """Drop expired results"""
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[key]
+
+    @staticmethod
+    def _empty_result(mint):
+        return LiquidityResult({
+            'mint': mint,
+            'has_liquidity': False,
+            'out_amount': 0,
+            'quote': 0.0,
+            'price_impact_pct': None,
+            'route_count': 0,
+            'error': None,
+            'retry_after': None,
+        })
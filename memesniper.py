@@ -1,48 +1,325 @@
-import requests
-from datetime import datetime, timezone, timedelta
 import time
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+import numpy as np
+from jsonstream import iter_json_items
+from token_store import TokenStore
+from pool_table import PoolTable
+from creation_index import CreationIndex
+from snapshot_log import SnapshotRecorder
+from snapshot_cache import SnapshotCache, CachedSnapshot
+from risk import RiskScorer
+from sources import PoolSource
+from depth import DepthSampler
+from liquidity import LiquidityProbe
+from http_client import HttpClient
+from metrics import NullMetrics
 
-class RaydiumAPI:
-    def __init__(self):
-        self.cl_pools_url = "https://api.raydium.io/v2/ammV3/ammPools"
-        self.cp_pools_url = "https://api.raydium.io/v2/main/pairs"
-        self.token_url = "https://api.raydium.io/v2/sdk/token/list"
-        
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0',
-            'Accept': 'application/json'
-        })
-        self.sol_price = None
-        self.known_pools = set()
-        self.token_metadata = {}
-        self._fetch_token_metadata()
+# Chunk size used when streaming large list endpoints
+STREAM_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_POOL_CONFIG = {
+    'min_tvl': 1000,
+    'min_tvl_low_volume': 10000,
+    'min_volume_24h': 1,
+}
+
+# Trade fee of Raydium AMM v4 (constant-product) pools
+CP_FEE_RATE = 0.0025
+
+# Marks a pool id the creation index has never seen
+_UNSEEN = object()
+
+
+def _cl_row(pool):
+    """(pool_id, mint_a, mint_b, tvl, volume, fee_rate, price) of a Raydium CL pool list item"""
+    return (
+        str(pool['id']),
+        str(pool['mintA']),
+        str(pool['mintB']),
+        float(pool.get('tvl', 0)),
+        float(pool.get('day', {}).get('volume', 0)),
+        float(pool.get('ammConfig', {}).get('tradeFeeRate', 0)) / 1000000,
+        float(pool.get('price', 0)),
+    )
+
+
+def _cp_row(pair):
+    """(pool_id, mint_a, mint_b, tvl, volume, fee_rate, price) of a Raydium CP pair list item"""
+    return (
+        str(pair['ammId']),
+        str(pair['baseMint']),
+        str(pair['quoteMint']),
+        float(pair.get('liquidity') or 0),
+        float(pair.get('volume24h') or 0),
+        CP_FEE_RATE,
+        float(pair.get('price') or 0),
+    )
+
+class PoolSnapshot:
+    """Items of a pool list endpoint, decoded lazily from the response stream
+
+    Items are decoded only as far as a consumer iterates, and are kept so the
+    next consumer replays them before continuing from the stream. A lookup
+    that stops early therefore never costs a second download. drain() reads
+    the rest without keeping anything, for the table parse.
+    """
+
+    def __init__(self, response, path, metrics=None):
+        self.items = []
+        self.complete = False
+        self.failed = False
+        self._response = response
+        chunks = response.iter_content(STREAM_CHUNK_SIZE)
+        if metrics is not None and metrics.enabled:
+            chunks = self._count_bytes(chunks, metrics)
+        self._source = iter_json_items(chunks, path)
+
+    @staticmethod
+    def _count_bytes(chunks, metrics):
+        for chunk in chunks:
+            metrics.inc('bytes_downloaded', len(chunk))
+            yield chunk
+
+    def __iter__(self):
+        i = 0
+        while True:
+            if i < len(self.items):
+                yield self.items[i]
+                i += 1
+            elif self.complete:
+                return
+            else:
+                try:
+                    self.items.append(next(self._source))
+                except StopIteration:
+                    self.close()
+                    return
+                except Exception:
+                    self.failed = True
+                    self.close()
+                    raise
+
+    def __len__(self):
+        for _ in self:
+            pass
+        return len(self.items)
+
+    def drain(self):
+        """Iterate all items once without keeping them, for a consumer that reads everything
+
+        Items already kept are handed over and dropped. The snapshot is
+        empty afterwards, so the one-pass parse never holds a whole list.
+        """
+        items, self.items = self.items, []
+        yield from items
+        try:
+            yield from self._source
+        except Exception:
+            self.failed = True
+            raise
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the underlying connection"""
+        self.complete = True
+        self._source = iter(())
+        self._response.close()
+
+class RaydiumAPI(PoolSource):
+    name = 'raydium'
+
+    def __init__(self, config=None, metrics=None):
+        self.config = {
+            'snapshot_ttl': 30,  # Seconds a downloaded pool list is reused
+            'request_timeout': 10,  # Seconds for per-token API calls
+            'token_cache_path': 'token_cache.db',  # Local token metadata store
+            'token_refresh_interval': 6 * 3600,  # Seconds between token list refreshes
+            'token_memo_size': 50000,  # Mints whose metadata is kept in memory, least recently used dropped
+            'creation_trim_interval': 3600,  # Seconds between dropping delisted pools from the creation index
+            'pool_sources': ('cl', 'cp'),  # Pool lists scanned by get_pools
+            'creation_index_path': 'pool_created.db',  # First-seen creation times
+            'snapshot_log_path': None,  # Record every downloaded pool table here for replay
+            'snapshot_cache_dir': None,  # Keep the last parsed pool tables on disk for warm starts
+            'snapshot_cache_interval': 300,  # Seconds between rewrites of a cached table after the first
+            # API hosts, overridable to point at a local stand-in server
+            'raydium_api_url': "https://api.raydium.io",
+            'jupiter_api_url': "https://quote-api.jup.ag",
+            'solscan_api_url': "https://api.solscan.io",
+        }
+        if config:
+            self.config.update(config)
+
+        raydium = self.config['raydium_api_url']
+        self.cl_pools_url = f"{raydium}/v2/ammV3/ammPools"
+        self.cp_pools_url = f"{raydium}/v2/main/pairs"
+        self.token_url = f"{raydium}/v2/sdk/token/list"
+        self.jupiter_quote_url = f"{self.config['jupiter_api_url']}/v6/quote"
+        self.solscan_meta_url = f"{self.config['solscan_api_url']}/token/meta"
+
+        # Timings and counters; NullMetrics makes every call a no-op
+        self.metrics = metrics or NullMetrics()
+        # Pooled connections, timeouts and retries for every outbound request
+        self.http = HttpClient(self.config, self.metrics)
+        # Looked up on first use, so constructing the API does no network I/O
+        self._sol_price = None
+        # Loaded from disk on first lookup, refreshed from Raydium in the background
+        self.token_metadata = TokenStore(
+            self.config['token_cache_path'],
+            loader=self._fetch_token_metadata,
+            refresh_interval=self.config['token_refresh_interval'],
+            memo_size=self.config['token_memo_size'],
+        )
+        self._snapshots = {}
+        self.snapshot_cache = None
+        if self.config['snapshot_cache_dir']:
+            self.snapshot_cache = SnapshotCache(self.config['snapshot_cache_dir'])
+            # Rewrites after the first happen here, off the detection path
+            self._cache_writer = ThreadPoolExecutor(max_workers=1)
+        self._cache_written = {}  # URL -> when its table was last handed to the cache
+        # Pool list endpoints: snapshot URL, path to the pool array, empty table
+        # factory and row extractor. Only pool_sources are scanned by get_pools;
+        # other sources such as OrcaSource register their own and read them with get_table
+        self.pool_endpoints = {}
+        self.register_endpoint('cl', self.cl_pools_url, ('data',),
+                               partial(PoolTable, 'CL', 'raydium_cl', "https://raydium.io/pools/"), _cl_row)
+        self.register_endpoint('cp', self.cp_pools_url, (),
+                               partial(PoolTable, 'CP', 'raydium_cp',
+                                       "https://raydium.io/liquidity/increase/?mode=add&pool_id="), _cp_row)
+        # Creation times are recorded the first time a pool is seen, then only looked up
+        self.creation_index = CreationIndex(self.config['creation_index_path'])
+        # Off unless a log path is configured; see replay.py for backtesting against it
+        self.recorder = None
+        if self.config['snapshot_log_path']:
+            self.recorder = SnapshotRecorder(self.config['snapshot_log_path'])
+        # Source -> (snapshot, PoolTable) parsed from it
+        self._tables = {}
+        # Every source asked for so far, whose pools the creation index must keep
+        self._requested_sources = set()
+        self._trimmed_at = time.time()
+        # Source -> when its upstream data last changed, for polling schedulers
+        self.source_changed_at = {}
+        self._source_versions = {}
+        # Sources are fetched and parsed in parallel so a slow one never holds up another
+        self._source_executor = ThreadPoolExecutor(max_workers=max(len(self.config['pool_sources']), 1))
+        # Per source, pools that passed the filters on the previous get_pool_changes call
+        self._active_pools = {}
+        self.liquidity = LiquidityProbe(self, self.config)
+        # Scores filtered pools so only plausible ones reach the network probes
+        self.risk = RiskScorer(self.config)
+        # Impact curves per mint, so a buy size can be chosen without a round trip
+        self.depth = DepthSampler(self, self.config)
         self.cutoff_time = None
-    
+
+    def _get_snapshot(self, url, path=('data',)):
+        """Get the pool list at path for an endpoint, fetched at most once per TTL"""
+        now = time.time()
+        snapshot = self._snapshots.get(url)
+        if snapshot and snapshot['data'].failed:
+            snapshot = None
+        if snapshot is None and self.snapshot_cache:
+            # A fresh process starts from the copy an earlier run left on disk
+            cached = self.snapshot_cache.validators(url)
+            if cached:
+                snapshot = dict(cached, data=None)
+        if snapshot and now - snapshot['fetched_at'] < self.config['snapshot_ttl']:
+            return snapshot['data'] if snapshot['data'] is not None else self._open_cached(url, snapshot)
+
+        # Revalidate the previous copy instead of downloading it again. A copy
+        # that was never read to the end holds a stale connection, so drop it.
+        headers = {}
+        if snapshot and snapshot['data'] is not None and not snapshot['data'].complete:
+            snapshot['data'].close()
+            snapshot = None
+        if snapshot:
+            if snapshot['etag']:
+                headers['If-None-Match'] = snapshot['etag']
+            if snapshot['last_modified']:
+                headers['If-Modified-Since'] = snapshot['last_modified']
+
+        with self.metrics.timer('http_fetch'):
+            response = self.http.get(url, headers=headers, stream=True)
+        if response.status_code == 304 and snapshot:
+            self.metrics.inc('snapshot_not_modified')
+            response.close()
+            snapshot['fetched_at'] = now
+            if self.snapshot_cache:
+                self.snapshot_cache.touch(url, snapshot)
+            return snapshot['data'] if snapshot['data'] is not None else self._open_cached(url, snapshot)
+        if not response.ok:
+            response.close()
+            return None
+
+        data = PoolSnapshot(response, path, self.metrics)
+        self._snapshots[url] = {
+            'data': data,
+            'fetched_at': now,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        return data
+
+    def _cache_table(self, source, url, table):
+        """Save a freshly parsed table for the next process's warm start
+
+        The first table per URL is written at once, so a one-off listing
+        leaves it behind. A monitor parses a new table every few cycles;
+        those are written at most once per snapshot_cache_interval, on a
+        background thread.
+        """
+        now = time.time()
+        written = self._cache_written.get(url)
+        if written is not None and now - written < self.config['snapshot_cache_interval']:
+            return
+        self._cache_written[url] = now
+        validators = dict(self._snapshots[url])
+
+        def store():
+            try:
+                self.snapshot_cache.store(url, validators, table)
+            except OSError as e:
+                print(f"Warning: Failed to cache {source.upper()} pools: {e}")
+
+        if written is None:
+            store()
+        else:
+            self._cache_writer.submit(store)
+
+    def _open_cached(self, url, snapshot):
+        """Adopt the table an earlier run cached on disk as this endpoint's snapshot"""
+        self.metrics.inc('snapshot_cache_hit')
+        # A table is already on disk, so the next one can wait for the writer thread
+        self._cache_written.setdefault(url, snapshot['fetched_at'])
+        snapshot['data'] = self.snapshot_cache.load(url, snapshot)
+        self._snapshots[url] = snapshot
+        return snapshot['data']
+
     def _fetch_token_metadata(self):
-        """Fetch token metadata from Raydium"""
+        """Fetch token metadata from Raydium into the token store"""
         try:
-            # Add well-known tokens
-            well_known = {
-                "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v": {"symbol": "USDC", "name": "USD Coin", "decimals": 6},
-                "So11111111111111111111111111111111111111112": {"symbol": "SOL", "name": "Wrapped SOL", "decimals": 9},
-            }
-            self.token_metadata.update(well_known)
-            
-            # Fetch from API
-            response = self.session.get(self.token_url)
-            if response.ok:
-                data = response.json()
-                tokens = data.get('data', {}).get('tokens', [])
-                for token in tokens:
-                    self.token_metadata[token['mint']] = {
-                        'symbol': token.get('symbol', 'Unknown'),
-                        'name': token.get('name', 'Unknown'),
-                        'decimals': token.get('decimals', 9)
-                    }
+            response = self.http.get(self.token_url, stream=True)
+            if not response.ok:
+                print(f"Warning: Failed to fetch token metadata: HTTP {response.status_code}")
+                return False
+
+            # Write in batches so a refresh never holds the whole list in memory
+            batch = {}
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            for token in iter_json_items(chunks, ('data', 'tokens')):
+                batch[token['mint']] = {
+                    'symbol': token.get('symbol', 'Unknown'),
+                    'name': token.get('name', 'Unknown'),
+                    'decimals': token.get('decimals', 9)
+                }
+                if len(batch) >= 5000:
+                    self.token_metadata.update(batch)
+                    batch = {}
+            self.token_metadata.update(batch)
+            return True
         except Exception as e:
             print(f"Warning: Failed to fetch token metadata: {e}")
+            return False
     
     def get_token_symbol(self, address):
         """Get token symbol from metadata"""
@@ -54,212 +331,495 @@ class RaydiumAPI:
     
     def get_token_metadata(self, address):
         """Get full token metadata"""
+        # Solscan results are stored, so a mint is only looked up remotely once
+        cached = self.token_metadata.get_solscan(address)
+        if cached is not None:
+            return cached
         try:
-            response = self.session.get(f"https://api.solscan.io/token/meta?token={address}")
+            with self.metrics.timer('solscan_metadata'):
+                response = self.http.get(self.solscan_meta_url, params={'token': address},
+                                         timeout=self.config['request_timeout'])
             if response.ok:
-                return response.json().get('data', {})
+                metadata = response.json().get('data', {})
+                self.token_metadata.put_solscan(address, metadata)
+                return metadata
             return None
         except Exception as e:
             print(f"Error fetching token metadata: {e}")
             return None
     
+    def get_pair_price(self, base_mint, quote_mint, refresh=True):
+        """Price of base_mint in quote_mint from the deepest pool across sources, or None
+
+        With refresh=False only already-parsed tables are consulted, so the
+        lookup never triggers a download.
+        """
+        for source in self.config['pool_sources']:
+            if refresh:
+                table = self.get_table(source)
+            else:
+                table = self._tables.get(source, (None, None))[1]
+            if table is None:
+                continue
+            price = table.pair_price(base_mint, quote_mint)
+            if price:
+                return price
+        return None
+
+    def get_token_decimals(self, address):
+        """Token decimals, from a parsed table's per-mint cache when possible"""
+        for _, table in list(self._tables.values()):
+            mint_id = table.mint_ids.get(address)
+            if mint_id is not None:
+                return table.token_info(mint_id, self.token_metadata.get)[1]
+        return self.token_metadata.get(address, {}).get('decimals', 9)
+    
+    @property
+    def sol_price(self):
+        """SOL price in USDC, fetched the first time it is needed"""
+        if self._sol_price is None:
+            self.update_sol_price()
+        return self._sol_price
+
     def update_sol_price(self):
         """Update SOL price from Raydium pools"""
         try:
             sol_address = "So11111111111111111111111111111111111111112"
             usdc_address = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
             
-            # Try CL pools first
-            response = self.session.get(self.cl_pools_url)
-            if response.ok:
-                pools = response.json().get('data', [])
-                for pool in pools:
-                    if (pool.get('mintA') == sol_address and pool.get('mintB') == usdc_address) or \
-                       (pool.get('mintA') == usdc_address and pool.get('mintB') == sol_address):
-                        self.sol_price = float(pool.get('price', 0))
-                        if self.sol_price > 0:
-                            return self.sol_price
-            
-            # Fallback to CP pools
-            response = self.session.get(self.cp_pools_url)
-            if response.ok:
-                pools = response.json()
-                for pool in pools:
-                    if (pool.get('baseMint') == sol_address and pool.get('quoteMint') == usdc_address) or \
-                       (pool.get('baseMint') == usdc_address and pool.get('quoteMint') == sol_address):
-                        self.sol_price = float(pool.get('price', 0))
-                        return self.sol_price
-            
+            # CL pools first, then CP; each is a pair index lookup
+            price = self.get_pair_price(sol_address, usdc_address)
+            if price:
+                self._sol_price = price
+                return self._sol_price
             return 0
         except Exception as e:
             print(f"Error updating SOL price: {e}")
             return 0
     
+    def _request_quote(self, input_mint, output_mint, amount, slippage_bps):
+        """Send one Jupiter quote request and return the raw response
+
+        Not retried by the HTTP client: a 429 has to reach the caller, which
+        pauses the probe's shared token bucket so every Jupiter caller slows down.
+        """
+        params = {
+            "inputMint": input_mint,
+            "outputMint": output_mint,
+            "amount": amount,
+            "slippageBps": slippage_bps
+        }
+        
+        headers = {
+            'Accept': 'application/json',
+            'User-Agent': 'Mozilla/5.0'
+        }
+        
+        with self.metrics.timer('jupiter_quote'):
+            return self.http.get(self.jupiter_quote_url, params=params, headers=headers, retries=0,
+                                 timeout=self.config['request_timeout'])
+
+    def get_quote(self, input_mint, output_mint, amount, slippage_bps=50):
+        """Get a Jupiter quote for amount (in input_mint's smallest unit), or None"""
+        response = self._request_quote(input_mint, output_mint, amount, slippage_bps)
+        if response.status_code == 429:
+            # Slow every Jupiter caller down, not just this one
+            self.liquidity.bucket.pause(float(response.headers.get('Retry-After', 1)))
+            return None
+        if not response.ok:
+            return None
+        data = response.json()
+        if data and 'outAmount' in data:
+            return data
+        return None
+
+    def get_impact_curve(self, token_address):
+        """Price impact curve for buying a token with SOL, sampled at several sizes"""
+        return self.depth.curve(token_address)
+
+    def request_liquidity_quote(self, token_address, amount, slippage_bps):
+        """Request one Jupiter quote for amount lamports of SOL and summarize it"""
+        result = LiquidityProbe._empty_result(token_address)
+
+        # Skip if token is SOL
+        if token_address == "So11111111111111111111111111111111111111112":
+            token_address = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # Use USDC instead
+        
+        response = self._request_quote("So11111111111111111111111111111111111111112",  # SOL
+                                       token_address, amount, slippage_bps)
+        
+        if response.status_code == 429:
+            result['error'] = 'rate limited'
+            result['retry_after'] = float(response.headers.get('Retry-After', 1))
+            return result
+        if response.ok:
+            data = response.json()
+            if data and 'outAmount' in data:
+                out_amount = int(data['outAmount'])
+                decimals = self.get_token_decimals(token_address)
+                result.update({
+                    'has_liquidity': True,
+                    'out_amount': out_amount,
+                    'quote': out_amount / (10 ** decimals),
+                    'price_impact_pct': float(data.get('priceImpactPct') or 0),
+                    'route_count': len(data.get('routePlan') or []),
+                })
+        return result
+
     def check_liquidity(self, token_address, config=None):
-        """Check if token has liquidity on Jupiter"""
+        """Check if token has liquidity on Jupiter, returning the probe result
+
+        The result is truthy only when the token has liquidity.
+        """
         if config is None:
             config = {
                 'test_liquidity_amount': 1000000,  # 0.001 SOL
                 'slippage_bps': 50
             }
 
+        return self.liquidity.probe(token_address, config['test_liquidity_amount'], config['slippage_bps'])
+    
+    def _explicit_creation_time(self, pool_data, now_ts):
+        """Creation time from the pool's own timestamp fields, if it has a valid one"""
+        time_fields = ['openTime', 'startTime', 'createTime', 'timestamp']
+        for field in time_fields:
+            if field in pool_data:
+                try:
+                    timestamp = int(pool_data[field])
+                    if 1000000000 < timestamp < now_ts:  # Valid Unix timestamp
+                        return timestamp
+                except:
+                    continue
+        return None
+
+    def _estimate_creation_time(self, pool_data, now_ts):
+        """Estimate pool creation time from various metrics, as a Unix timestamp"""
+        # Check explicit timestamps first
+        timestamp = self._explicit_creation_time(pool_data, now_ts)
+        if timestamp is not None:
+            return timestamp
+        
+        # For pools without timestamps, check recent activity
         try:
-            # Skip if token is SOL
-            if token_address == "So11111111111111111111111111111111111111112":
-                token_address = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # Use USDC instead
+            volume_24h = float(pool_data.get('volume24h', 0))
+            volume_7d = float(pool_data.get('volume7d', 0))
+            recent_volume = float(pool_data.get('day', {}).get('volume', 0))
             
-            url = "https://quote-api.jup.ag/v6/quote"
-            params = {
-                "inputMint": "So11111111111111111111111111111111111111112",  # SOL
-                "outputMint": token_address,
-                "amount": config['test_liquidity_amount'],
-                "slippageBps": config['slippage_bps']
-            }
+            # Only consider it new if there's very recent activity
+            if recent_volume > 0 and volume_24h == recent_volume:
+                return now_ts - 15 * 60
             
-            headers = {
-                'Accept': 'application/json',
-                'User-Agent': 'Mozilla/5.0'
-            }
-            
-            response = self.session.get(url, params=params, headers=headers)
-            
-            if response.ok:
-                data = response.json()
-                if data and 'outAmount' in data:
-                    # Calculate and display the quote
-                    out_amount = int(data['outAmount'])
-                    decimals = self.token_metadata.get(token_address, {}).get('decimals', 9)
-                    quote = out_amount / (10 ** decimals)
-                    print(f"Quote: {quote} tokens for 0.001 SOL")
-                    return True
-            return False
+            # If it has 24h volume but no 7d volume, it might be new
+            if volume_24h > 0 and volume_7d == 0:
+                return now_ts - 12 * 3600
+                
+        except:
+            pass
             
-        except Exception as e:
-            print(f"Error checking liquidity: {e}")
-            return False
-    
-    def get_pools(self, config=None):
-        """Get all Raydium pools (both CL and CP)"""
-        if config is None:
-            config = {
-                'min_tvl': 1000,
-                'min_tvl_low_volume': 10000,
-                'min_volume_24h': 1,
-            }
+        return None
 
-        pools = []
-        now = datetime.now(timezone.utc)
-        
-        def estimate_creation_time(pool_data):
-            """Estimate pool creation time from various metrics"""
-            # Check explicit timestamps first
-            time_fields = ['openTime', 'startTime', 'createTime', 'timestamp']
-            for field in time_fields:
-                if field in pool_data:
-                    try:
-                        timestamp = int(pool_data[field])
-                        if 1000000000 < timestamp < now.timestamp():  # Valid Unix timestamp
-                            created_at = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-                            return created_at
-                    except:
-                        continue
-            
-            # For pools without timestamps, check recent activity
+    def _creation_time(self, pool_id, pool_data, now_ts, bootstrap):
+        """Creation time for a pool: looked up if recorded, otherwise recorded now
+
+        A pool without its own timestamp is dated to when it first appeared.
+        On a source's very first scan every pool "first appears", so the
+        activity heuristic dates those instead.
+        """
+        created = self.creation_index.get(pool_id, _UNSEEN)
+        if created is not _UNSEEN:
+            return created
+        if bootstrap:
+            created = self._estimate_creation_time(pool_data, now_ts)
+        else:
+            created = self._explicit_creation_time(pool_data, now_ts)
+            if created is None:
+                created = now_ts
+        return self.creation_index.record(pool_id, created)
+
+    def _finish_table(self, table, source, bootstrap):
+        """Persist creation times recorded while building a table and freeze it"""
+        self.creation_index.flush()
+        if bootstrap:
+            self.creation_index.mark_bootstrapped(source)
+        return table.freeze()
+
+    def register_endpoint(self, source, url, path, new_table, row):
+        """Add a pool list endpoint that get_table downloads and parses for source
+
+        path leads to the pool array in the JSON response, new_table()
+        returns an empty PoolTable, and row(item) returns (pool_id, mint_a,
+        mint_b, tvl, volume, fee_rate, price) for one pool item, raising on
+        items it cannot read. The endpoint shares the snapshot cache, ETag
+        revalidation, creation index and recorder with Raydium's own lists.
+        """
+        self.pool_endpoints[source] = (url, path, new_table, row)
+
+    def _build_table(self, source, items):
+        """Parse a source's pool list into a PoolTable with its endpoint's row extractor"""
+        _, _, new_table, row = self.pool_endpoints[source]
+        table = new_table()
+        now_ts = time.time()
+        bootstrap = not self.creation_index.bootstrapped(source)
+        for item in items:
+            if not isinstance(item, dict):
+                continue
             try:
-                volume_24h = float(pool_data.get('volume24h', 0))
-                volume_7d = float(pool_data.get('volume7d', 0))
-                recent_volume = float(pool_data.get('day', {}).get('volume', 0))
-                
-                # Only consider it new if there's very recent activity
-                if recent_volume > 0 and volume_24h == recent_volume:
-                    return now - timedelta(minutes=15)
-                
-                # If it has 24h volume but no 7d volume, it might be new
-                if volume_24h > 0 and volume_7d == 0:
-                    return now - timedelta(hours=12)
-                    
-            except:
-                pass
-                
+                pool_id, mint_a, mint_b, tvl, volume, fee_rate, price = row(item)
+                table.append(pool_id, mint_a, mint_b, tvl, volume,
+                             self._creation_time(pool_id, item, now_ts, bootstrap), fee_rate, price)
+            except Exception as e:
+                continue
+        return self._finish_table(table, source, bootstrap)
+
+    def get_table(self, source):
+        """Get the PoolTable for a source's current snapshot, parsed once per snapshot"""
+        url, path, _, _ = self.pool_endpoints[source]
+        self._requested_sources.add(source)
+        snapshot = self._get_snapshot(url, path)
+        if snapshot is None:
             return None
+        cached = self._tables.get(source)
+        if cached and cached[0] is snapshot:
+            return cached[1]
+        if isinstance(snapshot, CachedSnapshot):
+            with self.metrics.timer('cache_load'):
+                table = snapshot.table()
+        else:
+            # Streaming download, JSON decode and creation-time estimates
+            # The table is all later lookups need, so decoded items are not kept
+            with self.metrics.timer('parse'):
+                table = self._build_table(source, snapshot.drain())
+            if self.snapshot_cache:
+                self._cache_table(source, url, table)
+        self._tables[source] = (snapshot, table)
+        self.metrics.inc('pools_scanned', len(table))
+        if self.recorder:
+            with self.metrics.timer('record'):
+                self.recorder.record(source, table, self._snapshots[url]['fetched_at'])
+        # A fresh download only counts as a change if the ETag, or without
+        # one the pool count, moved
+        version = self._snapshots[url]['etag'] or len(table)
+        if self._source_versions.get(source) != version:
+            self._source_versions[source] = version
+            self.source_changed_at[source] = time.time()
+        return table
+
+    def trim(self):
+        """Drop expired probe results and curves, and delisted pools from the creation index
+
+        Call once per cycle from a long-running monitor. The creation index
+        is only trimmed every creation_trim_interval seconds, and only once
+        every source asked for so far has a table, so no source's pools are
+        forgotten while it is still loading.
+        """
+        self.liquidity.purge()
+        self.depth.purge()
+        now = time.time()
+        if now - self._trimmed_at < self.config['creation_trim_interval']:
+            return
+        tables = dict(self._tables)
+        if not self._requested_sources <= set(tables):
+            return
+        self._trimmed_at = now
+        live = set()
+        for _, table in tables.values():
+            live.update(table.ids)
+        with self.metrics.timer('trim'):
+            self.metrics.inc('creation_index_trimmed', self.creation_index.retain(live))
+
+    def iter_pool_tables(self):
+        """Yield (source, table) for each configured source as soon as it is ready
+
+        All sources are fetched concurrently; one that fails or returns
+        nothing is reported and skipped without affecting the others.
+        """
+        futures = {
+            self._source_executor.submit(self.get_table, source): source
+            for source in self.config['pool_sources']
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                table = future.result()
+            except Exception as e:
+                print(f"Error fetching {source.upper()} pools: {e}")
+                continue
+            if table is not None:
+                yield source, table
+
+    def _cutoff_ts(self):
+        """Window start as a Unix timestamp; no cutoff set means no time filter"""
+        return self.cutoff_time.timestamp() if self.cutoff_time else 0
+
+    def _cached_impacts(self, table, rows):
+        """Price impact of already-cached Jupiter probes for each row's token, NaN if none"""
+        amount = self.config.get('test_liquidity_amount', 1000000)
+        slippage_bps = self.config.get('slippage_bps', 50)
+        impacts = np.full(len(rows), np.nan)
+        mint_a = table.columns['mint_a']
+        for i, row in enumerate(rows):
+            result = self.liquidity.peek(table.mints[mint_a[row]], amount, slippage_bps)
+            if result:
+                impacts[i] = result['price_impact_pct']
+        return impacts
+
+    def _filtered_rows(self, table, config, cutoff_ts=None):
+        """Rows of table that pass the filters, best first
+
+        Returns (rows, scores, flags) with the risk score and flags per row.
+        Pools over max_risk_score are kept; the enricher skips probing them.
+        Price impact is left out of these scores: the probe cache only holds
+        pools that were already enriched, so for new pools it would always
+        count as unknown. cutoff_ts defaults to this API's cutoff_time.
+        """
+        if cutoff_ts is None:
+            cutoff_ts = self._cutoff_ts()
+        with self.metrics.timer('filter'):
+            mask = table.filter_mask(cutoff_ts, config)
+        with self.metrics.timer('sort'):
+            rows = table.sorted_rows(mask)
+        with self.metrics.timer('risk'):
+            scores, flags = self.risk.score(table, rows)
+        self.metrics.inc('pools_passed', len(rows))
+        return rows, scores, flags
+
+    def _view(self, table, row, score, flags, token_lookup=None):
+        """get_pools dict for a row, with its risk score and risks"""
+        pool = table.view(row, token_lookup or self.token_metadata.get)
+        pool['risk_score'] = float(score)
+        pool['risks'] = self.risk.describe(flags)
+        return pool
+
+    def table_pools(self, table, config=None, cutoff_ts=None):
+        """get_pools dicts for the rows of a table that pass the filters, best first
+
+        Filtering, sorting and scoring run on the columns, and dicts are
+        built for the rows that pass only. Used for Raydium's own tables and
+        by other sources for tables from get_table or ones they build.
+        """
+        if config is None:
+            config = DEFAULT_POOL_CONFIG
+        rows, scores, flags = self._filtered_rows(table, config, cutoff_ts)
+        return [self._view(table, *entry) for entry in zip(rows, scores, flags)]
+
+    def iter_pools(self, config=None):
+        """Yield (source, pools) for each source in the order the sources finish"""
+        for source, table in self.iter_pool_tables():
+            print(f"Found {len(table)} {table.pool_type} pools")
+            yield source, self.table_pools(table, config)
+
+    def get_pools(self, config=None):
+        """Get all Raydium pools (both CL and CP)"""
+        pools = []
         
-        # Get Concentrated Liquidity (CL) pools
-        print("Fetching CL pools from Raydium...")
-        try:
-            response = self.session.get(self.cl_pools_url)
-            if response.ok:
-                cl_data = response.json()
-                cl_pools = cl_data.get('data', [])
-                print(f"Found {len(cl_pools)} CL pools")
-                
-                for pool in cl_pools:
-                    if not isinstance(pool, dict):
-                        continue
-                    
-                    try:
-                        created_at = estimate_creation_time(pool)
-                        
-                        # Skip if no valid creation time or too old
-                        if not created_at or created_at < self.cutoff_time:
-                            continue
-                        
-                        # Calculate metrics
-                        tvl = float(pool.get('tvl', 0))
-                        volume_24h = float(pool.get('day', {}).get('volume', 0))
-                        
-                        # Use configurable values for filtering
-                        if tvl < config['min_tvl'] or (volume_24h < config['min_volume_24h'] 
-                            and tvl < config['min_tvl_low_volume']):
-                            continue
-                        
-                        mint_a = str(pool['mintA'])
-                        mint_b = str(pool['mintB'])
-                        symbol_a = self.get_token_symbol(mint_a)
-                        symbol_b = self.get_token_symbol(mint_b)
-                        
-                        pools.append({
-                            'id': str(pool['id']),
-                            'type': 'CL',
-                            'tokenA': mint_a,
-                            'tokenB': mint_b,
-                            'tokenA_symbol': symbol_a,
-                            'tokenB_symbol': symbol_b,
-                            'liquidity': tvl,
-                            'volume_24h': volume_24h,
-                            'fee_rate': float(pool.get('ammConfig', {}).get('tradeFeeRate', 0)) / 1000000,
-                            'price': float(pool.get('price', 0)),
-                            'created_at': created_at,
-                            'source': 'raydium_cl',
-                            'url': f"https://raydium.io/pools/{pool['id']}"
-                        })
-                    except Exception as e:
-                        continue
-                        
-        except Exception as e:
-            print(f"Error fetching CL pools: {e}")
-        
-        # Sort by creation time and quality
-        pools.sort(key=lambda x: (
-            x['created_at'],  # Newest first
-            x['volume_24h'],  # Higher volume first
-            x['liquidity']    # Higher liquidity first
-        ), reverse=True)
+        print("Fetching CL and CP pools from Raydium...")
+        for source, source_pools in self.iter_pools(config):
+            pools.extend(source_pools)
+        # Same order as within a source: newest first, then by volume and liquidity
+        pools.sort(key=lambda pool: (pool['created_at'], pool['volume_24h'], pool['liquidity']),
+                   reverse=True)
         
         print(f"\nTotal active pools found: {len(pools)}")
         return pools
+
+    def iter_pool_changes(self, config=None):
+        """Yield (source, events) for each source in the order the sources finish
+
+        The filters run on the columns of the current PoolTable, and dict
+        views are only built for pools that newly pass them or whose TVL or
+        volume changed. Events are (event, pool) tuples where event is
+        'added', 'changed' or 'removed'. A source that fails this cycle keeps
+        its previous state, so its pools are not reported as removed.
+        """
+        if config is None:
+            config = DEFAULT_POOL_CONFIG
+
+        for source, table in self.iter_pool_tables():
+            previous_pools = self._active_pools.get(source, {})
+            events = []
+            added = []
+            active = {}
+            tvl = table.columns['tvl']
+            volume = table.columns['volume']
+            for row, score, flags in zip(*self._filtered_rows(table, config)):
+                pool_id = table.ids[row]
+                previous = previous_pools.pop(pool_id, None)
+                if previous is None:
+                    pool = self._view(table, row, score, flags)
+                    added.append(('added', pool))
+                elif previous['liquidity'] != tvl[row] or previous['volume_24h'] != volume[row]:
+                    pool = self._view(table, row, score, flags)
+                    events.append(('changed', pool))
+                else:
+                    pool = previous
+                active[pool_id] = pool
+
+            # Whatever is left either vanished, aged out or no longer passes the filters
+            events.extend(('removed', pool) for pool in previous_pools.values())
+            events.extend(added)
+            self._active_pools[source] = active
+            yield source, events
+
+    def get_pool_changes(self, config=None):
+        """Get added, changed and removed pools across all sources since the previous call"""
+        events = []
+        for source, source_events in self.iter_pool_changes(config):
+            events.extend(source_events)
+        return events
+    
+    def check_for_rugpull_risks(self, token_address):
+        """List the risks of the deepest Raydium pool trading a token"""
+        best = None
+        for source, table in self.iter_pool_tables():
+            mint_id = table.mint_ids.get(token_address)
+            if mint_id is None:
+                continue
+            columns = table.columns
+            rows = np.flatnonzero((columns['mint_a'] == mint_id) | (columns['mint_b'] == mint_id))
+            if not len(rows):
+                continue
+            row = rows[np.argmax(columns['tvl'][rows])]
+            if best is None or columns['tvl'][row] > best[0].columns['tvl'][best[1]]:
+                best = (table, row)
+
+        if best is None:
+            return ["No Raydium pool found for this token"]
+        table, row = best
+        rows = np.array([row])
+        scores, flags = self.risk.score(table, rows, self._cached_impacts(table, rows))
+        return self.risk.describe(flags[0])
     
     # ... rest of RaydiumAPI class methods ...
 
 class SolanaSniper:
-    def __init__(self):
-        self.dex = None
-    
-    # ... rest of SolanaSniper class methods ...
+    """Checks on a single Solana token, backed by a RaydiumAPI
+
+    The API is built on first use, so creating a sniper does no network I/O.
+    """
+
+    def __init__(self, config=None, metrics=None):
+        self.config = config
+        self.metrics = metrics
+        self._dex = None
+
+    @property
+    def dex(self):
+        if self._dex is None:
+            self._dex = RaydiumAPI(self.config, self.metrics)
+        return self._dex
+
+    def check_liquidity(self, token_address, config=None):
+        """Jupiter probe result for the token; truthy only if it has liquidity"""
+        return self.dex.check_liquidity(token_address, config)
+
+    def check_for_rugpull_risks(self, token_address):
+        """Risks of the deepest Raydium pool trading the token"""
+        return self.dex.check_for_rugpull_risks(token_address)
 
-def initialize_dex():
+def initialize_dex(config=None, metrics=None):
     """Initialize connection to Raydium APIs"""
     try:
-        dex = RaydiumAPI()
+        dex = RaydiumAPI(config, metrics)
         dex.update_sol_price()
         return dex
     except Exception as e:
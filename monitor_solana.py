@@ -1,16 +1,14 @@
 import argparse
+import contextlib
+import sys
+import threading
 from datetime import datetime, timezone, timedelta
-from memesniper import initialize_dex
+from metrics import Metrics, NullMetrics
+from seen_store import SeenPoolStore, shard_for
 import time
-from config import (
-    MIN_TVL, 
-    MIN_TVL_LOW_VOLUME, 
-    MIN_VOLUME_24H, 
-    TEST_LIQUIDITY_AMOUNT, 
-    SLIPPAGE_BPS,
-    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_NOTIFICATIONS
-)
-import requests
+# memesniper, enrichment, telegram_notifier and config pull in requests,
+# NumPy and the user's settings, so they are imported where first needed
+# to keep --help and argument errors instant
 
 def main():
     parser = argparse.ArgumentParser(description='Monitor Solana tokens and pools')
@@ -18,18 +16,124 @@ def main():
     parser.add_argument('--time', type=int, default=24, help='Time value')
     parser.add_argument('--unit', choices=['minutes', 'hours', 'days'], default='hours', help='Time unit')
     parser.add_argument('--interval', type=int, default=60, help='Monitor interval in seconds')
+    parser.add_argument('--incremental', action='store_true', help='Only process pools that are new or changed since the last cycle')
+    parser.add_argument('--source', choices=['rest', 'logs'], default='rest', help='Poll the Raydium API or subscribe to program logs')
+    parser.add_argument('--dex', nargs='+', choices=['raydium', 'orca', 'pancakeswap'], default=['raydium'],
+                        help='DEXes to discover pools on; the REST source polls them all concurrently')
+    parser.add_argument('--adaptive', action='store_true', help='Adapt the polling interval to launch bursts and upstream refreshes')
+    parser.add_argument('--max-risk-score', type=float,
+                        help='Only probe and alert on pools scoring at most this (default: config.MAX_RISK_SCORE)')
+    parser.add_argument('--depth', action='store_true', help='Sample a price impact curve for pools with liquidity')
+    parser.add_argument('--metrics-file', help='Write timing metrics to this file after every cycle')
+    parser.add_argument('--metrics-format', choices=['prometheus', 'jsonl'], default='prometheus', help='Metrics file format')
+    parser.add_argument('--workers', type=int, default=1, help='Monitor processes, each enriching its own share of pools')
+    parser.add_argument('--seen-db', default='seen_pools.db', help='Seen-pool store shared by all monitors on this host')
+    parser.add_argument('--record', help='Append every downloaded pool snapshot to this log for replay.py')
+    parser.add_argument('--format', choices=['text', 'jsonl'], default='text',
+                        help='Human-readable output, or one JSON record per pool on stdout')
     
     args = parser.parse_args()
+    if args.dex != ['raydium'] and (args.incremental or args.source == 'logs'):
+        parser.error('--incremental and --source logs only cover Raydium; drop them to poll other DEXes')
     
-    monitor = TokenMonitor()
+    config = {
+        'metrics_path': args.metrics_file,
+        'metrics_format': args.metrics_format,
+        'seen_db_path': args.seen_db,
+        'sample_depth': args.depth,
+        'snapshot_log_path': args.record,
+        'dexes': tuple(args.dex),
+    }
+    if args.max_risk_score is not None:
+        config['max_risk_score'] = args.max_risk_score
+    monitor_args = {
+        'time_value': args.time,
+        'unit': args.unit,
+        'interval': args.interval,
+        'incremental': args.incremental,
+        'source': args.source,
+        'adaptive': args.adaptive,
+    }
+    
+    if args.format == 'jsonl':
+        if args.workers > 1:
+            parser.error('--format jsonl runs a single worker')
+        from output import JsonlWriter
+        write_jsonl(args.mode, config, monitor_args, JsonlWriter(sys.stdout.buffer))
+        return
+    
+    if args.mode == 'monitor' and args.workers > 1:
+        run_sharded(args.workers, config, monitor_args)
+        return
+    
+    monitor = TokenMonitor(config)
     
     if args.mode == 'list':
         monitor.list_pools(args.time, args.unit)
     elif args.mode == 'monitor':
-        monitor.monitor_pools(args.time, args.unit, args.interval)
+        monitor.monitor_pools(**monitor_args)
+
+def write_jsonl(mode, config, monitor_args, writer):
+    """Run list or monitor mode, writing one JSON line per pool and nothing else to stdout
+
+    Progress and error messages are sent to stderr instead.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        monitor = TokenMonitor(config)
+        if mode == 'list':
+            for pool, result in monitor.iter_recent_pools(monitor_args['time_value'], monitor_args['unit']):
+                writer.write(pool, result)
+            writer.flush()
+            monitor.close()
+            return
+        try:
+            for pool, result in monitor.iter_new_pools(**monitor_args):
+                writer.write(pool, result, 'new_pool')
+                # Each new pool reaches the consumer as soon as it is detected
+                writer.flush()
+        except KeyboardInterrupt:
+            monitor.close()
+
+def _run_shard(shard_index, shard_count, config, alerts, monitor_args):
+    """Worker process entry point: monitor one shard and queue its alerts"""
+    # Every shard downloads the same snapshots; only the parent records them
+    config = dict(config, shard_index=shard_index, shard_count=shard_count, snapshot_log_path=None)
+    TokenMonitor(config, alert_queue=alerts).monitor_pools(**monitor_args)
+
+def run_sharded(workers, config, monitor_args):
+    """Monitor with several processes that split pools by id hash
+
+    Every process polls the same sources but only enriches pools in its own
+    shard. Alerts from all shards are sent by this process, which dedups
+    them through the shared seen-pool store.
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    alerts = context.Queue()
+    for shard_index in range(1, workers):
+        context.Process(target=_run_shard, args=(shard_index, workers, config, alerts, monitor_args),
+                        daemon=True).start()
+    
+    monitor = TokenMonitor(dict(config, shard_index=0, shard_count=workers))
+    monitor.serve_alerts(alerts)
+    monitor.monitor_pools(**monitor_args)
 
 class TokenMonitor:
-    def __init__(self, config=None):
+    def __init__(self, config=None, alert_queue=None):
+        import config as user_config
+        from config import (
+            MIN_TVL, 
+            MIN_TVL_LOW_VOLUME, 
+            MIN_VOLUME_24H, 
+            TEST_LIQUIDITY_AMOUNT, 
+            SLIPPAGE_BPS,
+            TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_NOTIFICATIONS
+        )
+        # Settings added after config.py.example was first published are
+        # optional, so an existing config.py keeps working
+        SNAPSHOT_TTL = getattr(user_config, 'SNAPSHOT_TTL', 30)
+        MAX_RISK_SCORE = getattr(user_config, 'MAX_RISK_SCORE', 0.75)
         # Default configuration from config.py
         self.config = {
             'min_tvl': MIN_TVL,              
@@ -37,39 +141,156 @@ class TokenMonitor:
             'min_volume_24h': MIN_VOLUME_24H,          
             'test_liquidity_amount': TEST_LIQUIDITY_AMOUNT,  
             'slippage_bps': SLIPPAGE_BPS,           
+            'snapshot_ttl': SNAPSHOT_TTL,
+            'max_risk_score': MAX_RISK_SCORE,  # Riskier pools are listed but not probed or alerted on
+            'metrics_path': None,           # Instrumentation is off unless set
+            'metrics_format': 'prometheus',
+            'telegram_api_url': "https://api.telegram.org",
+            'seen_db_path': 'seen_pools.db',  # Shared by every monitor on this host
+            'shard_index': 0,                 # This process enriches pools where
+            'shard_count': 1,                 # shard_for(id, shard_count) == shard_index
+            'outbox_path': 'telegram_outbox.db',  # Undelivered alerts, kept across restarts
+            'snapshot_cache_dir': 'snapshot_cache',  # Pool lists kept for the next run's warm start
+            'dexes': ('raydium',),            # Pool sources polled by list and REST monitor runs
+            'bsc_node_url': None,             # config.BSC_NODE_URL unless set
         }
         # Update with user config if provided
         if config:
             self.config.update(config)
-        self.dex = initialize_dex()
+        self.metrics = Metrics() if self.config['metrics_path'] else NullMetrics()
+        # The dex, enricher and notifier are built on first use, so a run
+        # does no network I/O until it actually needs pool data
+        self._dex = None
+        self._sources = None
+        self._enricher = None
+        self._notifier = None
+        self._init_lock = threading.RLock()
+        self.seen = SeenPoolStore(self.config['seen_db_path'])
+        # Shard workers hand alerts to the notifier process instead of sending them
+        self.alert_queue = alert_queue
         self.telegram_enabled = TELEGRAM_NOTIFICATIONS
         if self.telegram_enabled:
-            self.telegram_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+            self.telegram_url = f"{self.config['telegram_api_url']}/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
             self.telegram_chat_id = TELEGRAM_CHAT_ID
+
+    @property
+    def dex(self):
+        """RaydiumAPI for this monitor, created on first use"""
+        if self._dex is None:
+            with self._init_lock:
+                if self._dex is None:
+                    from memesniper import RaydiumAPI
+                    self._dex = RaydiumAPI(self.config, self.metrics)
+        return self._dex
+
+    @property
+    def sources(self):
+        """The pool source for list and REST monitor runs: the dex alone, or a fan-out over several"""
+        if self._sources is None:
+            with self._init_lock:
+                if self._sources is None:
+                    self._sources = self._build_sources(self.config['dexes'])
+        return self._sources
+
+    def _build_sources(self, dexes):
+        if tuple(dexes) == ('raydium',):
+            return self.dex
+        from sources import SourceFanout
+        sources = []
+        for name in dexes:
+            if name == 'raydium':
+                sources.append(self.dex)
+            elif name == 'orca':
+                from orca import OrcaSource
+                sources.append(OrcaSource(self.dex, self.config))
+            elif name == 'pancakeswap':
+                from config import BSC_NODE_URL, PANCAKE_ROUTER_ADDRESS
+                from pancakeswap import PancakeSwapSource
+                sources.append(PancakeSwapSource(self.dex, self.config['bsc_node_url'] or BSC_NODE_URL,
+                                                 PANCAKE_ROUTER_ADDRESS, self.config))
+            else:
+                raise ValueError(f"Unknown DEX: {name}")
+        return SourceFanout(sources, self.config)
+
+    @property
+    def enricher(self):
+        """PoolEnricher for this monitor, created on first use"""
+        if self._enricher is None:
+            with self._init_lock:
+                if self._enricher is None:
+                    from enrichment import PoolEnricher
+                    self._enricher = PoolEnricher(self.dex, self.config)
+        return self._enricher
+
+    @property
+    def notifier(self):
+        """Background Telegram sender, or None when this process does not send alerts"""
+        # Sends happen on a background thread; shard workers leave them to the parent
+        if not self.telegram_enabled or self.alert_queue is not None:
+            return None
+        if self._notifier is None:
+            with self._init_lock:
+                if self._notifier is None:
+                    from telegram_notifier import TelegramNotifier
+                    self._notifier = TelegramNotifier(self.dex.http, self.telegram_url, self.telegram_chat_id,
+                                                      self.config, self.metrics).start()
+        return self._notifier
         
-    def list_pools(self, time_value, unit='hours', config=None):
-        """List all pools created in the last X time units"""
+    def _call_config(self, config):
+        """Config for one call: the monitor's own, with any overrides applied"""
         # Allow temporary config override for this call
         if config:
             temp_config = self.config.copy()
             temp_config.update(config)
-        else:
-            temp_config = self.config
-        
-        print("\n==================================================")
-        print("🔍 Recent Solana Pools")
-        print("==================================================\n")
-        
-        # Convert everything to hours for timedelta
+            return temp_config
+        return self.config
+
+    @staticmethod
+    def _window_hours(time_value, unit):
+        """Convert a time window to hours for timedelta"""
         hours = float(time_value)  # Start with the original value
         if unit == 'days':
             hours = time_value * 24
         elif unit == 'minutes':
             hours = time_value / 60
+        return hours
+
+    def _recent_pools(self, cutoff_time, config):
+        """Pools passing the filters that were created after cutoff_time"""
+        self.sources.cutoff_time = cutoff_time
+        pools = self.sources.get_pools(config)
+        
+        # Filter pools by creation time
+        return [
+            pool for pool in pools
+            if pool['created_at'] >= cutoff_time
+        ]
+
+    def iter_recent_pools(self, time_value, unit='hours', config=None):
+        """Yield (pool, result) for every pool created in the last X time units
+
+        result is the PoolEnricher result for the pool. Liquidity checks run
+        in parallel and pools come out in get_pools order.
+        """
+        list_started = time.perf_counter()
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=self._window_hours(time_value, unit))
+        temp_config = self._call_config(config)
+        recent_pools = self._recent_pools(cutoff_time, temp_config)
+        yield from self.enricher.iter_enriched(recent_pools, temp_config)
+        self.metrics.observe('cycle', time.perf_counter() - list_started)
+        self._write_metrics()
+        
+    def list_pools(self, time_value, unit='hours', config=None):
+        """List all pools created in the last X time units"""
+        temp_config = self._call_config(config)
+        
+        print("\n==================================================")
+        print("🔍 Recent Solana Pools")
+        print("==================================================\n")
         
         # Calculate time window
         now = datetime.now(timezone.utc)
-        cutoff_time = now - timedelta(hours=hours)
+        cutoff_time = now - timedelta(hours=self._window_hours(time_value, unit))
         
         # Print time window with original units
         print(f"📅 Showing pools created in last {time_value} {unit}")
@@ -77,23 +298,20 @@ class TokenMonitor:
         print(f"To:   {now.strftime('%Y-%m-%d %H:%M:%S')} UTC\n")
         
         print("Fetching pools...")
-        self.dex.cutoff_time = cutoff_time
-        pools = self.dex.get_pools()
-        
-        # Filter pools by creation time
-        recent_pools = [
-            pool for pool in pools
-            if pool['created_at'] >= cutoff_time
-        ]
+        list_started = time.perf_counter()
+        recent_pools = self._recent_pools(cutoff_time, temp_config)
         
         if recent_pools:
             print(f"\nFound {len(recent_pools)} recent pools\n")
-            for pool in recent_pools:
+            # Liquidity checks run in parallel, output stays in pool order
+            for pool, result in self.enricher.iter_enriched(recent_pools, temp_config):
                 self._print_pool_info(pool)
-                self._check_pool_liquidity(pool)
+                self._print_liquidity(pool, result, temp_config)
                 print("----------------------------------------\n")
         else:
             print("❌ No pools found in this time period")
+        self.metrics.observe('cycle', time.perf_counter() - list_started)
+        self._write_metrics()
     
     def _print_pool_info(self, pool):
         """Print formatted pool information"""
@@ -112,7 +330,8 @@ class TokenMonitor:
         print(f"💧 Liquidity: ${pool['liquidity']:,.2f}")
         print(f"📊 24h Volume: ${pool['volume_24h']:,.2f}")
         print(f"💰 Fee Rate: {pool['fee_rate']*100:.2f}%")
-        print(f"💲 Price: ${pool['price']:.8f}\n")
+        print(f"💲 Price: ${pool['price']:.8f}")
+        print(f"⚠️ Risk: {pool['risk_score']:.2f}" + (f" ({', '.join(pool['risks'])})" if pool['risks'] else "") + "\n")
         
         print("🔍 Token Addresses:")
         print(f"• {pool['tokenA_symbol']}: {pool['tokenA']}")
@@ -123,115 +342,269 @@ class TokenMonitor:
     def _check_pool_liquidity(self, pool):
         """Check pool liquidity using Jupiter API"""
         print("Requesting quote from Jupiter API...")
-        has_liquidity = self.dex.check_liquidity(pool['tokenA'])
+        self._print_liquidity(pool, self.enricher.enrich(pool))
+
+    def _print_liquidity(self, pool, result, config=None):
+        """Print the outcome of a liquidity check from PoolEnricher"""
+        if not result['probed']:
+            print(f"⏭️ Not probed: risk score over {(config or self.config)['max_risk_score']:.2f}")
+            return
+
+        if result['error']:
+            print(f"Error checking liquidity: {result['error']}")
         
-        if has_liquidity:
+        if result['has_liquidity']:
+            liquidity = result['liquidity']
+            # Pools off Solana have no Jupiter quote, only their reserves
+            if liquidity:
+                print(f"Quote: {liquidity['quote']} tokens for 0.001 SOL "
+                      f"(impact {liquidity['price_impact_pct']*100:.2f}%, {liquidity['route_count']} route legs)")
             print("✅ Has liquidity")
+            curve = result.get('depth')
+            if curve and curve.depth:
+                print(f"Depth: {curve.max_amount(0.01) / 1e9:,.2f} SOL at 1% impact, "
+                      f"{curve.max_amount(0.05) / 1e9:,.2f} SOL at 5%")
             print(f"Fetching metadata for token: {pool['tokenA']}")
-            metadata = self.dex.get_token_metadata(pool['tokenA'])
-            if metadata:
-                print(f"Metadata retrieved: {metadata}\n")
+            if result['metadata']:
+                print(f"Metadata retrieved: {result['metadata']}\n")
         else:
             print("❌ No liquidity")
     
-    def send_telegram_notification(self, pool):
-        """Send pool information to Telegram"""
-        try:
-            # Create URLs for different platforms
-            dexscreener_url = f"https://dexscreener.com/solana/{pool['id']}"
-            geckoterminal_url = f"https://www.geckoterminal.com/solana/pools/{pool['id']}"
-            phantom_url = (
-                f"https://phantom.app/ul/browse/"
-                f"token/{pool['tokenB']}?network=mainnet"
-            )
-            
-            message = (
-                "════════════════\n"
-                "NEW POOL ═══════\n"
-                "════════════════\n\n"
-                f"🏊 Pool: {pool['id']}\n"
-                f"💱 Type: {pool['type']}\n"
-                f"🪙 Pair: {pool['tokenA_symbol']}/{pool['tokenB_symbol']}\n"
-                f"💧 Liquidity: ${pool['liquidity']:,.2f}\n"
-                f"📊 24h Volume: ${pool['volume_24h']:,.2f}\n"
-                f"💰 Fee Rate: {pool['fee_rate']*100:.2f}%\n"
-                f"💲 Price: ${pool['price']:.8f}\n\n"
-                "Tokens ──────────\n\n"
-                f"• {pool['tokenA_symbol']}: {pool['tokenA']}\n"
-                f"• {pool['tokenB_symbol']}: {pool['tokenB']}\n\n"
-                "Links ───────────\n\n"
-                f"• <a href='{pool['url']}'>Raydium</a>\n"
-                f"• <a href='{dexscreener_url}'>DexScreener</a>\n"
-                f"• <a href='{geckoterminal_url}'>GeckoTerminal</a>\n"
-                f"• <a href='{phantom_url}'>Phantom</a>\n"
-                "\n\n\n\n"
-            )
-
-            payload = {
-                'chat_id': self.telegram_chat_id,
-                'text': message,
-                'parse_mode': 'HTML',
-                'disable_web_page_preview': True
-            }
-
-            response = requests.post(self.telegram_url, json=payload)
-            if not response.ok:
-                print(f"Failed to send Telegram notification: {response.text}")
-
-        except Exception as e:
-            print(f"Error sending Telegram notification: {e}")
-
-    def monitor_pools(self, time_value, unit='hours', interval=60, config=None):
-        """Continuously monitor for new pools"""
-        if config:
-            temp_config = self.config.copy()
-            temp_config.update(config)
-        else:
-            temp_config = self.config
-        
-        print("\n==================================================")
-        print("🔍 Monitoring Solana Pools")
-        print("==================================================\n")
+    def send_telegram_notification(self, pool, on_sent=None):
+        """Queue pool information for Telegram; returns False if it was already queued"""
+        from telegram_notifier import escape
+
+        # Create URLs for different platforms
+        chain = pool.get('chain', 'solana')
+        dex_name = pool['source'].split('_')[0].capitalize()
+        dexscreener_url = f"https://dexscreener.com/{chain}/{pool['id']}"
+        geckoterminal_url = f"https://www.geckoterminal.com/{chain}/pools/{pool['id']}"
+        phantom_url = (
+            f"https://phantom.app/ul/browse/"
+            f"token/{pool['tokenB']}?network=mainnet"
+        )
+        # Phantom only browses Solana tokens
+        wallet_link = f"• <a href='{phantom_url}'>Phantom</a>\n" if chain == 'solana' else ""
         
-        # Convert everything to hours for timedelta
-        hours = float(time_value)
-        if unit == 'days':
-            hours = time_value * 24
-        elif unit == 'minutes':
-            hours = time_value / 60
-            
-        print(f"📅 Monitoring pools created in last {time_value} {unit}")
-        print(f"⏰ Checking every {interval} seconds\n")
+        message = (
+            "════════════════\n"
+            "NEW POOL ═══════\n"
+            "════════════════\n\n"
+            f"🏊 Pool: {pool['id']}\n"
+            f"💱 Type: {pool['type']}\n"
+            f"🪙 Pair: {escape(pool['tokenA_symbol'])}/{escape(pool['tokenB_symbol'])}\n"
+            f"💧 Liquidity: ${pool['liquidity']:,.2f}\n"
+            f"📊 24h Volume: ${pool['volume_24h']:,.2f}\n"
+            f"💰 Fee Rate: {pool['fee_rate']*100:.2f}%\n"
+            f"💲 Price: ${pool['price']:.8f}\n\n"
+            "Tokens ──────────\n\n"
+            f"• {escape(pool['tokenA_symbol'])}: {pool['tokenA']}\n"
+            f"• {escape(pool['tokenB_symbol'])}: {pool['tokenB']}\n\n"
+            "Links ───────────\n\n"
+            f"• <a href='{pool['url']}'>{dex_name}</a>\n"
+            f"• <a href='{dexscreener_url}'>DexScreener</a>\n"
+            f"• <a href='{geckoterminal_url}'>GeckoTerminal</a>\n"
+            f"{wallet_link}"
+            "\n\n\n\n"
+        )
+        # One line per pool when a burst is coalesced into a digest
+        summary = (
+            f"• <a href='{pool['url']}'>{escape(pool['tokenA_symbol'])}/{escape(pool['tokenB_symbol'])}</a> "
+            f"{pool['type']} ${pool['liquidity']:,.0f} liq, ${pool['volume_24h']:,.0f} vol "
+            f"(<a href='{dexscreener_url}'>chart</a>)"
+        )
+        return self.notifier.enqueue(pool['id'], message, summary, on_sent)
+
+    def _alert_latency_callback(self, detected_at):
+        """Callback recording detection-to-alert latency once a notification is sent"""
+        def record():
+            self.metrics.observe('detection_to_alert', time.perf_counter() - detected_at)
+        return record
+
+    def _write_metrics(self):
+        """Export metrics to the configured file, if instrumentation is on"""
+        if not self.metrics.enabled:
+            return
+        if self._dex is not None:
+            for name, value in self._dex.http.connection_stats().items():
+                self.metrics.set(f"http_{name}", value)
+            for name, value in self._dex.token_metadata.cache_stats().items():
+                self.metrics.set(f"token_memo_{name}", value)
+        try:
+            self.metrics.write(self.config['metrics_path'], self.config['metrics_format'])
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+    def _added_batches(self, config):
+        """Yield the pools added or changed per source since the previous cycle
+
+        Changed pools are included because a change can bring a pool that was
+        too risky to claim when it was added under max_risk_score; the seen
+        store drops the ones already claimed.
+        """
+        for source, events in self.dex.iter_pool_changes(config):
+            pools = [pool for event, pool in events if event != 'removed']
+            added = sum(1 for event, _ in events if event == 'added')
+            removed = len(events) - len(pools)
+            if events:
+                print(f"🔄 {source.upper()}: {added} added, {len(pools) - added} changed, {removed} removed")
+            yield pools
+
+    def _enrich_new_pools(self, pools, cutoff_time, config):
+        """Alert on pools in this shard that no monitor has seen before, yielding (pool, result)
+
+        Pools over max_risk_score are not claimed, so one is picked up as new
+        once its score drops under the threshold.
+        """
+        # Filter and check for new pools
+        detected_at = time.perf_counter()
+        shard_count = self.config['shard_count']
+        max_risk_score = config['max_risk_score']
+        candidates = {
+            pool['id']: pool for pool in pools
+            if pool['created_at'] >= cutoff_time
+            and pool.get('risk_score', 0.0) <= max_risk_score
+            and (shard_count == 1 or shard_for(pool['id'], shard_count) == self.config['shard_index'])
+        }
+        # Remembered for this monitor's window at least, however short another monitor's is
+        retention = (datetime.now(timezone.utc) - cutoff_time).total_seconds()
+        claimed = self.seen.claim(((pool_id, pool['created_at'].timestamp())
+                                   for pool_id, pool in candidates.items()), retention)
+        new_pools = [candidates[pool_id] for pool_id in claimed]
+        self.metrics.inc('pools_new', len(new_pools))
         
-        seen_pools = set()
+        # Enrich the whole burst in parallel, alert in detection order
+        for pool, result in self.enricher.iter_enriched(new_pools, config):
+            self._dispatch_alert(pool, detected_at)
+            yield pool, result
+
+    def _dispatch_alert(self, pool, detected_at=None):
+        """Send the alert for a pool unless another monitor already has"""
+        if self.alert_queue is not None:
+            self.alert_queue.put(pool)
+            return
+        if not self.seen.claim_notification(pool['id']):
+            return
+        # Send Telegram notification
+        if self.telegram_enabled:
+            on_sent = self._alert_latency_callback(detected_at) if detected_at is not None else None
+            self.send_telegram_notification(pool, on_sent)
+        elif detected_at is not None:
+            self.metrics.observe('detection_to_alert', time.perf_counter() - detected_at)
+
+    def serve_alerts(self, alerts):
+        """Send alerts queued by shard worker processes from a background thread"""
+        def drain():
+            while True:
+                self._dispatch_alert(alerts.get())
+
+        threading.Thread(target=drain, daemon=True).start()
+
+    def iter_new_pools(self, time_value, unit='hours', interval=60, config=None, incremental=False,
+                       source='rest', adaptive=False):
+        """Poll for new pools forever, yielding (pool, result) for each one as it is detected
+
+        Only pools within max_risk_score are detected, and each one's alert is
+        dispatched before it is yielded. Call close() once
+        done iterating to stop the worker threads.
+        """
+        temp_config = self._call_config(config)
+        hours = self._window_hours(time_value, unit)
+        log_source = None
+        scheduler = None
+        # Starting the sender resumes alerts an earlier run left in the outbox
+        if self.notifier:
+            self.metrics.set('outbox_pending', self.notifier.pending())
+        if source == 'logs':
+            # New pools are pushed as soon as the initialize transaction lands
+            from config import SOLANA_RPC_URL, RAYDIUM_SWAP_PROGRAM
+            from solana_logs import RaydiumLogSource
+            log_source = RaydiumLogSource(self.dex, SOLANA_RPC_URL, RAYDIUM_SWAP_PROGRAM).start()
+            print(f"📡 Subscribed to Raydium program logs via {log_source.ws_url}\n")
+        elif adaptive:
+            from scheduler import AdaptiveScheduler
+            scheduler = AdaptiveScheduler(interval, temp_config)
+            # The scheduler decides when to poll, so every cycle revalidates the snapshots
+            self.dex.config['snapshot_ttl'] = 0
+            print(f"⏰ Checking about every {interval} seconds, faster during launch bursts\n")
+        else:
+            print(f"⏰ Checking every {interval} seconds\n")
         
         while True:
             try:
+                cycle_started = time.perf_counter()
                 now = datetime.now(timezone.utc)
                 cutoff_time = now - timedelta(hours=hours)
                 self.dex.cutoff_time = cutoff_time
+                if not (log_source or incremental):
+                    self.sources.cutoff_time = cutoff_time
+                # Pools past the window of every monitor sharing the store can never alert again
+                self.seen.evict(now.timestamp())
+                # Keep a process left running for weeks at a steady size
+                self.dex.trim()
                 
-                pools = self.dex.get_pools()
+                if log_source:
+                    batches = [log_source.get_pools(temp_config, cutoff_time.timestamp())]
+                elif incremental:
+                    # Only pools that entered the filtered set since last cycle
+                    batches = self._added_batches(temp_config)
+                else:
+                    # Each source is handled as soon as it arrives, so a slow one
+                    # never delays alerts from the others
+                    batches = (pools for _, pools in self.sources.iter_pools(temp_config))
                 
-                # Filter and check for new pools
-                for pool in pools:
-                    if pool['id'] not in seen_pools and pool['created_at'] >= cutoff_time:
-                        print("\n🆕 New pool detected!")
-                        self._print_pool_info(pool)
-                        self._check_pool_liquidity(pool)
-                        # Send Telegram notification
-                        self.send_telegram_notification(pool)
-                        print("----------------------------------------\n")
-                        seen_pools.add(pool['id'])
+                new_count = 0
+                for pools in batches:
+                    for pool, result in self._enrich_new_pools(pools, cutoff_time, temp_config):
+                        new_count += 1
+                        yield pool, result
                 
-                time.sleep(interval)
+                cycle_time = time.perf_counter() - cycle_started
+                self.metrics.observe('cycle', cycle_time)
+                if scheduler:
+                    changed_at = max(self.dex.source_changed_at.values(), default=None)
+                    scheduler.observe(cycle_time, changed_at, new_count)
+                    self.metrics.set('poll_interval', scheduler.interval)
+                self._write_metrics()
+                
+                if log_source:
+                    log_source.wait_for_pools(interval)
+                elif scheduler:
+                    time.sleep(scheduler.next_delay())
+                else:
+                    time.sleep(interval)
                 
-            except KeyboardInterrupt:
-                print("\n✋ Monitoring stopped")
-                break
             except Exception as e:
                 print(f"Error during monitoring: {e}")
                 time.sleep(interval)
 
+    def monitor_pools(self, time_value, unit='hours', interval=60, config=None, incremental=False,
+                      source='rest', adaptive=False):
+        """Continuously monitor for new pools"""
+        print("\n==================================================")
+        print("🔍 Monitoring Solana Pools")
+        print("==================================================\n")
+        
+        print(f"📅 Monitoring pools created in last {time_value} {unit}")
+        try:
+            for pool, result in self.iter_new_pools(time_value, unit, interval, config, incremental,
+                                                    source, adaptive):
+                print("\n🆕 New pool detected!")
+                self._print_pool_info(pool)
+                self._print_liquidity(pool, result)
+                print("----------------------------------------\n")
+        except KeyboardInterrupt:
+            print("\n✋ Monitoring stopped")
+            self.close()
+
+    def close(self):
+        """Finish in-flight lookups, stop the Telegram sender and close the snapshot log"""
+        if self._enricher is not None:
+            self._enricher.shutdown()
+        if self._notifier is not None:
+            self._notifier.close(timeout=5)
+        if self._dex is not None and self._dex.recorder:
+            self._dex.recorder.close()
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file
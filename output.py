@@ -0,0 +1,67 @@
+import json
+import sys
+
+# Compact separators and no per-value formatting: one line per pool, cheap to encode and parse
+_encode = json.JSONEncoder(separators=(',', ':'), default=str).encode
+
+
+def pool_record(pool, result=None, event='pool'):
+    """Flat JSON-ready dict for a pool and its enrichment result
+
+    Times are Unix seconds and amounts are left unrounded, so consumers
+    never have to parse the human-readable output.
+    """
+    record = {
+        'event': event,
+        'id': pool['id'],
+        'type': pool['type'],
+        'source': pool.get('source'),
+        'chain': pool.get('chain', 'solana'),
+        'created_at': pool['created_at'].timestamp(),
+        'tokenA': pool['tokenA'],
+        'tokenB': pool['tokenB'],
+        'symbolA': pool['tokenA_symbol'],
+        'symbolB': pool['tokenB_symbol'],
+        'liquidity': pool['liquidity'],
+        'volume_24h': pool['volume_24h'],
+        'fee_rate': pool['fee_rate'],
+        'price': pool['price'],
+        'risk_score': pool.get('risk_score'),
+        'risks': pool.get('risks', []),
+        'url': pool['url'],
+    }
+    if result is not None:
+        # A result without liquidity is falsy, so test for None explicitly
+        liquidity = result['liquidity'] if result['liquidity'] is not None else {}
+        curve = result.get('depth')
+        record.update({
+            'probed': result['probed'],
+            'has_liquidity': result['has_liquidity'],
+            'quote': liquidity.get('quote'),
+            'price_impact_pct': liquidity.get('price_impact_pct'),
+            'route_count': liquidity.get('route_count'),
+            'depth': curve.depth if curve else None,  # SOL-side liquidity in lamports
+            'metadata': result['metadata'],
+            'error': result['error'],
+        })
+    return record
+
+
+class JsonlWriter:
+    """Write pool records as JSON lines to a buffered binary stream
+
+    Lines collect in the stream's buffer; flush() hands them to the
+    consumer. list mode flushes once at the end, monitor mode after every
+    pool so a downstream reader sees each one as soon as it is detected.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.count = 0
+
+    def write(self, pool, result=None, event='pool'):
+        self.stream.write(_encode(pool_record(pool, result, event)).encode() + b'\n')
+        self.count += 1
+
+    def flush(self):
+        self.stream.flush()
@@ -0,0 +1,209 @@
+import time
+
+from pool_table import PoolTable
+from risk import RiskScorer
+from sources import PoolSource
+
+# Function selectors and event topics, precomputed since hashlib has no keccak
+FACTORY = '0xc45a0155'       # factory()
+GET_PAIR = '0xe6a43905'      # getPair(address,address)
+GET_RESERVES = '0x0902f1ac'  # getReserves()
+SYMBOL = '0x95d89b41'        # symbol()
+DECIMALS = '0x313ce567'      # decimals()
+PAIR_CREATED = '0x0d3648bd0f6ba80134a33ba9275ac585d9d315f0ad8355cddefde31afa28d0e9'
+
+WBNB = '0xbb4cdb9cbd36b01bd1cbaebf2de08d9173bc095c'
+# 18-decimal dollar stablecoins on BSC
+STABLES = (
+    '0xe9e7cea3dedca5984780bafc599bd69add087d56',  # BUSD
+    '0x55d398326f99059ff775485246999027b3197955',  # USDT
+    '0x8ac76a51cc950d9822d68b83fe1ad97b32cd580d',  # USDC
+)
+BUSD = STABLES[0]
+
+# PancakeSwap v2 trade fee
+V2_FEE_RATE = 0.0025
+
+
+def _word(address):
+    """An address as a 32-byte ABI word"""
+    return address[2:].rjust(64, '0')
+
+
+def _address(word):
+    return '0x' + word[-40:].lower()
+
+
+def _string(result):
+    """Decode an ABI string return value, or a bytes32 one from older tokens"""
+    data = bytes.fromhex(result[2:])
+    if len(data) >= 96:
+        length = int.from_bytes(data[32:64], 'big')
+        return data[64:64 + length].decode(errors='replace')
+    return data[:32].rstrip(b'\0').decode(errors='replace')
+
+
+class PancakeSwapSource(PoolSource):
+    """New PancakeSwap v2 pairs on BSC, found from the factory's PairCreated events
+
+    Each poll scans the blocks since the previous one for PairCreated logs,
+    dates new pairs by their block, and reads reserves for every pair still
+    inside the time window with one batched JSON-RPC call. Liquidity is
+    valued from the WBNB or stablecoin side of a pair; pairs with neither
+    have no known TVL. There is no on-chain 24h volume, so it is reported
+    as zero. Pools come out in the get_pools schema with chain 'bsc'.
+    """
+
+    name = 'pancakeswap'
+
+    def __init__(self, dex, node_url, router_address, config=None):
+        self.config = {
+            'bsc_log_range': 5000,       # Blocks per eth_getLogs request
+            'bsc_block_time': 3,         # Seconds, to find the window's first block
+            'bsc_max_lookback': 86400,   # Seconds scanned on the first poll at most
+            'bsc_batch_size': 100,       # Calls per batched JSON-RPC request
+        }
+        if config:
+            self.config.update(config)
+
+        self.dex = dex
+        self.node_url = node_url
+        self.router_address = router_address.lower()
+        self.factory = None
+        self._bnb_pair = None
+        self.last_block = None
+        self.pairs = {}   # Pair address -> (token0, token1, created_at)
+        self.tokens = {}  # Token address -> {'symbol', 'decimals'}
+        self.risk = RiskScorer(dict(dex.risk.config, risk_trusted_mints=(WBNB,) + STABLES))
+
+    def _rpc_batch(self, calls):
+        """Results of [(method, params), ...], None for a call that failed"""
+        results = []
+        size = self.config['bsc_batch_size']
+        for start in range(0, len(calls), size):
+            chunk = calls[start:start + size]
+            response = self.dex.http.post(self.node_url, json=[
+                {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+                for i, (method, params) in enumerate(chunk)
+            ], idempotent=True, timeout=15)
+            response.raise_for_status()
+            replies = {reply.get('id'): reply.get('result') for reply in response.json()}
+            results.extend(replies.get(i) for i in range(len(chunk)))
+        return results
+
+    def _rpc(self, method, params):
+        return self._rpc_batch([(method, params)])[0]
+
+    def _eth_calls(self, calls):
+        """Results of eth_call for [(to, data), ...]"""
+        return self._rpc_batch([('eth_call', [{'to': to, 'data': data}, 'latest']) for to, data in calls])
+
+    def _scan(self, head, cutoff_ts, now_ts):
+        """Record pairs created since the previous scan"""
+        if self.factory is None:
+            self.factory = _address(self._eth_calls([(self.router_address, FACTORY)])[0])
+        if self.last_block is None:
+            lookback = min(now_ts - cutoff_ts, self.config['bsc_max_lookback'])
+            self.last_block = max(head - int(lookback / self.config['bsc_block_time']), 0)
+
+        logs = []
+        step = self.config['bsc_log_range']
+        for start in range(self.last_block + 1, head + 1, step):
+            logs.extend(self._rpc('eth_getLogs', [{
+                'address': self.factory,
+                'topics': [PAIR_CREATED],
+                'fromBlock': hex(start),
+                'toBlock': hex(min(start + step - 1, head)),
+            }]) or [])
+        self.last_block = head
+
+        blocks = sorted({int(log['blockNumber'], 16) for log in logs})
+        headers = self._rpc_batch([('eth_getBlockByNumber', [hex(block), False]) for block in blocks])
+        timestamps = {block: int(header['timestamp'], 16) for block, header in zip(blocks, headers) if header}
+        for log in logs:
+            created = timestamps.get(int(log['blockNumber'], 16), now_ts)
+            pair = _address(log['data'][2:66])
+            self.pairs[pair] = (_address(log['topics'][1]), _address(log['topics'][2]), created)
+
+    def _load_tokens(self, addresses):
+        """Fetch symbol and decimals for tokens not seen before"""
+        missing = [address for address in addresses if address not in self.tokens]
+        results = self._eth_calls([(address, selector) for address in missing for selector in (SYMBOL, DECIMALS)])
+        for i, address in enumerate(missing):
+            symbol, decimals = results[2 * i], results[2 * i + 1]
+            try:
+                self.tokens[address] = {'symbol': _string(symbol), 'decimals': int(decimals, 16)}
+            except (TypeError, ValueError):
+                self.tokens[address] = {'symbol': 'Unknown', 'decimals': 18}
+
+    def _bnb_price(self):
+        """USD per BNB from the WBNB/BUSD pair's reserves"""
+        if self._bnb_pair is None:
+            self._bnb_pair = _address(self._eth_calls([(self.factory, GET_PAIR + _word(WBNB) + _word(BUSD))])[0])
+        reserves = self._eth_calls([(self._bnb_pair, GET_RESERVES)])[0]
+        if not reserves or len(reserves) < 130:
+            return 0.0
+        reserve0, reserve1 = int(reserves[2:66], 16), int(reserves[66:130], 16)
+        # A pair's tokens are sorted by address
+        bnb, usd = (reserve0, reserve1) if WBNB < BUSD else (reserve1, reserve0)
+        return usd / bnb if bnb else 0.0
+
+    def _build_table(self, bnb_price):
+        """PoolTable of the tracked pairs with their current reserves"""
+        pairs = list(self.pairs.items())
+        self._load_tokens({token for _, (token0, token1, _) in pairs for token in (token0, token1)})
+        reserves = self._eth_calls([(pair, GET_RESERVES) for pair, _ in pairs])
+
+        quote_usd = dict.fromkeys(STABLES, 1.0)
+        quote_usd[WBNB] = bnb_price
+        table = PoolTable('V2', 'pancakeswap', "https://pancakeswap.finance/info/v2/pairs/")
+        for (pair, (token0, token1, created)), result in zip(pairs, reserves):
+            if not result or len(result) < 130:
+                continue
+            amounts = {
+                token0: int(result[2:66], 16) / 10 ** self.tokens[token0]['decimals'],
+                token1: int(result[66:130], 16) / 10 ** self.tokens[token1]['decimals'],
+            }
+            # The new token goes first, as tokenA is the one alerts are about
+            token, quote = (token1, token0) if token0 in quote_usd and token1 not in quote_usd else (token0, token1)
+            usd = quote_usd.get(quote, 0.0)
+            table.append(
+                pair,
+                token,
+                quote,
+                2 * amounts[quote] * usd,  # Both sides of a v2 pair hold equal value
+                0.0,
+                created,
+                V2_FEE_RATE,
+                amounts[quote] / amounts[token] * usd if amounts[token] else 0.0,
+            )
+        return table.freeze()
+
+    def iter_pools(self, config=None):
+        from memesniper import DEFAULT_POOL_CONFIG
+        if config is None:
+            config = DEFAULT_POOL_CONFIG
+
+        now_ts = time.time()
+        cutoff_ts = self.cutoff_time.timestamp() if self.cutoff_time else now_ts - self.config['bsc_max_lookback']
+        head = int(self._rpc('eth_blockNumber', []), 16)
+        self._scan(head, cutoff_ts, now_ts)
+        # Pairs that aged out of the window are no longer tracked
+        self.pairs = {pair: entry for pair, entry in self.pairs.items() if entry[2] >= cutoff_ts}
+        live = {token for token0, token1, _ in self.pairs.values() for token in (token0, token1)}
+        self.tokens = {address: token for address, token in self.tokens.items() if address in live}
+        if not self.pairs:
+            return
+
+        table = self._build_table(self._bnb_price())
+        print(f"Found {len(table)} {table.pool_type} pools on BSC")
+        rows = table.sorted_rows(table.filter_mask(cutoff_ts, config))
+        scores, flags = self.risk.score(table, rows)
+        pools = []
+        for row, score, flag in zip(rows, scores, flags):
+            pool = table.view(row, self.tokens.get)
+            pool['chain'] = 'bsc'
+            pool['risk_score'] = float(score)
+            pool['risks'] = self.risk.describe(flag)
+            pools.append(pool)
+        yield 'pancakeswap', pools
@@ -0,0 +1,187 @@
+from array import array
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+class PoolTable:
+    """Columnar pool snapshot with interned mints and vectorized filtering
+
+    Numeric fields live in typed arrays instead of one dict per pool, and
+    mints are stored once and referenced by small integer ids. Dict views
+    in the get_pools schema are only built for rows that survive filter().
+    Once frozen, each mint pair maps to its deepest row, so pair prices are
+    a dict lookup, and token symbols and decimals are cached per mint id.
+    """
+
+    def __init__(self, pool_type, source, url_prefix):
+        self.pool_type = pool_type
+        self.source = source
+        self.url_prefix = url_prefix
+        self.ids = []
+        self.index = {}
+        self.mints = []
+        self.mint_ids = {}
+        self._columns = {
+            'mint_a': array('i'),
+            'mint_b': array('i'),
+            'tvl': array('d'),
+            'volume': array('d'),
+            'created': array('d'),  # Unix seconds, NaN when unknown
+            'fee_rate': array('d'),
+            'price': array('d'),
+        }
+        self.columns = None
+        # Rows with a known creation time, ordered by it, for window range queries
+        self._created_order = None
+        self._created_sorted = None
+        # Unordered mint id pair -> deepest row trading it
+        self.pair_index = {}
+        # Per mint id, filled on first use
+        self.symbols = []
+        self.decimals = None
+
+    def intern(self, mint):
+        """Map a mint address to a small integer id"""
+        mint_id = self.mint_ids.get(mint)
+        if mint_id is None:
+            mint_id = len(self.mints)
+            self.mint_ids[mint] = mint_id
+            self.mints.append(mint)
+        return mint_id
+
+    def append(self, pool_id, mint_a, mint_b, tvl, volume, created, fee_rate, price):
+        """Add one pool row; created is a Unix timestamp or None"""
+        columns = self._columns
+        self.index[pool_id] = len(self.ids)
+        self.ids.append(pool_id)
+        columns['mint_a'].append(self.intern(mint_a))
+        columns['mint_b'].append(self.intern(mint_b))
+        columns['tvl'].append(tvl)
+        columns['volume'].append(volume)
+        columns['created'].append(float('nan') if created is None else created)
+        columns['fee_rate'].append(fee_rate)
+        columns['price'].append(price)
+
+    def freeze(self):
+        """Expose the columns as NumPy arrays once all rows are appended"""
+        self.columns = {
+            name: np.frombuffer(column, dtype=np.int32 if column.typecode == 'i' else np.float64)
+            for name, column in self._columns.items()
+        }
+        return self._build_indexes()
+
+    @classmethod
+    def from_columns(cls, pool_type, source, url_prefix, ids, mints, columns):
+        """Frozen table over ready-made NumPy columns, whose mint ids index into mints"""
+        table = cls(pool_type, source, url_prefix)
+        table.ids = ids
+        table.index = {pool_id: row for row, pool_id in enumerate(ids)}
+        table.mints = mints
+        table.mint_ids = {mint: mint_id for mint_id, mint in enumerate(mints)}
+        table.columns = columns
+        return table._build_indexes()
+
+    def _build_indexes(self):
+        """Creation-order and pair indexes over the frozen columns"""
+        created = self.columns['created']
+        known = np.flatnonzero(~np.isnan(created))
+        self._created_order = known[np.argsort(created[known], kind='stable')]
+        self._created_sorted = created[self._created_order]
+        self.symbols = [None] * len(self.mints)
+        self.decimals = np.zeros(len(self.mints), dtype=np.int8)
+        self._build_pair_index()
+        return self
+
+    def _pair_key(self, x, y):
+        return min(x, y) * len(self.mints) + max(x, y)
+
+    def _build_pair_index(self):
+        """Map each unordered mint pair to the row with the most liquidity"""
+        columns = self.columns
+        mint_a = columns['mint_a'].astype(np.int64)
+        mint_b = columns['mint_b'].astype(np.int64)
+        keys = np.minimum(mint_a, mint_b) * len(self.mints) + np.maximum(mint_a, mint_b)
+        order = np.lexsort((-columns['tvl'], keys))
+        unique_keys, first = np.unique(keys[order], return_index=True)
+        self.pair_index = dict(zip(unique_keys.tolist(), order[first].tolist()))
+
+    def pair_row(self, mint_x, mint_y):
+        """Deepest row trading two mints in either order, or None"""
+        x = self.mint_ids.get(mint_x)
+        y = self.mint_ids.get(mint_y)
+        if x is None or y is None:
+            return None
+        return self.pair_index.get(self._pair_key(x, y))
+
+    def pair_price(self, base, quote):
+        """Price of base in units of quote from the deepest pool trading them, or None"""
+        row = self.pair_row(base, quote)
+        if row is None:
+            return None
+        price = float(self.columns['price'][row])
+        if self.columns['mint_a'][row] != self.mint_ids[base]:
+            price = 1 / price if price else 0.0
+        return price
+
+    def token_info(self, mint_id, token_lookup):
+        """(symbol, decimals) for an interned mint, looked up once per table"""
+        symbol = self.symbols[mint_id]
+        if symbol is None:
+            token = token_lookup(self.mints[mint_id]) or {}
+            symbol = self.symbols[mint_id] = token.get('symbol', 'Unknown')
+            self.decimals[mint_id] = token.get('decimals', 9)
+        return symbol, int(self.decimals[mint_id])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def window_rows(self, cutoff_ts):
+        """Rows created at or after cutoff_ts, by binary search on the creation order"""
+        start = np.searchsorted(self._created_sorted, cutoff_ts, side='left')
+        return self._created_order[start:]
+
+    def filter_mask(self, cutoff_ts, config):
+        """Boolean mask of rows inside the time window that pass the TVL/volume filters"""
+        columns = self.columns
+        # Only rows inside the window are compared against the TVL/volume filters
+        rows = self.window_rows(cutoff_ts)
+        tvl = columns['tvl'][rows]
+        volume = columns['volume'][rows]
+        low_volume = (volume < config['min_volume_24h']) & (tvl < config['min_tvl_low_volume'])
+        mask = np.zeros(len(self), dtype=bool)
+        mask[rows[(tvl >= config['min_tvl']) & ~low_volume]] = True
+        return mask
+
+    def sorted_rows(self, mask):
+        """Row numbers selected by mask, newest first, then by volume and liquidity"""
+        rows = np.flatnonzero(mask)
+        columns = self.columns
+        order = np.lexsort((
+            -columns['tvl'][rows],
+            -columns['volume'][rows],
+            -columns['created'][rows],
+        ))
+        return rows[order]
+
+    def view(self, row, token_lookup):
+        """Build the get_pools dict for one row; token_lookup maps a mint to its metadata"""
+        columns = self.columns
+        pool_id = self.ids[row]
+        mint_a_id = columns['mint_a'][row]
+        mint_b_id = columns['mint_b'][row]
+        return {
+            'id': pool_id,
+            'type': self.pool_type,
+            'tokenA': self.mints[mint_a_id],
+            'tokenB': self.mints[mint_b_id],
+            'tokenA_symbol': self.token_info(mint_a_id, token_lookup)[0],
+            'tokenB_symbol': self.token_info(mint_b_id, token_lookup)[0],
+            'liquidity': float(columns['tvl'][row]),
+            'volume_24h': float(columns['volume'][row]),
+            'fee_rate': float(columns['fee_rate'][row]),
+            'price': float(columns['price'][row]),
+            'created_at': datetime.fromtimestamp(columns['created'][row], tz=timezone.utc),
+            'source': self.source,
+            'url': f"{self.url_prefix}{pool_id}"
+        }
@@ -0,0 +1,120 @@
+import time
+
+import numpy as np
+
+from token_store import WELL_KNOWN_TOKENS
+
+USDT = "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
+
+# Bit flags set per pool, with the description check_for_rugpull_risks reports
+FLAG_BLOCKLISTED = 1
+FLAG_LOW_LIQUIDITY = 2
+FLAG_NO_VOLUME = 4
+FLAG_WASH_VOLUME = 8
+FLAG_NEW = 16
+FLAG_HIGH_IMPACT = 32
+FLAG_UNKNOWN_PAIR = 64
+
+RISK_DESCRIPTIONS = (
+    (FLAG_BLOCKLISTED, "Token is on the blocklist"),
+    (FLAG_LOW_LIQUIDITY, "Low liquidity"),
+    (FLAG_NO_VOLUME, "No trading volume in the last 24h"),
+    (FLAG_WASH_VOLUME, "24h volume far exceeds liquidity (possible wash trading)"),
+    (FLAG_NEW, "Pool is less than an hour old"),
+    (FLAG_HIGH_IMPACT, "High price impact on a small buy"),
+    (FLAG_UNKNOWN_PAIR, "Not paired with SOL or a stablecoin"),
+)
+
+
+class RiskScorer:
+    """Rugpull risk scores for whole batches of PoolTable rows at once
+
+    Each pool gets a score in [0, 1] from its liquidity, volume/TVL ratio,
+    age, Jupiter price impact (when a quote is already cached) and whether
+    it trades against a trusted quote token. Blocklisted mints score 1. All
+    of it is computed on the table's columns, so scoring a batch costs a
+    few array operations instead of a Python loop per pool.
+    """
+
+    def __init__(self, config=None):
+        self.config = {
+            'max_risk_score': 0.75,         # Pools scoring higher are listed but not probed or alerted on
+            'risk_tvl_safe': 50000,         # USD of liquidity that counts as deep
+            'risk_age_safe': 24 * 3600,     # Seconds after which age adds no risk
+            'risk_wash_ratio': 10,          # 24h volume / TVL that looks like wash trading
+            'risk_impact_max': 0.05,        # Price impact that counts as fully illiquid
+            'risk_blocklist': (),
+            'risk_trusted_mints': tuple(WELL_KNOWN_TOKENS) + (USDT,),
+        }
+        if config:
+            self.config.update(config)
+
+        self.weights = {'liquidity': 0.35, 'volume': 0.2, 'impact': 0.2, 'age': 0.15, 'pair': 0.1}
+
+    @staticmethod
+    def _mint_mask(table, mints):
+        """Boolean array over the table's interned mint ids, True for the given mints"""
+        mask = np.zeros(len(table.mints), dtype=bool)
+        ids = [table.mint_ids[mint] for mint in mints if mint in table.mint_ids]
+        mask[ids] = True
+        return mask
+
+    def score(self, table, rows, impacts=None, now_ts=None):
+        """Risk scores and flag bitmasks for rows of a frozen PoolTable
+
+        impacts holds the cached price impact per row, NaN where no quote
+        has been made yet; unknown impact and unknown age count as half risk.
+        Without impacts, as when listing pools before any probe, the impact
+        weight is left out and the others are scaled up to fill it, so the
+        score is not shifted by a constant for an input nobody measured.
+        """
+        config = self.config
+        columns = table.columns
+        rows = np.asarray(rows, dtype=np.intp)
+        now_ts = time.time() if now_ts is None else now_ts
+        tvl = columns['tvl'][rows]
+        volume = columns['volume'][rows]
+        mint_a = columns['mint_a'][rows]
+        mint_b = columns['mint_b'][rows]
+        weights = self.weights
+        if impacts is None:
+            impacts = np.full(len(rows), np.nan)
+            total = 1 - weights['impact']
+            weights = {name: weight / total for name, weight in weights.items()}
+            weights['impact'] = 0.0
+
+        liquidity_risk = 1 - np.clip(np.log10(np.maximum(tvl, 1)) / np.log10(config['risk_tvl_safe']), 0, 1)
+        ratio = volume / np.maximum(tvl, 1)
+        wash = config['risk_wash_ratio']
+        volume_risk = np.where(volume <= 0, 1.0, np.clip((ratio - wash) / wash, 0, 1))
+        age = now_ts - columns['created'][rows]
+        age_risk = np.nan_to_num(1 - np.clip(age / config['risk_age_safe'], 0, 1), nan=0.5)
+        impact_risk = np.nan_to_num(np.clip(impacts / config['risk_impact_max'], 0, 1), nan=0.5)
+        trusted = self._mint_mask(table, config['risk_trusted_mints'])
+        untrusted = ~(trusted[mint_a] | trusted[mint_b])
+        blocklist = self._mint_mask(table, config['risk_blocklist'])
+        blocked = blocklist[mint_a] | blocklist[mint_b]
+
+        scores = (
+            weights['liquidity'] * liquidity_risk
+            + weights['volume'] * volume_risk
+            + weights['impact'] * impact_risk
+            + weights['age'] * age_risk
+            + weights['pair'] * untrusted
+        )
+        scores[blocked] = 1.0
+
+        flags = np.zeros(len(rows), dtype=np.uint8)
+        flags[blocked] |= FLAG_BLOCKLISTED
+        flags[liquidity_risk > 0.5] |= FLAG_LOW_LIQUIDITY
+        flags[volume <= 0] |= FLAG_NO_VOLUME
+        flags[ratio > wash] |= FLAG_WASH_VOLUME
+        flags[age < 3600] |= FLAG_NEW
+        flags[impact_risk >= 1] |= FLAG_HIGH_IMPACT
+        flags[untrusted] |= FLAG_UNKNOWN_PAIR
+        return scores, flags
+
+    @staticmethod
+    def describe(flags):
+        """Human-readable risks for one pool's flag bitmask"""
+        return [description for flag, description in RISK_DESCRIPTIONS if flags & flag]
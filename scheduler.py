@@ -0,0 +1,69 @@
+import statistics
+import time
+from collections import deque
+
+
+class AdaptiveScheduler:
+    """Picks the delay before the next monitor cycle from what recent cycles saw
+
+    The interval halves while new pools keep arriving and grows by half
+    each cycle the upstream data is unchanged, staying within
+    [min_interval, max_interval]. Once a few upstream changes have been
+    seen, their median spacing is taken as Raydium's refresh period and
+    polls are aligned to land just after the next expected refresh. Time
+    spent in the cycle itself counts towards the interval.
+    """
+
+    def __init__(self, base_interval, config=None):
+        self.config = {
+            'min_interval': 5,              # Seconds, floor during bursts
+            'max_interval': max(base_interval * 4, 5),
+            'align_margin': 1.0,            # Seconds to poll after an expected refresh
+            'change_history': 10,           # Upstream changes used to estimate the period
+        }
+        if config:
+            self.config.update(config)
+
+        self.base_interval = base_interval
+        self.interval = float(base_interval)
+        self.changes = deque(maxlen=self.config['change_history'])
+        self.cycle_duration = 0.0
+
+    def observe(self, cycle_duration, changed_at=None, new_pools=0):
+        """Record one cycle: its duration, the latest upstream change time and new pool count"""
+        self.cycle_duration = cycle_duration
+        changed = changed_at is not None and (not self.changes or changed_at > self.changes[-1])
+        if changed:
+            self.changes.append(changed_at)
+
+        if new_pools:
+            self.interval /= 2
+        elif not changed:
+            self.interval *= 1.5
+        else:
+            # Data moved but nothing new: drift back towards the configured interval
+            self.interval += (self.base_interval - self.interval) / 2
+        self.interval = min(max(self.interval, self.config['min_interval']), self.config['max_interval'])
+
+    def period(self):
+        """Estimated upstream refresh period in seconds, or None until enough changes were seen"""
+        if len(self.changes) < 3:
+            return None
+        gaps = [later - earlier for earlier, later in zip(self.changes, list(self.changes)[1:])]
+        return statistics.median(gaps)
+
+    def next_delay(self, now=None):
+        """Seconds to sleep before the next cycle"""
+        now = time.time() if now is None else now
+        # The interval is start-to-start, so the cycle's own duration counts towards it
+        delay = self.interval - self.cycle_duration
+        period = self.period()
+        if period is not None:
+            expected = self.changes[-1] + period
+            # A refresh missed by more than a period means the estimate is stale
+            if now < expected + period:
+                aligned = max(expected - now, 0) + self.config['align_margin']
+                bursting = self.interval < self.base_interval
+                delay = min(aligned, delay) if bursting else aligned
+        floor = self.config['min_interval'] - self.cycle_duration
+        return min(max(delay, floor, 0), self.config['max_interval'])
@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+import time
+import zlib
+
+# Seconds a pool is remembered when the caller does not say how long it watches it
+DEFAULT_RETENTION = 24 * 3600
+
+
+def shard_for(pool_id, shard_count):
+    """Stable shard number for a pool id, the same in every process"""
+    return zlib.crc32(pool_id.encode()) % shard_count
+
+
+class SeenPoolStore:
+    """Pools already detected and notified, shared by every monitor on the host
+
+    Backed by SQLite in WAL mode so several processes can read and claim
+    pools concurrently. claim() and claim_notification() are atomic across
+    processes: exactly one caller wins for a given pool id. Each row
+    expires once the pool has left the window of every monitor that claimed
+    it: a claim keeps the latest expiry asked for, so a monitor with a short
+    window never drops pools another one is still watching. The store stays
+    the size of the longest window and survives restarts.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Open the database and create the schema on first use"""
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                pool_id TEXT PRIMARY KEY,
+                created_at REAL,
+                seen_at REAL,
+                notified_at REAL,
+                expires_at REAL
+            )
+        """)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(seen)")]
+        if 'expires_at' not in columns:
+            # Stores from before per-row expiry; another process may be migrating too
+            try:
+                with conn:
+                    conn.execute("ALTER TABLE seen ADD COLUMN expires_at REAL")
+                    conn.execute("UPDATE seen SET expires_at = created_at + ?", (DEFAULT_RETENTION,))
+            except sqlite3.OperationalError:
+                pass
+        conn.execute("CREATE INDEX IF NOT EXISTS seen_expires_at ON seen (expires_at)")
+        conn.commit()
+        return conn
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def claim(self, pools, retention=DEFAULT_RETENTION):
+        """Record (pool_id, created_ts) pairs; returns the ids no monitor had seen before
+
+        retention is the caller's window in seconds: a pool is kept at least
+        until it is that old, or longer if another monitor asked for longer.
+        """
+        now = time.time()
+        claimed = []
+        with self._lock:
+            conn = self._db()
+            with conn:
+                for pool_id, created_ts in pools:
+                    expires_at = created_ts + retention
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO seen (pool_id, created_at, seen_at, expires_at) VALUES (?, ?, ?, ?)",
+                        (pool_id, created_ts, now, expires_at))
+                    if cursor.rowcount == 1:
+                        claimed.append(pool_id)
+                    else:
+                        conn.execute("UPDATE seen SET expires_at = ? WHERE pool_id = ? AND expires_at < ?",
+                                     (expires_at, pool_id, expires_at))
+        return claimed
+
+    def claim_notification(self, pool_id, retention=DEFAULT_RETENTION):
+        """Mark a pool as notified; True only for the first caller across all processes"""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE seen SET notified_at = ? WHERE pool_id = ? AND notified_at IS NULL",
+                    (time.time(), pool_id))
+                if cursor.rowcount == 1:
+                    return True
+                # Pools sent straight to the notifier may not have been claimed here
+                now = time.time()
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO seen (pool_id, created_at, seen_at, notified_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (pool_id, now, now, now, now + retention))
+                return cursor.rowcount == 1
+
+    def __contains__(self, pool_id):
+        with self._lock:
+            return self._db().execute("SELECT 1 FROM seen WHERE pool_id = ?", (pool_id,)).fetchone() is not None
+
+    def evict(self, now_ts=None):
+        """Forget pools that every claiming monitor's window has passed; returns how many were dropped"""
+        now_ts = time.time() if now_ts is None else now_ts
+        with self._lock:
+            conn = self._db()
+            with conn:
+                return conn.execute("DELETE FROM seen WHERE expires_at < ?", (now_ts,)).rowcount
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from pool_table import PoolTable
+
+
+def _pack(strings):
+    """Strings as the bytes of one newline-terminated list"""
+    return np.frombuffer(''.join(string + '\n' for string in strings).encode(), dtype=np.uint8)
+
+
+def _unpack(packed):
+    return packed.tobytes().decode().split('\n')[:-1]
+
+
+class SnapshotCache:
+    """Parsed pool tables kept on disk with the validators of the response they came from
+
+    Lets a fresh process start warm: a table younger than the snapshot TTL
+    is used without any request, and an older one is revalidated with its
+    ETag, so an unchanged list is neither downloaded nor parsed again.
+    Tables are written under a temporary name and renamed into place, so
+    a reader never sees a partial one. Pool ids and mints are stored as one
+    newline-joined byte string each rather than fixed-width unicode arrays,
+    which would take four bytes per character.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        name = hashlib.sha1(url.encode()).hexdigest()[:16]
+        base = os.path.join(self.directory, name)
+        return base + '.npz', base + '.meta'
+
+    def _replace(self, path, write):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def validators(self, url):
+        """{'etag', 'last_modified', 'fetched_at', ...} of the cached table, or None"""
+        table_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(table_path):
+            return None
+        return meta
+
+    def touch(self, url, validators):
+        """Record that the cached table was revalidated at validators['fetched_at']
+
+        Skipped when the table on disk is from another version of the list
+        than the one just revalidated, as happens between throttled writes.
+        """
+        meta = self.validators(url)
+        if meta is not None and all(meta[key] == validators[key] for key in ('etag', 'last_modified')):
+            meta['fetched_at'] = validators['fetched_at']
+            _, meta_path = self._paths(url)
+            self._replace(meta_path, lambda f: f.write(json.dumps(meta).encode()))
+
+    def store(self, url, validators, table):
+        """Save a frozen table along with the validators of its response"""
+        table_path, meta_path = self._paths(url)
+        arrays = {name: np.asarray(column) for name, column in table.columns.items()}
+        self._replace(table_path, lambda f: np.savez(f, ids=_pack(table.ids), mints=_pack(table.mints), **arrays))
+        meta = {key: validators[key] for key in ('etag', 'last_modified', 'fetched_at')}
+        meta.update(pool_type=table.pool_type, source=table.source, url_prefix=table.url_prefix)
+        self._replace(meta_path, lambda f: f.write(json.dumps(meta).encode()))
+
+    def load(self, url, meta):
+        """A CachedSnapshot for url's table, read from disk when its table is first asked for"""
+        table_path, _ = self._paths(url)
+        return CachedSnapshot(table_path, meta)
+
+
+class CachedSnapshot:
+    """Stands in for a PoolSnapshot whose table was parsed by an earlier run"""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.items = []
+        self.complete = True
+        self.failed = False
+
+    def table(self):
+        with np.load(self.path) as data:
+            columns = {name: data[name] for name in data.files if name not in ('ids', 'mints')}
+            return PoolTable.from_columns(self.meta['pool_type'], self.meta['source'], self.meta['url_prefix'],
+                                          _unpack(data['ids']), _unpack(data['mints']), columns)
+
+    def close(self):
+        pass
@@ -0,0 +1,281 @@
+import gzip
+import json
+import math
+import mmap
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from pool_table import PoolTable
+
+_GZIP_MAGIC = b'\x1f\x8b\x08'
+_READ_SIZE = 1 << 16
+
+
+class SnapshotRecorder:
+    """Append every freshly downloaded pool table to a gzip-compressed log
+
+    Each snapshot is one JSON line holding only the pools that are new or
+    changed since the previous snapshot of the same source, plus the ids
+    that disappeared, so a log of days of polling stays small. The first
+    snapshot per source after opening the log is written in full, which
+    lets a restarted recorder append to an existing log. Every line is its
+    own gzip member, flushed as it is written, so a crash loses at most the
+    snapshot being written and the log stays readable past it.
+
+    record() only queues the table: diffing, encoding and compression run
+    on a background thread, so recording never delays detection. Tables are
+    frozen, so the writer can read them while the caller moves on.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'ab')
+        self._previous = {}  # Source -> PoolTable as last written
+        self._writer = ThreadPoolExecutor(max_workers=1)
+
+    def record(self, source, table, fetched_at):
+        """Queue a table to be written as the difference from the source's previous one"""
+        self._writer.submit(self._write, source, table, fetched_at)
+
+    @staticmethod
+    def _changes(previous, table):
+        """Rows of table that are new or differ from previous, and the ids previous had but table lacks"""
+        size = len(table)
+        if previous is None:
+            return np.arange(size), []
+        if table.ids == previous.ids:
+            previous_rows = np.arange(size)
+        else:
+            previous_rows = np.fromiter(map(previous.index.get, table.ids, repeat(-1)), dtype=np.intp, count=size)
+        known = previous_rows >= 0
+        matched = np.where(known, previous_rows, 0)
+
+        # Mint ids are interned per table, so map the previous table's onto this one's
+        mint_ids = np.fromiter((table.mint_ids.get(mint, -1) for mint in previous.mints), dtype=np.int64,
+                               count=len(previous.mints))
+        changed = ~known
+        for name in ('mint_a', 'mint_b'):
+            changed |= mint_ids[previous.columns[name][matched]] != table.columns[name]
+        for name in ('tvl', 'volume', 'created', 'fee_rate', 'price'):
+            old, new = previous.columns[name][matched], table.columns[name]
+            changed |= ~((old == new) | (np.isnan(old) & np.isnan(new)))
+
+        kept = np.zeros(len(previous), dtype=bool)
+        kept[previous_rows[known]] = True
+        removed = [previous.ids[row] for row in np.flatnonzero(~kept).tolist()]
+        return np.flatnonzero(changed), removed
+
+    @staticmethod
+    def _rows(table, rows):
+        """(pool_id, mint_a, mint_b, tvl, volume, created, fee_rate, price) for the given rows"""
+        columns = table.columns
+        mints = table.mints
+        ids = table.ids
+        rows = rows.tolist()
+        created = [None if math.isnan(value) else value for value in columns['created'][rows].tolist()]
+        return list(zip(
+            [ids[row] for row in rows],
+            [mints[i] for i in columns['mint_a'][rows].tolist()],
+            [mints[i] for i in columns['mint_b'][rows].tolist()],
+            columns['tvl'][rows].tolist(),
+            columns['volume'][rows].tolist(),
+            created,
+            columns['fee_rate'][rows].tolist(),
+            columns['price'][rows].tolist(),
+        ))
+
+    def _write(self, source, table, fetched_at):
+        previous = self._previous.get(source)
+        changed, removed = self._changes(previous, table)
+        frame = {
+            'ts': fetched_at,
+            'source': source,
+            'type': table.pool_type,
+            'name': table.source,
+            'url': table.url_prefix,
+            'full': previous is None,
+            'pools': self._rows(table, changed),
+            'removed': removed,
+        }
+        line = json.dumps(frame, separators=(',', ':')).encode() + b'\n'
+        try:
+            self._file.write(gzip.compress(line, compresslevel=6))
+            self._file.flush()
+        except OSError as e:
+            print(f"Warning: Failed to record {source.upper()} pools: {e}")
+            return
+        self._previous[source] = table
+
+    def close(self):
+        """Write every queued table, then close the log"""
+        self._writer.shutdown(wait=True)
+        self._file.close()
+
+
+class _SourceState:
+    """One source's pools as of the latest replayed snapshot, kept as growable columns
+
+    Changed pools are updated in place and new ones appended, so applying a
+    snapshot costs as much as the pools it changed. Removed pools are
+    blanked out and only compacted away once they make up half the rows.
+    """
+
+    NAMES = ('mint_a', 'mint_b', 'tvl', 'volume', 'created', 'fee_rate', 'price')
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self.mints = []
+        self.mint_ids = {}
+        self.removed = 0
+        self.columns = {
+            name: np.empty(1024, dtype=np.int32 if name.startswith('mint') else np.float64)
+            for name in self.NAMES
+        }
+
+    def _intern(self, mint):
+        mint_id = self.mint_ids.get(mint)
+        if mint_id is None:
+            mint_id = self.mint_ids[mint] = len(self.mints)
+            self.mints.append(mint)
+        return mint_id
+
+    def _grow(self, size):
+        for name, column in self.columns.items():
+            if len(column) < size:
+                grown = np.empty(max(size, len(column) * 2), dtype=column.dtype)
+                grown[:len(self.ids)] = column[:len(self.ids)]
+                self.columns[name] = grown
+
+    def apply(self, frame):
+        """Apply one frame's changed and removed pools"""
+        columns = self.columns
+        for pool_id in frame['removed']:
+            row = self.index.pop(pool_id, None)
+            if row is not None:
+                # Blank rows fall outside every time window and TVL filter
+                columns['created'][row] = np.nan
+                columns['tvl'][row] = np.nan
+                self.removed += 1
+
+        new = [pool for pool in frame['pools'] if pool[0] not in self.index]
+        self._grow(len(self.ids) + len(new))
+        for pool in frame['pools']:
+            pool_id, mint_a, mint_b, tvl, volume, created, fee_rate, price = pool
+            row = self.index.get(pool_id)
+            if row is None:
+                row = self.index[pool_id] = len(self.ids)
+                self.ids.append(pool_id)
+            columns['mint_a'][row] = self._intern(mint_a)
+            columns['mint_b'][row] = self._intern(mint_b)
+            columns['tvl'][row] = tvl
+            columns['volume'][row] = volume
+            columns['created'][row] = np.nan if created is None else created
+            columns['fee_rate'][row] = fee_rate
+            columns['price'][row] = price
+
+        if self.removed * 2 > len(self.ids):
+            self._compact()
+
+    def _compact(self):
+        """Drop blanked rows once they make up half the table"""
+        live = np.array(sorted(self.index.values()), dtype=np.intp)
+        self.ids = [self.ids[row] for row in live.tolist()]
+        self.index = {pool_id: row for row, pool_id in enumerate(self.ids)}
+        self.columns = {name: column[live] for name, column in self.columns.items()}
+        self.removed = 0
+
+    def table(self, frame):
+        """A frozen PoolTable of the current state, independent of later frames"""
+        size = len(self.ids)
+        columns = {name: column[:size].copy() for name, column in self.columns.items()}
+        return PoolTable.from_columns(frame['type'], frame['name'], frame['url'],
+                                      list(self.ids), list(self.mints), columns)
+
+
+def _salvage(decompressor, chunk, step=256):
+    """Output of chunk up to the byte where it stops decompressing"""
+    output = []
+    for i in range(0, len(chunk), step):
+        piece = chunk[i:i + step]
+        saved = decompressor.copy()
+        try:
+            output.append(decompressor.decompress(piece))
+        except zlib.error:
+            for j in range(len(piece)):
+                try:
+                    output.append(saved.decompress(piece[j:j + 1]))
+                except zlib.error:
+                    break
+            break
+    return b''.join(output)
+
+
+def _iter_lines(path):
+    """Complete lines of a gzip log, decoded member by member
+
+    A member cut short by a crash is skipped up to the next member header,
+    so the frames a restarted recorder appended after it are still read.
+    Logs written as one long member by older versions are read the same way.
+    """
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty log
+        with data:
+            pos = 0
+            while pos < len(data):
+                start = pos
+                decompressor = zlib.decompressobj(wbits=31)
+                pending = b''
+                try:
+                    while not decompressor.eof and pos < len(data):
+                        chunk = data[pos:pos + _READ_SIZE]
+                        pos += len(chunk)
+                        before = decompressor.copy()
+                        pending += decompressor.decompress(chunk)
+                        *lines, pending = pending.split(b'\n')
+                        yield from lines
+                except zlib.error:
+                    # The error discards the whole chunk's output, so decode it
+                    # again in small steps to keep the lines before the damage
+                    pending += _salvage(before, chunk)
+                    yield from pending.split(b'\n')[:-1]
+                else:
+                    if decompressor.eof:
+                        pos -= len(decompressor.unused_data)
+                        continue
+                # Damaged or unfinished member; its last partial line is dropped
+                pos = data.find(_GZIP_MAGIC, start + 1)
+                if pos < 0:
+                    return
+
+
+def iter_snapshots(path):
+    """Yield (fetched_at, source, PoolTable) for every snapshot in a recorded log
+
+    Tables are rebuilt from the accumulated changes of each source. A
+    snapshot without changes reuses the previous table. A snapshot cut
+    short by a crash is skipped; nothing depends on it, since a restarted
+    recorder writes each source in full first.
+    """
+    states = {}
+    tables = {}
+    for line in _iter_lines(path):
+        try:
+            frame = json.loads(line)
+        except ValueError:
+            continue
+
+        source = frame['source']
+        if frame['full'] or source not in states:
+            states[source] = _SourceState()
+        state = states[source]
+        if frame['full'] or frame['pools'] or frame['removed'] or source not in tables:
+            state.apply(frame)
+            tables[source] = state.table(frame)
+        yield frame['ts'], source, tables[source]
@@ -0,0 +1,258 @@
+import asyncio
+import base64
+import json
+import queue
+import struct
+import threading
+import time
+
+import websockets
+
+from pool_table import PoolTable
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+# Raydium AMM v4 InitLog: log_type, time, pc_decimals, coin_decimals,
+# pc_lot_size, coin_lot_size, pc_amount, coin_amount, market
+INIT_LOG = struct.Struct('<BQBBQQQQ32s')
+INITIALIZE2_TAG = 1
+# Account positions in the initialize2 instruction
+AMM_ACCOUNT = 4
+COIN_MINT_ACCOUNT = 8
+PC_MINT_ACCOUNT = 9
+
+B58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def b58decode(value):
+    """Decode a base58 string"""
+    number = 0
+    for char in value:
+        number = number * 58 + B58_ALPHABET.index(char)
+    raw = number.to_bytes((number.bit_length() + 7) // 8, 'big')
+    padding = len(value) - len(value.lstrip('1'))
+    return b'\0' * padding + raw
+
+
+def ws_url_for(rpc_url):
+    """Websocket endpoint that pairs with an HTTP RPC endpoint"""
+    if rpc_url.startswith('https://'):
+        return 'wss://' + rpc_url[len('https://'):]
+    if rpc_url.startswith('http://'):
+        return 'ws://' + rpc_url[len('http://'):]
+    return rpc_url
+
+
+def parse_init_log(logs):
+    """Find and decode the ray_log InitLog in a list of program log lines"""
+    if not any('initialize2' in line for line in logs):
+        return None
+    for line in logs:
+        marker = line.find('ray_log: ')
+        if marker < 0:
+            continue
+        try:
+            raw = base64.b64decode(line[marker + len('ray_log: '):].strip())
+        except Exception:
+            continue
+        if len(raw) < INIT_LOG.size or raw[0] != 0:
+            continue
+        (_, open_time, pc_decimals, coin_decimals, _, _,
+         pc_amount, coin_amount, _) = INIT_LOG.unpack_from(raw)
+        return {
+            'time': open_time,
+            'pc_decimals': pc_decimals,
+            'coin_decimals': coin_decimals,
+            'pc_amount': pc_amount,
+            'coin_amount': coin_amount,
+        }
+    return None
+
+
+def initialize2_accounts(tx, program_id):
+    """Get the pool and mint accounts of the initialize2 instruction in a getTransaction result"""
+    message = tx['transaction']['message']
+    meta = tx.get('meta') or {}
+    loaded = meta.get('loadedAddresses') or {}
+    keys = message['accountKeys'] + loaded.get('writable', []) + loaded.get('readonly', [])
+
+    # Launchers often create the pool through a CPI, so check inner instructions too
+    instructions = list(message['instructions'])
+    for inner in meta.get('innerInstructions') or []:
+        instructions.extend(inner['instructions'])
+
+    for instruction in instructions:
+        if keys[instruction['programIdIndex']] != program_id:
+            continue
+        accounts = instruction['accounts']
+        data = b58decode(instruction['data'])
+        if not data or data[0] != INITIALIZE2_TAG or len(accounts) <= PC_MINT_ACCOUNT:
+            continue
+        return {
+            'id': keys[accounts[AMM_ACCOUNT]],
+            'mintA': keys[accounts[COIN_MINT_ACCOUNT]],
+            'mintB': keys[accounts[PC_MINT_ACCOUNT]],
+        }
+    return None
+
+
+class RaydiumLogSource:
+    """Push-based pool discovery from Raydium AMM program logs over websocket
+
+    A background thread keeps a logsSubscribe subscription open for the
+    Raydium AMM program. Each initialize2 log is decoded, its transaction is
+    fetched once over HTTP RPC to learn the pool and mint accounts, and the
+    pool is queued. get_pools() drains the queue through the same PoolTable
+    filters get_pools on RaydiumAPI uses.
+    """
+
+    def __init__(self, dex, rpc_url, program_id, ws_url=None, record_path=None):
+        self.dex = dex
+        self.rpc_url = rpc_url
+        self.ws_url = ws_url or ws_url_for(rpc_url)
+        self.program_id = program_id
+        self.record_path = record_path
+        self.pending = queue.Queue()
+        self.connected = threading.Event()
+        self._arrived = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the subscription thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        asyncio.run(self._subscribe_forever())
+
+    async def _subscribe_forever(self):
+        """Keep a subscription open, reconnecting with backoff"""
+        delay = 1
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20, max_size=None) as ws:
+                    await ws.send(json.dumps({
+                        'jsonrpc': '2.0',
+                        'id': 1,
+                        'method': 'logsSubscribe',
+                        'params': [{'mentions': [self.program_id]}, {'commitment': 'confirmed'}],
+                    }))
+                    self.connected.set()
+                    delay = 1
+                    async for message in ws:
+                        if self._stop.is_set():
+                            return
+                        await self._handle_message(message)
+            except Exception as e:
+                print(f"Log subscription error: {e}, reconnecting in {delay}s")
+            self.connected.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _record(self, kind, **fields):
+        """Append a message to the recording used by benchmarks/ws_replay.py"""
+        if self.record_path:
+            with open(self.record_path, 'a') as f:
+                f.write(json.dumps({'type': kind, **fields}) + '\n')
+
+    async def _handle_message(self, message):
+        self._record('ws', message=message if isinstance(message, str) else message.decode())
+
+        data = json.loads(message)
+        if data.get('method') != 'logsNotification':
+            return
+        value = data['params']['result']['value']
+        if value.get('err') is not None:
+            return
+        init = parse_init_log(value.get('logs') or [])
+        if init is None:
+            return
+        init['detected_at'] = time.time()
+
+        # The log has no account keys, so look them up from the transaction
+        # without holding up the next notification
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, self._resolve_pool, value['signature'], init)
+
+    def _rpc(self, method, params):
+        # JSON-RPC reads are safe to retry even though they are POSTs
+        response = self.dex.http.post(self.rpc_url, json={
+            'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params,
+        }, idempotent=True, timeout=10)
+        response.raise_for_status()
+        return response.json().get('result')
+
+    def _fetch_transaction(self, signature):
+        """Fetch a transaction, retrying briefly while the RPC node catches up"""
+        for attempt in range(3):
+            try:
+                tx = self._rpc('getTransaction', [signature, {
+                    'encoding': 'json',
+                    'commitment': 'confirmed',
+                    'maxSupportedTransactionVersion': 0,
+                }])
+                if tx:
+                    self._record('tx', signature=signature, result=tx)
+                    return tx
+            except Exception as e:
+                print(f"Error fetching transaction {signature}: {e}")
+            time.sleep(0.5 * (attempt + 1))
+        return None
+
+    def _resolve_pool(self, signature, init):
+        """Fetch the initialize2 transaction and queue the pool it created"""
+        try:
+            tx = self._fetch_transaction(signature)
+            accounts = tx and initialize2_accounts(tx, self.program_id)
+            if accounts:
+                self.pending.put({**accounts, 'signature': signature, **init})
+                self._arrived.set()
+        except Exception as e:
+            print(f"Error decoding pool from {signature}: {e}")
+
+    def _quote_usd(self, mint):
+        """USD value of one unit of a quote mint, if known"""
+        if mint == USDC_MINT:
+            return 1.0
+        if mint == SOL_MINT:
+            return self.dex.sol_price or 0.0
+        return self.dex.get_pair_price(mint, USDC_MINT, refresh=False) or 0.0
+
+    def wait_for_pools(self, timeout):
+        """Block until a pool is queued or timeout seconds pass"""
+        if not self.pending.empty():
+            return True
+        arrived = self._arrived.wait(timeout)
+        self._arrived.clear()
+        return arrived
+
+    def get_pools(self, config, cutoff_ts=0):
+        """Drain queued pools and run them through the get_pools filters"""
+        table = PoolTable('AMM', 'raydium_logs', "https://raydium.io/pools/")
+        while True:
+            try:
+                pool = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            pc = pool['pc_amount'] / (10 ** pool['pc_decimals'])
+            coin = pool['coin_amount'] / (10 ** pool['coin_decimals'])
+            quote_usd = self._quote_usd(pool['mintB'])
+            table.append(
+                pool['id'],
+                pool['mintA'],
+                pool['mintB'],
+                2 * pc * quote_usd,  # Both sides are deposited at equal value
+                0.0,  # Brand new, no volume yet
+                pool['detected_at'],
+                0.0025,  # AMM v4 trade fee
+                pc / coin * quote_usd if coin else 0.0,
+            )
+        table.freeze()
+        return self.dex.table_pools(table, config, cutoff_ts)
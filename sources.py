@@ -0,0 +1,109 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolSource:
+    """Interface every pool discovery source implements
+
+    A source yields pools in the get_pools dict schema, already filtered
+    with the TVL/volume config and scored for risk. cutoff_time is set by
+    the caller before each poll; pools created before it may be skipped.
+    """
+
+    name = None
+    cutoff_time = None
+
+    def iter_pools(self, config=None):
+        """Yield (source, pools) batches, one per list or chain this source covers"""
+        raise NotImplementedError
+
+
+class SourceFanout:
+    """Poll several PoolSources concurrently and merge their pools into one stream
+
+    Every source runs on its own thread and hands each batch over as soon
+    as it is yielded, so one list of a source is not held back by the
+    next. A cycle waits for each source at most its latency budget; a
+    source still running after that is left to finish in the background
+    and its remaining batches are delivered on the next cycle, so a slow
+    chain never holds up alerts from the others. Pools are deduplicated by
+    id within a cycle, and get_pools returns them newest first.
+    """
+
+    def __init__(self, sources, config=None):
+        self.config = {
+            'source_budgets': {},         # Source name -> seconds to wait for it per cycle
+            'default_source_budget': 20,
+        }
+        if config:
+            self.config.update(config)
+
+        self.sources = list(sources)
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self.sources), 1))
+        self._batches = queue.Queue()  # (source name, batch name, pools); batch name None ends a poll
+        self._inflight = set()  # Names of sources whose poll has not ended yet
+        self.late = {}  # Source name -> cycles it overran its budget
+
+    @property
+    def cutoff_time(self):
+        return self.sources[0].cutoff_time if self.sources else None
+
+    @cutoff_time.setter
+    def cutoff_time(self, value):
+        for source in self.sources:
+            source.cutoff_time = value
+
+    def budget(self, source):
+        return self.config['source_budgets'].get(source.name, self.config['default_source_budget'])
+
+    def _poll(self, source, config):
+        """Forward a source's batches as it yields them, then mark the poll as ended"""
+        try:
+            for name, pools in source.iter_pools(config):
+                self._batches.put((source.name, name, pools))
+        except Exception as e:
+            print(f"Error fetching {source.name} pools: {e}")
+        finally:
+            self._batches.put((source.name, None, None))
+
+    def iter_pools(self, config=None):
+        """Yield (source, pools) batches from every source as they arrive within budget"""
+        started = time.monotonic()
+        deadlines = {}
+        for source in self.sources:
+            # A poll that overran last cycle is still the freshest data; wait for it instead
+            if source.name not in self._inflight:
+                self._inflight.add(source.name)
+                self._executor.submit(self._poll, source, config)
+            deadlines[source.name] = (source, started + self.budget(source))
+
+        seen = set()
+        pending = set(deadlines)
+        while pending:
+            timeout = max(min(deadlines[name][1] for name in pending) - time.monotonic(), 0)
+            try:
+                source_name, name, pools = self._batches.get(timeout=timeout)
+            except queue.Empty:
+                now = time.monotonic()
+                for source, deadline in [deadlines[name] for name in pending]:
+                    if deadline <= now:
+                        pending.discard(source.name)
+                        self.late[source.name] = self.late.get(source.name, 0) + 1
+                        print(f"⏱️ {source.name} is over its {self.budget(source)}s budget, "
+                              f"its remaining pools will come with the next cycle")
+                continue
+            if name is None:
+                self._inflight.discard(source_name)
+                pending.discard(source_name)
+                continue
+            fresh = [pool for pool in pools if pool['id'] not in seen]
+            seen.update(pool['id'] for pool in fresh)
+            yield name, fresh
+
+    def get_pools(self, config=None):
+        """Pools from every source that answered within budget, deduplicated, newest first"""
+        pools = [pool for _, batch in self.iter_pools(config) for pool in batch]
+        pools.sort(key=lambda pool: (pool['created_at'], pool['volume_24h'], pool['liquidity']),
+                   reverse=True)
+        return pools
@@ -0,0 +1,253 @@
+import html
+import sqlite3
+import threading
+import time
+import uuid
+
+import requests
+
+from metrics import NullMetrics
+from ratelimit import TokenBucket
+
+# Telegram rejects messages longer than this
+MAX_MESSAGE_LENGTH = 4096
+
+
+class TelegramNotifier:
+    """Background Telegram sender with a persistent outbox and rate limiting
+
+    enqueue() stores the alert in SQLite and returns at once; a daemon
+    thread delivers the outbox in order. Sends go through a token bucket
+    sized for Telegram's per-chat limit, and a 429 pauses the bucket for the
+    retry_after Telegram asks for. When more than digest_threshold alerts are
+    waiting, they are coalesced into one digest message instead of being
+    sent one by one. Undelivered alerts survive restarts; alerts older than
+    outbox_max_age are dropped rather than sent late.
+
+    Several notifiers may share one outbox. Each claims rows in a write
+    transaction before sending them, so every alert goes out once. A claim
+    not refreshed for outbox_claim_timeout seconds, as left by a notifier
+    that crashed, is taken over by the next one to look.
+    """
+
+    def __init__(self, http, url, chat_id, config=None, metrics=None):
+        self.config = {
+            'telegram_rate_limit': 1,       # Messages per second to one chat
+            'telegram_burst': 3,
+            'digest_threshold': 5,          # Pending alerts that trigger a digest
+            'outbox_path': 'telegram_outbox.db',
+            'outbox_max_age': 3600,         # Seconds before an undelivered alert is dropped
+            'outbox_claim_timeout': 300,    # Seconds before another notifier takes over a claimed alert
+            'request_timeout': 10,
+        }
+        if config:
+            self.config.update(config)
+
+        self.http = http
+        self.url = url
+        self.chat_id = chat_id
+        self.metrics = metrics or NullMetrics()
+        self.owner = uuid.uuid4().hex  # Marks the outbox rows this notifier has claimed
+        self.bucket = TokenBucket(self.config['telegram_rate_limit'], self.config['telegram_burst'])
+        self._conn = self._connect()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._callbacks = {}
+        self._stopped = False
+        self._thread = None
+        self.stats = {'sent': 0, 'digests': 0, 'rate_limited': 0, 'failed': 0, 'expired': 0}
+
+    def _connect(self):
+        """Open the outbox and create the schema on first use"""
+        conn = sqlite3.connect(self.config['outbox_path'], timeout=30, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pool_id TEXT UNIQUE,
+                text TEXT,
+                summary TEXT,
+                queued_at REAL,
+                claimed_by TEXT,
+                claimed_at REAL
+            )
+        """)
+        conn.commit()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(outbox)")]
+        if 'claimed_by' not in columns:
+            # Outboxes from before claiming; another notifier may be migrating too
+            try:
+                with conn:
+                    conn.execute("ALTER TABLE outbox ADD COLUMN claimed_by TEXT")
+                    conn.execute("ALTER TABLE outbox ADD COLUMN claimed_at REAL")
+            except sqlite3.OperationalError:
+                pass
+        return conn
+
+    def start(self):
+        """Start delivering, including anything left over from a previous run"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def enqueue(self, pool_id, text, summary, on_sent=None):
+        """Queue an alert; returns False if one for this pool is already queued
+
+        text is the full HTML message and summary a one-line HTML version used
+        in digests. on_sent is called once the alert has been delivered.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (pool_id, text, summary, queued_at) VALUES (?, ?, ?, ?)",
+                (pool_id, text, summary, time.time()))
+            self._conn.commit()
+            if cursor.rowcount != 1:
+                return False
+            if on_sent is not None:
+                self._callbacks[pool_id] = on_sent
+            self._wakeup.notify()
+        return True
+
+    def pending(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self, timeout=None):
+        """Stop the sender; anything still queued stays in the outbox for the next notifier"""
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._lock:
+            self._conn.execute("UPDATE outbox SET claimed_by = NULL WHERE claimed_by = ?", (self.owner,))
+            self._conn.commit()
+
+    def _next_batch(self):
+        """Wait for queued alerts, claim them and take the next message's worth"""
+        with self._lock:
+            while not self._stopped:
+                now = time.time()
+                conn = self._conn
+                # The write lock is taken up front, so two notifiers never claim the same rows
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self.stats['expired'] += conn.execute(
+                        "DELETE FROM outbox WHERE queued_at < ?", (now - self.config['outbox_max_age'],)).rowcount
+                    conn.execute(
+                        "UPDATE outbox SET claimed_by = ?, claimed_at = ? "
+                        "WHERE claimed_by IS NULL OR claimed_by = ? OR claimed_at < ?",
+                        (self.owner, now, self.owner, now - self.config['outbox_claim_timeout']))
+                    rows = conn.execute(
+                        "SELECT id, pool_id, text, summary FROM outbox WHERE claimed_by = ? ORDER BY id",
+                        (self.owner,)).fetchall()
+                    held_elsewhere = conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] - len(rows)
+                finally:
+                    # Committed before waiting so the write lock is never held while idle
+                    conn.commit()
+                if rows:
+                    return rows
+                # Rows other notifiers hold come back once their claims expire
+                self._wakeup.wait(self.config['outbox_claim_timeout'] if held_elsewhere else None)
+            return None
+
+    def _still_claimed(self, batch):
+        """Refresh the claim on batch; False if another notifier took any of it over"""
+        with self._lock:
+            claimed = self._conn.executemany(
+                "UPDATE outbox SET claimed_at = ? WHERE id = ? AND claimed_by = ?",
+                [(time.time(), row[0], self.owner) for row in batch]).rowcount
+            self._conn.commit()
+        return claimed == len(batch)
+
+    def _digest(self, rows):
+        """Coalesce rows into one message that fits Telegram's length limit"""
+        lines = []
+        length = 64  # Room for the header
+        taken = []
+        for row in rows:
+            if length + len(row[3]) + 1 > MAX_MESSAGE_LENGTH:
+                break
+            lines.append(row[3])
+            length += len(row[3]) + 1
+            taken.append(row)
+        header = f"🚨 <b>{len(taken)} new pools</b>\n\n"
+        return header + '\n'.join(lines), taken
+
+    def _run(self):
+        while True:
+            rows = self._next_batch()
+            if rows is None:
+                return
+            if len(rows) > self.config['digest_threshold']:
+                text, batch = self._digest(rows)
+            else:
+                text, batch = rows[0][2], rows[:1]
+
+            self.bucket.acquire()
+            # The wait for a send slot can outlast the claim
+            if not self._still_claimed(batch):
+                continue
+            delivered = self._send(text)
+            if delivered is None:
+                continue  # Rate limited or transient failure: the rows stay queued
+
+            with self._lock:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(row[0],) for row in batch])
+                self._conn.commit()
+                callbacks = [self._callbacks.pop(row[1], None) for row in batch]
+            if delivered:
+                self.stats['sent'] += 1
+                if len(batch) > 1:
+                    self.stats['digests'] += 1
+                for callback in callbacks:
+                    if callback is not None:
+                        callback()
+
+    def _send(self, text):
+        """Post one message; True if delivered, False if rejected for good, None to retry"""
+        payload = {
+            'chat_id': self.chat_id,
+            'text': text,
+            'parse_mode': 'HTML',
+            'disable_web_page_preview': True
+        }
+        try:
+            with self.metrics.timer('telegram_send'):
+                response = self.http.post(self.url, json=payload, retries=0,
+                                          timeout=self.config['request_timeout'])
+        except requests.RequestException as e:
+            print(f"Error sending Telegram notification: {e}")
+            self.bucket.pause(5)
+            return None
+
+        if response.status_code == 429:
+            self.stats['rate_limited'] += 1
+            self.metrics.inc('telegram_rate_limited')
+            self.bucket.pause(self._retry_after(response))
+            return None
+        if response.status_code >= 500:
+            self.bucket.pause(5)
+            return None
+        if not response.ok:
+            # A malformed message will never go through; drop it instead of blocking the queue
+            self.stats['failed'] += 1
+            print(f"Failed to send Telegram notification: {response.text}")
+            return False
+        return True
+
+    @staticmethod
+    def _retry_after(response):
+        """Seconds Telegram asked us to wait, from the body or the Retry-After header"""
+        try:
+            return float(response.json()['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return float(response.headers.get('Retry-After', 1))
+        except ValueError:
+            return 1.0
+
+
+def escape(text):
+    """Escape a value for Telegram's HTML parse mode"""
+    return html.escape(str(text), quote=False)
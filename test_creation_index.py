@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+from creation_index import CreationIndex
+from memesniper import RaydiumAPI
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / 'created.db')
+
+
+def test_first_recorded_time_wins_and_persists(index_path):
+    index = CreationIndex(index_path)
+    assert index.record('p1', 1000.0) == 1000.0
+    assert index.record('p1', 2000.0) == 1000.0
+    assert index.record('undated', None) is None
+    index.flush()
+
+    reopened = CreationIndex(index_path)
+    assert reopened.get('p1') == 1000.0
+    assert reopened.get('undated', 'missing') is None
+    assert reopened.get('never', 'missing') == 'missing'
+    assert len(reopened) == 2
+
+
+def test_unflushed_records_are_not_persisted(index_path):
+    index = CreationIndex(index_path)
+    index.record('p1', 1000.0)
+    assert CreationIndex(index_path).get('p1') is None
+
+
+def test_bootstrapped_sources_persist(index_path):
+    index = CreationIndex(index_path)
+    assert not index.bootstrapped('cl')
+    index.mark_bootstrapped('cl')
+    assert index.bootstrapped('cl') and not index.bootstrapped('cp')
+    assert CreationIndex(index_path).bootstrapped('cl')
+
+
+def test_retain_drops_from_memory_and_reads_back_from_disk(index_path):
+    index = CreationIndex(index_path)
+    for i in range(5):
+        index.record(f"p{i}", 1000.0 + i)
+    index.flush()
+    assert index.retain({'p0', 'p1'}) == 3
+    assert len(index) == 2
+    # A delisted pool that comes back keeps its original creation time
+    assert index.get('p3') == 1003.0
+    assert index.record('p4', 9999.0) == 1004.0
+    assert index.retain({'p0', 'p1', 'p3', 'p4'}) == 0
+
+
+def test_retain_keeps_unflushed_pools_it_is_told_to(index_path):
+    index = CreationIndex(index_path)
+    index.record('new', 1000.0)
+    assert index.retain({'new'}) == 0
+    index.flush()
+    assert CreationIndex(index_path).get('new') == 1000.0
+
+
+def api(tmp_path, index_path):
+    return RaydiumAPI({
+        'token_cache_path': str(tmp_path / 'tokens.db'),
+        'creation_index_path': index_path,
+        'raydium_api_url': 'http://127.0.0.1:9',
+    })
+
+
+def cl_pool(pool_id, **fields):
+    return {'id': pool_id, 'mintA': 'A', 'mintB': 'SOL', 'tvl': 5000, 'price': 1.0, **fields}
+
+
+def test_first_scan_dates_pools_by_activity_and_later_scans_by_first_sight(tmp_path, index_path):
+    dex = api(tmp_path, index_path)
+    started = time.time()
+    table = dex._build_table('cl', [
+        cl_pool('listed'),
+        cl_pool('stamped', openTime=1_700_000_000),
+        cl_pool('active', day={'volume': 5}, volume24h=5),
+        'not a pool',
+    ])
+    created = dict(zip(table.ids, table.columns['created'].tolist()))
+    # On the bootstrap scan every pool is new to the index, so only real signals date one
+    assert created['stamped'] == 1_700_000_000
+    assert created['active'] == pytest.approx(started - 15 * 60, abs=5)
+    assert created['listed'] != created['listed']  # NaN: undatable, never in a window
+
+    table = dex._build_table('cl', [cl_pool('listed'), cl_pool('launched')])
+    created = dict(zip(table.ids, table.columns['created'].tolist()))
+    assert created['launched'] == pytest.approx(time.time(), abs=5)
+    assert created['listed'] != created['listed']
+
+    # Both the creation times and the bootstrap survive a restart
+    reopened = CreationIndex(index_path)
+    assert reopened.bootstrapped('cl') and not reopened.bootstrapped('cp')
+    assert reopened.get('launched') == pytest.approx(created['launched'])
+    assert reopened.get('stamped') == 1_700_000_000
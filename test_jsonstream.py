@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from jsonstream import iter_json_items
+
+DOCUMENT = json.dumps({
+    't': 1.5e-3,
+    'flag': True,
+    'none': None,
+    'data': [
+        {'id': 'a\\"b\\u00e9', 'price': -12.25e+10, 'ok': False, 'tvl': 0},
+        {'id': 'café ☃', 'price': 1234567.875, 'tags': ['x', {'y': [1, 2.5]}]},
+        3.14159,
+        -0.0,
+        'plain',
+        True,
+        None,
+    ],
+}, ensure_ascii=False)
+EXPECTED = json.loads(DOCUMENT)['data']
+
+
+def chunked(text, size):
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 13])
+def test_items_survive_any_chunk_size(size):
+    assert list(iter_json_items(chunked(DOCUMENT, size), ('data',))) == EXPECTED
+
+
+def test_items_survive_every_split_point():
+    data = DOCUMENT.encode()
+    for i in range(1, len(data)):
+        assert list(iter_json_items([data[:i], data[i:]], ('data',))) == EXPECTED, i
+
+
+@pytest.mark.parametrize('chunks,expected', [
+    ([b'[1.', b'5]'], [1.5]),
+    ([b'[1', b'.5]'], [1.5]),
+    ([b'[1.5e', b'3, 2]'], [1500.0, 2]),
+    ([b'[1.5e+', b'3]'], [1500.0]),
+    ([b'[-', b'7]'], [-7]),
+    ([b'[12', b'34]'], [1234]),
+    ([b'[tr', b'ue, fal', b'se, nu', b'll]'], [True, False, None]),
+    ([b'["a\\', b'"b"]'], ['a"b']),
+    ([b'["\\u00', b'e9"]'], ['é']),
+    ([b'["\xc3', b'\xa9"]'], ['é']),
+    ([b'[1', b']'], [1]),
+    ([b'[1]'], [1]),
+])
+def test_values_split_inside_tokens(chunks, expected):
+    assert list(iter_json_items(chunks)) == expected
+
+
+def test_scalar_before_path_split_inside_number():
+    chunks = [b'{"t": 1.', b'5, "data": [1, 2]}']
+    assert list(iter_json_items(chunks, ('data',))) == [1, 2]
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'[1, 2'], ()))
+
+
+def test_missing_path_yields_nothing():
+    assert list(iter_json_items([b'{"other": [1]}'], ('data',))) == []
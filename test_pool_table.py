@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from memesniper import DEFAULT_POOL_CONFIG
+from pool_table import PoolTable
+
+NOW = 1_760_000_000.0
+HOUR = 3600
+
+# pool_id: (mint_a, mint_b, tvl, volume, created, price)
+POOLS = {
+    'passes': ('A', 'SOL', 5000.0, 100.0, NOW - 100, 2.0),
+    'shallow': ('B', 'SOL', 500.0, 100.0, NOW - 200, 1.0),
+    'idle': ('C', 'SOL', 5000.0, 0.0, NOW - 300, 1.0),
+    'deep_idle': ('D', 'SOL', 20000.0, 0.0, NOW - 50, 1.0),
+    'undated': ('E', 'SOL', 5000.0, 100.0, None, 1.0),
+    'old': ('F', 'SOL', 5000.0, 100.0, NOW - 10 * HOUR, 1.0),
+    # Deepest A/SOL pool, listed the other way round
+    'reversed': ('SOL', 'A', 50000.0, 100.0, NOW - 20 * HOUR, 0.25),
+}
+
+
+def make_table(pools=POOLS):
+    table = PoolTable('CL', 'raydium_cl', 'https://example.com/')
+    for pool_id, (mint_a, mint_b, tvl, volume, created, price) in pools.items():
+        table.append(pool_id, mint_a, mint_b, tvl, volume, created, 0.0025, price)
+    return table.freeze()
+
+
+def ids(table, rows):
+    return [table.ids[row] for row in rows]
+
+
+def test_window_rows_are_the_dated_pools_since_the_cutoff_oldest_first():
+    table = make_table()
+    assert ids(table, table.window_rows(NOW - HOUR)) == ['idle', 'shallow', 'passes', 'deep_idle']
+    assert ids(table, table.window_rows(NOW - 100)) == ['passes', 'deep_idle']
+    assert len(table.window_rows(0)) == len(table) - 1  # Undated pools are never in a window
+    assert len(table.window_rows(NOW + 1)) == 0
+
+
+def test_filter_mask_applies_tvl_and_low_volume_filters_inside_the_window():
+    table = make_table()
+    mask = table.filter_mask(NOW - HOUR, DEFAULT_POOL_CONFIG)
+    # shallow is under min_tvl; idle has no volume and too little TVL to make up for it
+    assert sorted(ids(table, np.flatnonzero(mask))) == ['deep_idle', 'passes']
+    loose = {'min_tvl': 0, 'min_tvl_low_volume': 0, 'min_volume_24h': 0}
+    assert sorted(ids(table, np.flatnonzero(table.filter_mask(NOW - HOUR, loose)))) == \
+        ['deep_idle', 'idle', 'passes', 'shallow']
+
+
+def test_sorted_rows_are_newest_first_then_by_volume_and_liquidity():
+    table = make_table({
+        'older': ('A', 'SOL', 9000.0, 900.0, NOW - 60, 1.0),
+        'low_volume': ('B', 'SOL', 9000.0, 10.0, NOW, 1.0),
+        'high_volume': ('C', 'SOL', 10.0, 500.0, NOW, 1.0),
+        'deeper': ('D', 'SOL', 20000.0, 10.0, NOW, 1.0),
+    })
+    mask = np.ones(len(table), dtype=bool)
+    assert ids(table, table.sorted_rows(mask)) == ['high_volume', 'deeper', 'low_volume', 'older']
+    mask[table.index['deeper']] = False
+    assert ids(table, table.sorted_rows(mask)) == ['high_volume', 'low_volume', 'older']
+
+
+def test_pair_price_uses_the_deepest_pool_in_either_orientation():
+    table = make_table()
+    # The reversed pool is deeper than the A/SOL one, so its price is inverted
+    assert table.pair_row('A', 'SOL') == table.index['reversed']
+    assert table.pair_price('A', 'SOL') == pytest.approx(4.0)
+    assert table.pair_price('SOL', 'A') == pytest.approx(0.25)
+    assert table.pair_price('B', 'SOL') == pytest.approx(1.0)
+    assert table.pair_price('A', 'B') is None
+    assert table.pair_price('A', 'unknown') is None
+
+
+def test_pair_price_of_a_reversed_pool_without_a_price_is_zero():
+    table = make_table({'p': ('SOL', 'A', 100.0, 1.0, NOW, 0.0)})
+    assert table.pair_price('A', 'SOL') == 0.0
+
+
+def test_from_columns_matches_a_table_built_row_by_row():
+    built = make_table()
+    table = PoolTable.from_columns('CL', 'raydium_cl', 'https://example.com/', list(built.ids),
+                                   list(built.mints), {name: column.copy() for name, column in built.columns.items()})
+    assert table.index == built.index
+    assert table.mint_ids == built.mint_ids
+    assert list(table.window_rows(NOW - HOUR)) == list(built.window_rows(NOW - HOUR))
+    assert table.pair_price('A', 'SOL') == pytest.approx(4.0)
+    mask = table.filter_mask(NOW - HOUR, DEFAULT_POOL_CONFIG)
+    assert list(table.sorted_rows(mask)) == list(built.sorted_rows(built.filter_mask(NOW - HOUR, DEFAULT_POOL_CONFIG)))
+
+
+def test_view_looks_up_each_mint_once():
+    table = make_table()
+    lookups = []
+
+    def lookup(mint):
+        lookups.append(mint)
+        return {'symbol': mint.lower(), 'decimals': 6} if mint != 'B' else None
+
+    pool = table.view(table.index['passes'], lookup)
+    assert (pool['tokenA'], pool['tokenB']) == ('A', 'SOL')
+    assert (pool['tokenA_symbol'], pool['tokenB_symbol']) == ('a', 'sol')
+    assert pool['liquidity'] == 5000.0 and pool['price'] == 2.0
+    assert pool['created_at'].timestamp() == NOW - 100
+    assert pool['url'] == 'https://example.com/passes'
+    table.view(table.index['reversed'], lookup)
+    assert table.view(table.index['shallow'], lookup)['tokenA_symbol'] == 'Unknown'
+    assert sorted(lookups) == ['A', 'B', 'SOL']
+    assert table.token_info(table.mint_ids['A'], lookup) == ('a', 6)
+    assert table.token_info(table.mint_ids['B'], lookup) == ('Unknown', 9)
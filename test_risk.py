@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from pool_table import PoolTable
+from risk import (FLAG_BLOCKLISTED, FLAG_HIGH_IMPACT, FLAG_LOW_LIQUIDITY, FLAG_NEW, FLAG_NO_VOLUME,
+                  FLAG_UNKNOWN_PAIR, FLAG_WASH_VOLUME, RiskScorer)
+
+NOW = 1_760_000_000.0
+DAY = 24 * 3600
+
+# pool_id: (mint_a, mint_b, tvl, volume, created)
+POOLS = {
+    'safe': ('A', 'SOL', 50000.0, 5000.0, NOW - 2 * DAY),
+    'risky': ('B', 'C', 1.0, 0.0, NOW),
+    'wash': ('D', 'SOL', 50000.0, 5_000_000.0, NOW - 2 * DAY),
+    'undated': ('E', 'SOL', 50000.0, 5000.0, None),
+    'blocked': ('RUG', 'SOL', 50000.0, 5000.0, NOW - 2 * DAY),
+}
+
+
+@pytest.fixture
+def table():
+    table = PoolTable('CL', 'raydium_cl', 'https://example.com/')
+    for pool_id, (mint_a, mint_b, tvl, volume, created) in POOLS.items():
+        table.append(pool_id, mint_a, mint_b, tvl, volume, created, 0.0025, 1.0)
+    return table.freeze()
+
+
+@pytest.fixture
+def scorer():
+    return RiskScorer({'risk_trusted_mints': ('SOL',), 'risk_blocklist': ('RUG',)})
+
+
+def score(scorer, table, pool_ids, impacts=None):
+    rows = [table.index[pool_id] for pool_id in pool_ids]
+    scores, flags = scorer.score(table, rows, impacts=impacts, now_ts=NOW)
+    return dict(zip(pool_ids, scores.tolist())), dict(zip(pool_ids, flags.tolist()))
+
+
+def test_scores_span_zero_to_one_without_impacts(scorer, table):
+    scores, flags = score(scorer, table, ['safe', 'risky'])
+    # Unmeasured impact is left out rather than counted as a constant half risk
+    assert scores['safe'] == pytest.approx(0.0)
+    assert scores['risky'] == pytest.approx(1.0)
+    assert flags['safe'] == 0
+    assert flags['risky'] == FLAG_LOW_LIQUIDITY | FLAG_NO_VOLUME | FLAG_NEW | FLAG_UNKNOWN_PAIR
+
+
+def test_impacts_are_weighted_in_when_known(scorer, table):
+    rows = [table.index['safe']] * 3
+    scores, flags = scorer.score(table, rows, impacts=np.array([0.0, np.nan, 0.05]), now_ts=NOW)
+    weight = scorer.weights['impact']
+    assert scores.tolist() == pytest.approx([0.0, weight * 0.5, weight])
+    assert flags.tolist() == [0, 0, FLAG_HIGH_IMPACT]
+
+
+def test_wash_volume_unknown_age_and_blocklist(scorer, table):
+    scores, flags = score(scorer, table, ['wash', 'undated', 'blocked'])
+    assert flags['wash'] == FLAG_WASH_VOLUME
+    assert scores['wash'] > scores['undated'] > 0
+    # Unknown age counts as half risk but is not flagged as new
+    assert flags['undated'] == 0
+    assert scores['blocked'] == 1.0
+    assert flags['blocked'] & FLAG_BLOCKLISTED
+
+
+def test_scores_follow_row_order(scorer, table):
+    forward, _ = score(scorer, table, ['safe', 'risky', 'wash'])
+    backward, _ = score(scorer, table, ['wash', 'risky', 'safe'])
+    assert forward == pytest.approx(backward)
+    empty, _ = scorer.score(table, [], now_ts=NOW)
+    assert len(empty) == 0
+
+
+def test_describe_lists_one_risk_per_flag():
+    assert RiskScorer.describe(0) == []
+    assert RiskScorer.describe(FLAG_NEW | FLAG_UNKNOWN_PAIR) == \
+        ["Pool is less than an hour old", "Not paired with SOL or a stablecoin"]
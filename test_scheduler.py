@@ -0,0 +1,72 @@
+import pytest
+
+from scheduler import AdaptiveScheduler
+
+
+def test_interval_shrinks_on_new_pools_and_grows_while_unchanged():
+    scheduler = AdaptiveScheduler(30)
+    scheduler.observe(0, new_pools=3)
+    assert scheduler.interval == 15
+    for _ in range(5):
+        scheduler.observe(0, new_pools=1)
+    assert scheduler.interval == scheduler.config['min_interval']
+
+    scheduler = AdaptiveScheduler(30)
+    scheduler.observe(0)
+    assert scheduler.interval == 45
+    for _ in range(10):
+        scheduler.observe(0)
+    assert scheduler.interval == scheduler.config['max_interval'] == 120
+
+
+def test_changes_without_new_pools_drift_back_to_the_base_interval():
+    scheduler = AdaptiveScheduler(30)
+    scheduler.observe(0, new_pools=5)
+    scheduler.observe(0, new_pools=5)
+    assert scheduler.interval == 7.5
+    scheduler.observe(0, changed_at=100)
+    assert scheduler.interval == pytest.approx(18.75)
+    # The same change seen again counts as unchanged data
+    scheduler.observe(0, changed_at=100)
+    assert scheduler.interval == pytest.approx(28.125)
+    assert list(scheduler.changes) == [100]
+
+
+def test_period_is_the_median_gap_once_three_changes_were_seen():
+    scheduler = AdaptiveScheduler(30)
+    for changed_at in (0, 30):
+        scheduler.observe(0, changed_at=changed_at)
+    assert scheduler.period() is None
+    for changed_at in (55, 90, 120):
+        scheduler.observe(0, changed_at=changed_at)
+    assert scheduler.period() == 30
+
+
+def test_cycle_duration_counts_towards_the_interval():
+    scheduler = AdaptiveScheduler(30)
+    scheduler.observe(12)
+    assert scheduler.next_delay(now=0) == pytest.approx(45 - 12)
+    scheduler.observe(40, new_pools=1)
+    assert scheduler.next_delay(now=0) == 0
+
+
+def test_polls_align_just_after_the_expected_refresh():
+    scheduler = AdaptiveScheduler(30)
+    for changed_at in (0, 30, 60, 90):
+        scheduler.observe(0, changed_at=changed_at)
+    margin = scheduler.config['align_margin']
+    assert scheduler.next_delay(now=100) == pytest.approx(20 + margin)
+    # Aligning never goes under the min_interval floor
+    assert scheduler.next_delay(now=119) == scheduler.config['min_interval']
+    # A refresh missed by more than a period means the estimate is stale
+    assert scheduler.next_delay(now=160) == pytest.approx(30)
+
+
+def test_bursts_poll_before_the_expected_refresh_if_sooner():
+    scheduler = AdaptiveScheduler(30)
+    for changed_at in (0, 30, 60, 90):
+        scheduler.observe(0, changed_at=changed_at)
+    scheduler.observe(0, new_pools=2)
+    assert scheduler.interval == 15
+    assert scheduler.next_delay(now=100) == pytest.approx(15)
+    assert scheduler.next_delay(now=112) == pytest.approx(8 + scheduler.config['align_margin'])
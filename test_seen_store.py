@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+import time
+
+from seen_store import DEFAULT_RETENTION, SeenPoolStore, shard_for
+
+HOUR = 3600
+
+
+def stores(tmp_path, count=2):
+    path = str(tmp_path / 'seen.db')
+    return [SeenPoolStore(path) for _ in range(count)]
+
+
+def test_each_pool_is_claimed_once_across_stores(tmp_path):
+    first, second = stores(tmp_path)
+    now = time.time()
+    assert first.claim([('a', now), ('b', now)]) == ['a', 'b']
+    assert second.claim([('b', now), ('c', now)]) == ['c']
+    assert 'a' in second and 'c' in first
+
+
+def test_concurrent_claims_have_one_winner(tmp_path):
+    instances = stores(tmp_path, 4)
+    pools = [(f"pool{i}", time.time()) for i in range(200)]
+    won = []
+    lock = threading.Lock()
+
+    def claim(store):
+        claimed = store.claim(pools)
+        with lock:
+            won.extend(claimed)
+
+    threads = [threading.Thread(target=claim, args=(store,)) for store in instances for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(won) == sorted(pool_id for pool_id, _ in pools)
+
+
+def test_claim_notification_has_one_winner(tmp_path):
+    first, second = stores(tmp_path)
+    first.claim([('a', time.time())])
+    assert first.claim_notification('a')
+    assert not second.claim_notification('a')
+    # A pool nobody claimed can still be notified exactly once
+    assert second.claim_notification('b')
+    assert not first.claim_notification('b')
+    assert 'b' in first
+
+
+def test_short_window_does_not_evict_pools_a_long_window_tracks(tmp_path):
+    short, long = stores(tmp_path)
+    now = time.time()
+    created = now - 2 * HOUR
+    assert long.claim([('p', created)], retention=24 * HOUR) == ['p']
+    assert short.claim([('p', created)], retention=1 * HOUR) == []
+
+    for _ in range(3):
+        short.evict(now)
+        long.evict(now)
+        assert long.claim([('p', created)], retention=24 * HOUR) == []
+    assert long.evict(created + 24 * HOUR + 1) == 1
+    assert 'p' not in short
+
+
+def test_later_claim_with_a_longer_window_extends_retention(tmp_path):
+    short, long = stores(tmp_path)
+    now = time.time()
+    created = now - 30 * 60
+    assert short.claim([('p', created)], retention=1 * HOUR) == ['p']
+    long.claim([('p', created)], retention=24 * HOUR)
+    short.claim([('p', created)], retention=1 * HOUR)
+    assert short.evict(now + 2 * HOUR) == 0
+    assert 'p' in short
+
+
+def test_evict_drops_pools_past_every_window(tmp_path):
+    store, = stores(tmp_path, 1)
+    now = time.time()
+    store.claim([('old', now - 3 * HOUR), ('new', now)], retention=1 * HOUR)
+    assert store.evict(now) == 1
+    assert 'old' not in store and 'new' in store
+
+
+def test_store_from_before_expiry_is_migrated(tmp_path):
+    path = str(tmp_path / 'seen.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE seen (pool_id TEXT PRIMARY KEY, created_at REAL, seen_at REAL, notified_at REAL)")
+    conn.execute("INSERT INTO seen VALUES ('a', 1000, 1000, NULL)")
+    conn.commit()
+    conn.close()
+
+    store = SeenPoolStore(path)
+    assert store.claim([('a', 1000)]) == []
+    assert store.evict(1000 + DEFAULT_RETENTION - 1) == 0
+    assert store.evict(1000 + DEFAULT_RETENTION + 1) == 1
+
+
+def test_shard_for_is_stable_and_in_range():
+    shards = [shard_for(f"pool{i}", 4) for i in range(100)]
+    assert shards == [shard_for(f"pool{i}", 4) for i in range(100)]
+    assert set(shards) == {0, 1, 2, 3}
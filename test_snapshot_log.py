@@ -0,0 +1,109 @@
+import gzip
+import json
+import math
+
+import pytest
+
+from pool_table import PoolTable
+from snapshot_log import SnapshotRecorder, _iter_lines, iter_snapshots
+
+
+def make_table(pools):
+    """Frozen CL table from {pool_id: (mint_a, mint_b, tvl, created)}"""
+    table = PoolTable('CL', 'raydium_cl', 'https://example.com/')
+    for pool_id, (mint_a, mint_b, tvl, created) in pools.items():
+        table.append(pool_id, mint_a, mint_b, tvl, 10.0, created, 0.0025, 1.5)
+    return table.freeze()
+
+
+def live_pools(table):
+    """{pool_id: (mint_a, mint_b, tvl, created)} of the rows a replayed table still holds"""
+    pools = {}
+    for row, pool_id in enumerate(table.ids):
+        if math.isnan(table.columns['tvl'][row]):
+            continue  # Removed pools are blanked until compaction
+        created = table.columns['created'][row]
+        pools[pool_id] = (
+            table.mints[table.columns['mint_a'][row]],
+            table.mints[table.columns['mint_b'][row]],
+            table.columns['tvl'][row],
+            None if math.isnan(created) else created,
+        )
+    return pools
+
+
+def frames(path):
+    return [json.loads(line) for line in _iter_lines(path)]
+
+
+FIRST = {'p1': ('A', 'SOL', 100.0, 1000.0), 'p2': ('B', 'SOL', 200.0, None), 'p3': ('C', 'USDC', 300.0, 1200.0)}
+SECOND = {'p1': ('A', 'SOL', 150.0, 1000.0), 'p3': ('C', 'USDC', 300.0, 1200.0), 'p4': ('D', 'SOL', 50.0, 1300.0)}
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / 'snapshots.log.gz')
+
+
+def record(path, *snapshots, source='cl'):
+    recorder = SnapshotRecorder(path)
+    for ts, pools in snapshots:
+        recorder.record(source, make_table(pools), ts)
+    recorder.close()
+
+
+def test_snapshots_round_trip(log_path):
+    record(log_path, (1.0, FIRST), (2.0, SECOND), (3.0, SECOND))
+    replayed = [(ts, source, live_pools(table)) for ts, source, table in iter_snapshots(log_path)]
+    assert replayed == [(1.0, 'cl', FIRST), (2.0, 'cl', SECOND), (3.0, 'cl', SECOND)]
+
+
+def test_only_changes_are_written_after_the_first_frame(log_path):
+    record(log_path, (1.0, FIRST), (2.0, SECOND), (3.0, SECOND))
+    first, second, third = frames(log_path)
+    assert first['full'] and len(first['pools']) == 3
+    assert not second['full']
+    assert sorted(pool[0] for pool in second['pools']) == ['p1', 'p4']
+    assert second['removed'] == ['p2']
+    assert third['pools'] == [] and third['removed'] == []
+
+
+def test_reordered_and_reinterned_rows_are_not_changes(log_path):
+    reordered = dict(reversed(list(FIRST.items())))
+    record(log_path, (1.0, FIRST), (2.0, reordered))
+    assert frames(log_path)[1]['pools'] == []
+
+
+def test_restarted_recorder_writes_a_full_frame(log_path):
+    record(log_path, (1.0, FIRST))
+    record(log_path, (2.0, SECOND))
+    assert [frame['full'] for frame in frames(log_path)] == [True, True]
+    assert [live_pools(table) for _, _, table in iter_snapshots(log_path)] == [FIRST, SECOND]
+
+
+def test_frames_after_a_truncated_member_are_still_read(log_path):
+    record(log_path, (1.0, FIRST), (2.0, SECOND))
+    # A crash cuts the last member short, then a restarted recorder appends more
+    with open(log_path, 'rb') as f:
+        data = f.read()
+    with open(log_path, 'wb') as f:
+        f.write(data[:-15])
+    record(log_path, (3.0, FIRST), (4.0, SECOND))
+
+    replayed = [(ts, live_pools(table)) for ts, _, table in iter_snapshots(log_path)]
+    assert replayed == [(1.0, FIRST), (3.0, FIRST), (4.0, SECOND)]
+
+
+def test_lines_before_damage_in_one_long_member_are_kept(log_path):
+    # Older recorders wrote the whole log as one gzip stream
+    lines = [json.dumps({'n': i}).encode() + b'\n' for i in range(2000)]
+    data = gzip.compress(b''.join(lines))
+    with open(log_path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    read = [json.loads(line)['n'] for line in _iter_lines(log_path)]
+    assert read and read == list(range(len(read)))
+
+
+def test_empty_log_has_no_snapshots(log_path):
+    open(log_path, 'wb').close()
+    assert list(iter_snapshots(log_path)) == []
@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import json
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+sys.path.insert(0, BENCHMARKS)
+
+import ws_replay
+from memesniper import RaydiumAPI
+from solana_logs import (INIT_LOG, SOL_MINT, USDC_MINT, RaydiumLogSource, b58decode,
+                         initialize2_accounts, parse_init_log)
+
+RECORDING = os.path.join(BENCHMARKS, 'ws_recording.jsonl')
+RAYDIUM_AMM = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+
+# Pools created in the recording: a direct initialize2 paired with SOL, and
+# one made through a launcher's CPI in a v0 transaction paired with USDC
+DIRECT_POOL = "HjaV1K9Q3aJYMzuN6mrNX4pTDYb5egnG7Tofvvo7meko"
+DIRECT_MINT = "E7psnWNh73ZTFFgaffTXT2oMRvb3ypZwMfMvNCQBQPyK"
+CPI_POOL = "A729kkjpUxztYafyvC2XiH5J78vxDydZXjnf5SWoDVBD"
+CPI_MINT = "ATsZ5xSXJazAgR2P7GTcUBZqp1WNFRM9tnKahMbRh6bP"
+SOL_PRICE = 150.0
+
+
+def recorded_transactions():
+    return ws_replay.load_recording(RECORDING)[1]
+
+
+def ray_log(log_type, pc_amount=1, coin_amount=1):
+    raw = INIT_LOG.pack(log_type, 0, 9, 6, 1, 1, pc_amount, coin_amount, bytes(32))
+    return "Program log: ray_log: " + base64.b64encode(raw).decode()
+
+
+def test_b58decode():
+    assert b58decode('StV1DL6CwTryKyV') == b'hello world'
+    assert b58decode('1' * 32) == bytes(32)
+    assert len(b58decode(RAYDIUM_AMM)) == 32
+
+
+def test_parse_init_log_needs_an_initialize2_and_an_init_ray_log():
+    init = parse_init_log(["Program log: initialize2: InitializeInstruction2", ray_log(0, 85, 900)])
+    assert init['pc_amount'] == 85 and init['coin_amount'] == 900
+    assert init['pc_decimals'] == 9 and init['coin_decimals'] == 6
+    # A swap's ray_log, an init log without initialize2, and garbage are all ignored
+    assert parse_init_log(["Program log: initialize2", ray_log(3)]) is None
+    assert parse_init_log([ray_log(0)]) is None
+    assert parse_init_log(["Program log: initialize2", "Program log: ray_log: !!"]) is None
+
+
+def test_initialize2_accounts_from_top_level_and_inner_instructions():
+    decoded = [initialize2_accounts(tx, RAYDIUM_AMM) for tx in recorded_transactions().values()]
+    assert {'id': DIRECT_POOL, 'mintA': DIRECT_MINT, 'mintB': SOL_MINT} in decoded
+    # The CPI's mints are only in the transaction's address lookup table
+    assert {'id': CPI_POOL, 'mintA': CPI_MINT, 'mintB': USDC_MINT} in decoded
+
+
+def test_initialize2_accounts_ignores_other_programs():
+    for tx in recorded_transactions().values():
+        assert initialize2_accounts(tx, SOL_MINT) is None
+
+
+def free_port_pair():
+    """A port whose successor is free too, for the websocket and its RPC"""
+    while True:
+        with socket.socket() as ws, socket.socket() as rpc:
+            ws.bind(('127.0.0.1', 0))
+            port = ws.getsockname()[1]
+            try:
+                rpc.bind(('127.0.0.1', port + 1))
+            except OSError:
+                continue
+            return port
+
+
+@pytest.fixture
+def replay_node():
+    """Replay the recording from a local websocket and RPC stand-in; yields its port"""
+    messages, transactions = ws_replay.load_recording(RECORDING)
+    port = free_port_pair()
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(ws_replay.serve(messages, transactions, '127.0.0.1', port, 0.0))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    yield port
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+
+
+@pytest.fixture
+def dex(tmp_path):
+    dex = RaydiumAPI({
+        'token_cache_path': str(tmp_path / 'tokens.db'),
+        'creation_index_path': str(tmp_path / 'created.db'),
+        'raydium_api_url': 'http://127.0.0.1:9',  # Nothing here should reach Raydium
+    })
+    dex._sol_price = SOL_PRICE
+    return dex
+
+
+def drain(source, count, timeout=10):
+    pools = []
+    while len(pools) < count and source.wait_for_pools(timeout):
+        while not source.pending.empty():
+            pools.append(source.pending.get_nowait())
+    return pools
+
+
+def test_log_source_decodes_pools_from_a_replayed_subscription(replay_node, dex, tmp_path):
+    record_path = str(tmp_path / 'recording.jsonl')
+    source = RaydiumLogSource(dex, f"http://127.0.0.1:{replay_node + 1}", RAYDIUM_AMM,
+                              ws_url=f"ws://127.0.0.1:{replay_node}", record_path=record_path).start()
+    pools = {pool['id']: pool for pool in drain(source, 2)}
+    source.stop()
+
+    # The swap and the failed initialize2 in the recording queue nothing
+    assert sorted(pools) == sorted([DIRECT_POOL, CPI_POOL])
+    direct, cpi = pools[DIRECT_POOL], pools[CPI_POOL]
+    assert (direct['mintA'], direct['mintB']) == (DIRECT_MINT, SOL_MINT)
+    assert (direct['pc_amount'], direct['pc_decimals']) == (85_000_000_000, 9)
+    assert (direct['coin_amount'], direct['coin_decimals']) == (900_000_000_000_000, 6)
+    assert (cpi['mintA'], cpi['mintB']) == (CPI_MINT, USDC_MINT)
+    assert (cpi['pc_amount'], cpi['pc_decimals']) == (25_000_000_000, 6)
+    assert (cpi['coin_amount'], cpi['coin_decimals']) == (500_000_000_000_000_000, 9)
+
+    # What the source saw was recorded in the format ws_replay reads back
+    with open(record_path) as f:
+        recorded = [json.loads(line) for line in f]
+    assert {entry['signature'] for entry in recorded if entry['type'] == 'tx'} == set(recorded_transactions())
+
+
+def test_log_source_get_pools_prices_new_pools(replay_node, dex):
+    source = RaydiumLogSource(dex, f"http://127.0.0.1:{replay_node + 1}", RAYDIUM_AMM,
+                              ws_url=f"ws://127.0.0.1:{replay_node}").start()
+    for pool in drain(source, 2):
+        source.pending.put(pool)
+    source.stop()
+
+    pools = {pool['id']: pool for pool in source.get_pools({'min_tvl': 0, 'min_tvl_low_volume': 0,
+                                                            'min_volume_24h': 0})}
+    assert sorted(pools) == sorted([DIRECT_POOL, CPI_POOL])
+    # Both sides are deposited at equal value
+    assert pools[DIRECT_POOL]['liquidity'] == pytest.approx(2 * 85 * SOL_PRICE)
+    assert pools[DIRECT_POOL]['price'] == pytest.approx(85 / 900_000_000 * SOL_PRICE)
+    assert pools[CPI_POOL]['liquidity'] == pytest.approx(2 * 25_000)
+    assert pools[CPI_POOL]['price'] == pytest.approx(25_000 / 500_000_000)
+    assert all(pool['source'] == 'raydium_logs' for pool in pools.values())
@@ -0,0 +1,88 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sources import PoolSource, SourceFanout
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def pool(pool_id, age_minutes=0):
+    return {'id': pool_id, 'created_at': NOW - timedelta(minutes=age_minutes), 'volume_24h': 0.0, 'liquidity': 0.0}
+
+
+class ListSource(PoolSource):
+    """Yields fixed batches, optionally waiting on an event before the last one"""
+
+    def __init__(self, name, batches, hold=None):
+        self.name = name
+        self.batches = batches
+        self.hold = hold
+        self.polls = 0
+
+    def iter_pools(self, config=None):
+        self.polls += 1
+        for i, batch in enumerate(self.batches):
+            if self.hold and i == len(self.batches) - 1:
+                self.hold.wait(10)
+            yield batch
+
+
+class FailingSource(PoolSource):
+    name = 'failing'
+
+    def iter_pools(self, config=None):
+        raise RuntimeError('node unreachable')
+        yield
+
+
+def batch_ids(batches):
+    return [(name, [p['id'] for p in pools]) for name, pools in batches]
+
+
+def test_batches_from_every_source_are_merged_and_deduplicated():
+    fanout = SourceFanout([
+        ListSource('raydium', [('cl', [pool('a'), pool('b')]), ('cp', [pool('c')])]),
+        ListSource('orca', [('orca', [pool('b'), pool('d')])]),
+        FailingSource(),
+    ])
+    batches = batch_ids(fanout.iter_pools())
+    ids = [pool_id for _, pools in batches for pool_id in pools]
+    assert sorted(ids) == ['a', 'b', 'c', 'd']
+    assert {name for name, _ in batches} == {'cl', 'cp', 'orca'}
+    assert fanout.late == {}
+
+
+def test_get_pools_is_newest_first():
+    fanout = SourceFanout([
+        ListSource('raydium', [('cl', [pool('old', 30), pool('new', 1)])]),
+        ListSource('orca', [('orca', [pool('middle', 10)])]),
+    ])
+    assert [p['id'] for p in fanout.get_pools()] == ['new', 'middle', 'old']
+
+
+def test_a_source_over_budget_is_delivered_next_cycle():
+    release = threading.Event()
+    slow = ListSource('pancakeswap', [('bsc', [pool('first')]), ('bsc', [pool('second')])], hold=release)
+    fast = ListSource('raydium', [('cl', [pool('a')])])
+    fanout = SourceFanout([slow, fast], {'source_budgets': {'pancakeswap': 0.3}, 'default_source_budget': 5})
+
+    assert sorted(batch_ids(fanout.iter_pools())) == [('bsc', ['first']), ('cl', ['a'])]
+    assert fanout.late == {'pancakeswap': 1}
+
+    release.set()
+    # The overrunning poll is waited for rather than restarted
+    assert sorted(batch_ids(fanout.iter_pools())) == [('bsc', ['second']), ('cl', ['a'])]
+    assert slow.polls == 1 and fast.polls == 2
+    assert fanout.late == {'pancakeswap': 1}
+
+    assert sorted(batch_ids(fanout.iter_pools())) == [('bsc', ['first']), ('bsc', ['second']), ('cl', ['a'])]
+    assert slow.polls == 2
+
+
+def test_cutoff_time_is_set_on_every_source():
+    sources = [ListSource('raydium', []), ListSource('orca', [])]
+    fanout = SourceFanout(sources)
+    fanout.cutoff_time = NOW
+    assert fanout.cutoff_time == NOW
+    assert all(source.cutoff_time == NOW for source in sources)
+    assert fanout.budget(sources[0]) == 20
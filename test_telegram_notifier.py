@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+import standin_server
+from http_client import HttpClient
+from telegram_notifier import TelegramNotifier
+
+
+@pytest.fixture
+def bot_api():
+    """Start a stand-in Bot API; yields a factory for (url, state) with a given rate limit"""
+    servers = []
+
+    def start(telegram_rate=None):
+        server, state = standin_server.start(10, telegram_rate=telegram_rate)
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/botTOKEN/sendMessage", state
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def notifier(url, tmp_path, **config):
+    config = dict({'outbox_path': str(tmp_path / 'outbox.db'), 'telegram_rate_limit': 100,
+                   'telegram_burst': 100, 'digest_threshold': 100}, **config)
+    return TelegramNotifier(HttpClient(config), url, 'chat', config)
+
+
+def texts(state):
+    return [message['text'] for message in state.messages]
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.02)
+
+
+def test_alerts_are_sent_in_order(bot_api, tmp_path):
+    url, state = bot_api()
+    sender = notifier(url, tmp_path).start()
+    sent = []
+    assert sender.enqueue('p1', 'msg p1', 'p1', on_sent=lambda: sent.append('p1'))
+    assert not sender.enqueue('p1', 'msg p1 again', 'p1')
+    assert sender.enqueue('p2', 'msg p2', 'p2')
+    wait_until(lambda: sender.pending() == 0)
+    sender.close()
+    assert texts(state) == ['msg p1', 'msg p2']
+    assert sent == ['p1']
+
+
+def test_two_notifiers_on_one_outbox_send_each_alert_once(bot_api, tmp_path):
+    url, state = bot_api()
+    first, second = notifier(url, tmp_path), notifier(url, tmp_path)
+    for i in range(20):
+        (first if i % 2 else second).enqueue(f"p{i}", f"msg p{i}", f"p{i}")
+    first.start()
+    second.start()
+    wait_until(lambda: first.pending() == 0)
+    first.close()
+    second.close()
+    assert sorted(texts(state)) == sorted(f"msg p{i}" for i in range(20))
+
+
+def test_rate_limited_sends_wait_for_retry_after(bot_api, tmp_path):
+    url, state = bot_api(telegram_rate=2)
+    sender = notifier(url, tmp_path).start()
+    for i in range(5):
+        sender.enqueue(f"p{i}", f"msg p{i}", f"p{i}")
+    wait_until(lambda: sender.pending() == 0)
+    sender.close()
+    assert texts(state) == [f"msg p{i}" for i in range(5)]
+    assert sender.stats['rate_limited'] >= 1
+    assert sender.stats['sent'] == 5
+
+
+def test_backlog_is_coalesced_into_a_digest(bot_api, tmp_path):
+    url, state = bot_api()
+    sender = notifier(url, tmp_path, digest_threshold=3)
+    for i in range(10):
+        sender.enqueue(f"p{i}", f"msg p{i}", f"summary p{i}")
+    sender.start()
+    wait_until(lambda: sender.pending() == 0)
+    sender.close()
+    assert len(state.messages) == 1
+    assert '10 new pools' in state.messages[0]['text']
+    assert all(f"summary p{i}" in state.messages[0]['text'] for i in range(10))
+    assert sender.stats['digests'] == 1
+
+
+def test_outbox_survives_a_restart(bot_api, tmp_path):
+    url, state = bot_api()
+    stopped = notifier(url, tmp_path)
+    stopped.enqueue('p1', 'msg p1', 'p1')
+    stopped.close()
+
+    restarted = notifier(url, tmp_path).start()
+    wait_until(lambda: restarted.pending() == 0)
+    restarted.close()
+    assert texts(state) == ['msg p1']
+
+
+def test_claims_of_a_crashed_notifier_are_taken_over(bot_api, tmp_path):
+    url, state = bot_api()
+    crashed = notifier(url, tmp_path)
+    crashed.enqueue('p1', 'msg p1', 'p1')
+    # Claims the row, then never sends it or releases the claim
+    assert [row[1] for row in crashed._next_batch()] == ['p1']
+
+    survivor = notifier(url, tmp_path, outbox_claim_timeout=0.2).start()
+    wait_until(lambda: survivor.pending() == 0)
+    survivor.close()
+    assert texts(state) == ['msg p1']
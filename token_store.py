@@ -0,0 +1,164 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+WELL_KNOWN_TOKENS = {
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v": {"symbol": "USDC", "name": "USD Coin", "decimals": 6},
+    "So11111111111111111111111111111111111111112": {"symbol": "SOL", "name": "Wrapped SOL", "decimals": 9},
+}
+
+
+class TokenStore:
+    """Token metadata persisted in SQLite and loaded lazily on first lookup
+
+    Behaves like the old token_metadata dict for get() and update(). The
+    first lookup opens the database; if it is empty, loader() fills it
+    before returning, otherwise a stale copy is used while loader() runs in
+    the background. After that loader() is re-run every refresh_interval
+    seconds on a daemon thread. Looked-up rows are memoized in an LRU of at
+    most memo_size mints, so a long-running monitor does not end up holding
+    every mint it ever touched.
+    """
+
+    def __init__(self, path, loader=None, refresh_interval=6 * 3600, memo_size=50000):
+        self.path = path
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.memo_size = memo_size
+        self._conn = None
+        self._lock = threading.RLock()
+        self._memo = OrderedDict()
+        self._refreshing = False
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _connect(self):
+        """Open the database and create the schema on first use"""
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tokens (
+                mint TEXT PRIMARY KEY,
+                symbol TEXT,
+                name TEXT,
+                decimals INTEGER,
+                solscan TEXT
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+        return conn
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._conn is not None:
+                return
+            self._conn = self._connect()
+            self.update(WELL_KNOWN_TOKENS)
+            last_refresh = self._last_refresh()
+
+        if self.loader is None:
+            return
+        if last_refresh is None:
+            self._run_loader()
+        elif time.time() - last_refresh > self.refresh_interval:
+            self.refresh_in_background()
+        self._schedule_refresh()
+
+    def _last_refresh(self):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_refresh'").fetchone()
+        return float(row[0]) if row else None
+
+    def _run_loader(self):
+        """Run the loader once and record when it finished"""
+        try:
+            if self.loader() is False:
+                return
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_refresh', ?)",
+                                   (str(time.time()),))
+                self._conn.commit()
+        finally:
+            self._refreshing = False
+
+    def refresh_in_background(self):
+        """Re-run the loader on a daemon thread unless a refresh is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._run_loader, daemon=True).start()
+
+    def _schedule_refresh(self):
+        def tick():
+            self.refresh_in_background()
+            self._schedule_refresh()
+
+        timer = threading.Timer(self.refresh_interval, tick)
+        timer.daemon = True
+        timer.start()
+
+    def get(self, mint, default=None):
+        """Get {'symbol', 'name', 'decimals'} for a mint, or default if it is unknown"""
+        with self._lock:
+            if mint in self._memo:
+                self._memo.move_to_end(mint)
+                self.stats['hits'] += 1
+                token = self._memo[mint]
+                return default if token is None else token
+        self._ensure_loaded()
+        with self._lock:
+            row = self._conn.execute("SELECT symbol, name, decimals FROM tokens WHERE mint = ?",
+                                     (mint,)).fetchone()
+            token = None
+            if row and row[0] is not None:
+                token = {'symbol': row[0], 'name': row[1], 'decimals': row[2]}
+            self.stats['misses'] += 1
+            self._memo[mint] = token
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+                self.stats['evictions'] += 1
+        return default if token is None else token
+
+    def cache_stats(self):
+        """Memo hit/miss/eviction counters and its current size"""
+        with self._lock:
+            return dict(self.stats, size=len(self._memo))
+
+    def __contains__(self, mint):
+        return self.get(mint) is not None
+
+    def update(self, tokens):
+        """Insert or replace metadata for many mints in one transaction"""
+        self._ensure_loaded()
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO tokens (mint, symbol, name, decimals) VALUES (?, ?, ?, ?)
+                ON CONFLICT(mint) DO UPDATE SET
+                    symbol = excluded.symbol, name = excluded.name, decimals = excluded.decimals
+            """, [
+                (mint, token.get('symbol', 'Unknown'), token.get('name', 'Unknown'), token.get('decimals', 9))
+                for mint, token in tokens.items()
+            ])
+            self._conn.commit()
+            for mint in tokens:
+                self._memo.pop(mint, None)
+
+    def get_solscan(self, mint):
+        """Get the stored Solscan metadata for a mint, or None if it was never fetched"""
+        self._ensure_loaded()
+        with self._lock:
+            row = self._conn.execute("SELECT solscan FROM tokens WHERE mint = ?", (mint,)).fetchone()
+        if row and row[0] is not None:
+            return json.loads(row[0])
+        return None
+
+    def put_solscan(self, mint, data):
+        """Store Solscan metadata for a mint so it is never fetched again"""
+        self._ensure_loaded()
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO tokens (mint, solscan) VALUES (?, ?)
+                ON CONFLICT(mint) DO UPDATE SET solscan = excluded.solscan
+            """, (mint, json.dumps(data)))
+            self._conn.commit()